@@ -0,0 +1,343 @@
+"""HTTP API of the clause assembler, for CRM and workflow tools.
+
+    python api.py --host 0.0.0.0 --port 8080
+
+    GET    /api/sections                     Contract sections, in order
+    GET    /api/clauses                      Clause catalog grouped by section
+    GET    /api/clauses/{id}/preview         Text of a clause
+    GET    /api/search?q=...                 Full-text clause search
+    POST   /api/contracts                    Assemble {"clauses": [ids], "summary": false}
+                                             (?wait=1 streams the .docx once ready, merge
+                                             warnings in the X-Assembly-Warnings header)
+    GET    /api/contracts/{job}              Assembly status
+    GET    /api/contracts/{job}/document     Assembled .docx (/summary for the summarised version)
+    DELETE /api/contracts/{job}              Cancel or forget an assembly and delete its files
+"""
+
+import os
+import json
+import asyncio
+import argparse
+import functools
+import shutil
+from typing import Dict, List, Optional
+from aiohttp import web
+from src.clause_catalog import ClauseCatalog, get_clause_catalog
+from src.parties_parser import get_parties_parser
+from src.job_queue import AssemblyJobQueue
+from src.preview_cache import get_preview_cache
+from src.doc_converter import DocConverter, get_doc_converter
+from src.docx_text import extract_docx_text
+from src.clause_search import get_clause_search_index
+
+DEFAULT_TEMPLATE_PATH = "clauses/Exemple contrat V2 clausier km.docx"
+# Assemblies accepted (queued or running) before new requests are refused with 503
+DEFAULT_API_MAX_PENDING = 8
+# Seconds a refused client is asked to wait before retrying
+RETRY_AFTER_SECONDS = 5
+# Bytes read from disk per chunk when streaming a document
+STREAM_CHUNK_SIZE = 64 * 1024
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# Header listing the merge warnings of a document streamed by POST /api/contracts?wait=1
+WARNINGS_HEADER = "X-Assembly-Warnings"
+
+CATALOG_KEY = web.AppKey('catalog', ClauseCatalog)
+JOB_QUEUE_KEY = web.AppKey('job_queue', AssemblyJobQueue)
+ASSEMBLY_SLOTS_KEY = web.AppKey('assembly_slots', asyncio.Semaphore)
+BACKGROUND_TASKS_KEY = web.AppKey('background_tasks', set)
+TEMPLATE_PATH_KEY = web.AppKey('template_path', str)
+
+
+def _json_error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.json_response({'error': message}, status=status, headers=headers)
+
+
+def _clause_id(catalog: ClauseCatalog, clause: Dict) -> str:
+    """Stable clause id: its path inside the library, with forward slashes"""
+    return os.path.relpath(clause['file_path'], catalog.clauses_dir).replace(os.sep, '/')
+
+
+def _clause_entry(catalog: ClauseCatalog, clause: Dict) -> Dict:
+    return {
+        'id': _clause_id(catalog, clause),
+        'name': clause['name'],
+        'section': clause.get('section_tag'),
+        'section_name': clause.get('section_name'),
+        'file_name': clause['file_name'],
+        'legacy_doc': clause.get('is_legacy_doc', False),
+        'summary': clause.get('summary'),
+        'variant_of': clause.get('variant_family'),
+    }
+
+
+async def _refreshed_catalog(request: web.Request) -> ClauseCatalog:
+    """Catalog of the library, rescanned off the event loop if the library changed"""
+    catalog = request.app[CATALOG_KEY]
+    await asyncio.get_running_loop().run_in_executor(None, catalog.refresh)
+    return catalog
+
+
+def _load_preview(path: str, converter: DocConverter) -> str:
+    """Read the preview text of a clause file (.doc through its Word streams, converted if needed)"""
+    if path.endswith('.doc'):
+        text = converter.extract_text(path)
+        if text:
+            return text
+        path = converter.convert_doc_to_docx(path, warnings=[])
+    return extract_docx_text(path)
+
+
+def _job_response(request: web.Request, status: Dict) -> Dict:
+    """Public view of a job status: URLs instead of server paths"""
+    job_url = request.app.router['contract'].url_for(job_id=status['id'])
+    body = {key: status.get(key) for key in ('id', 'status', 'stage', 'progress', 'detail', 'error', 'warnings')}
+    body['document_url'] = str(job_url / 'document') if status.get('result_path') else None
+    body['summary_url'] = str(job_url / 'summary') if status.get('summary_path') else None
+    if status.get('summary_error'):
+        body['summary_error'] = status['summary_error']
+    return body
+
+
+def _document_headers(filename: str) -> Dict[str, str]:
+    return {'Content-Type': DOCX_MIME, 'Content-Disposition': f'attachment; filename="{filename}"'}
+
+
+async def _stream_document(request: web.Request, path: str, filename: str,
+                           headers: Optional[Dict[str, str]] = None) -> web.StreamResponse:
+    """Send a .docx in chunks read off the event loop; the response is complete when this returns"""
+    loop = asyncio.get_running_loop()
+    response = web.StreamResponse(headers={**_document_headers(filename), **(headers or {})})
+    response.content_length = os.path.getsize(path)
+    await response.prepare(request)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = await loop.run_in_executor(None, f.read, STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            await response.write(chunk)
+    await response.write_eof()
+    return response
+
+
+def _delete_job_files(status: Dict):
+    """Remove the output directory of an API job (its merger owns the whole directory)"""
+    if status.get('result_path'):
+        shutil.rmtree(os.path.dirname(status['result_path']), ignore_errors=True)
+
+
+def _discard_job(queue: AssemblyJobQueue, job_id: str):
+    """Forget a job and delete its files; a job still running is discarded once it finishes"""
+    future = queue.get_future(job_id)
+
+    def discard(_=None):
+        status = queue.get_status(job_id)
+        queue.forget(job_id)
+        if status is not None:
+            _delete_job_files(status)
+
+    if future is None or future.done() or queue.cancel(job_id):
+        discard()
+    else:
+        future.add_done_callback(discard)
+
+
+async def sections(request: web.Request) -> web.Response:
+    parser = get_parties_parser()
+    parser.reload_if_changed()
+    return web.json_response([
+        {'key': section['key'], 'name': section['name'], 'order': section['order']}
+        for section in parser.get_sections()
+    ])
+
+
+async def clauses(request: web.Request) -> web.Response:
+    catalog = await _refreshed_catalog(request)
+    _, clauses_by_section = catalog.snapshot()
+    return web.json_response({
+        section_key: [_clause_entry(catalog, clause) for clause in section_clauses]
+        for section_key, section_clauses in clauses_by_section.items()
+    })
+
+
+async def clause_preview(request: web.Request) -> web.Response:
+    catalog = await _refreshed_catalog(request)
+    clause_id = request.match_info['clause_id']
+    clause = next((c for c in catalog.snapshot()[0] if _clause_id(catalog, c) == clause_id), None)
+    if clause is None:
+        return _json_error(404, f"Clause inconnue: {clause_id}")
+
+    loader = functools.partial(_load_preview, converter=get_doc_converter())
+    try:
+        text = await asyncio.get_running_loop().run_in_executor(
+            None, get_preview_cache().get, clause['file_path'], loader
+        )
+    except Exception as e:
+        return _json_error(500, f"Erreur d'aperçu: {str(e)}")
+    return web.json_response({'id': clause_id, 'name': clause['name'], 'text': text})
+
+
+async def search(request: web.Request) -> web.Response:
+    query = request.query.get('q', '').strip()
+    if not query:
+        return _json_error(400, "Paramètre q manquant")
+    try:
+        limit = int(request.query.get('limit', 20))
+    except ValueError:
+        return _json_error(400, "Paramètre limit invalide")
+
+    catalog = await _refreshed_catalog(request)
+    results = await asyncio.get_running_loop().run_in_executor(None, get_clause_search_index().search, query, limit)
+    by_path = {os.path.abspath(clause['file_path']): clause for clause in catalog.snapshot()[0]}
+    return web.json_response([
+        {**_clause_entry(catalog, by_path[result['path']]), 'snippet': result['snippet'], 'score': result['score']}
+        for result in results if result['path'] in by_path
+    ])
+
+
+async def create_contract(request: web.Request) -> web.StreamResponse:
+    try:
+        payload = await request.json()
+    except ValueError:
+        return _json_error(400, "Corps JSON invalide")
+    clause_ids: List[str] = payload.get('clauses') if isinstance(payload, dict) else None
+    if not clause_ids or not isinstance(clause_ids, list):
+        return _json_error(400, "Liste de clauses manquante")
+    if not all(isinstance(clause_id, str) for clause_id in clause_ids):
+        return _json_error(400, "Les identifiants de clauses doivent être des chaînes")
+
+    catalog = await _refreshed_catalog(request)
+    by_id = {_clause_id(catalog, clause): clause for clause in catalog.snapshot()[0]}
+    unknown = [clause_id for clause_id in clause_ids if clause_id not in by_id]
+    if unknown:
+        return _json_error(400, f"Clauses inconnues: {', '.join(map(str, unknown))}")
+
+    # Backpressure: refuse rather than queue without bound
+    slots = request.app[ASSEMBLY_SLOTS_KEY]
+    if slots.locked():
+        return _json_error(503, "Trop d'assemblages en cours, réessayez plus tard",
+                           headers={'Retry-After': str(RETRY_AFTER_SECONDS)})
+    await slots.acquire()
+
+    # Clauses keep the caller's order within their section
+    selected_by_section: Dict[str, List[Dict]] = {}
+    for clause_id in clause_ids:
+        clause = by_id[clause_id]
+        selected_by_section.setdefault(clause.get('section_tag', 'uncategorized'), []).append(clause)
+
+    queue = request.app[JOB_QUEUE_KEY]
+    try:
+        job_id = queue.submit_assembly(
+            selected_by_section,
+            get_parties_parser().get_sections(),
+            template_path=request.app[TEMPLATE_PATH_KEY],
+            enable_summary=bool(payload.get('summary', False))
+        )
+    except Exception:
+        slots.release()
+        raise
+    job = asyncio.wrap_future(queue.get_future(job_id))
+
+    async def release_when_done():
+        try:
+            await job
+        except Exception:
+            pass
+        finally:
+            slots.release()
+
+    task = asyncio.create_task(release_when_done())
+    request.app[BACKGROUND_TASKS_KEY].add(task)
+    task.add_done_callback(request.app[BACKGROUND_TASKS_KEY].discard)
+
+    if request.query.get('wait') not in ('1', 'true'):
+        return web.json_response(_job_response(request, queue.get_status(job_id)), status=202)
+
+    # The document is sent once, then its files and job are dropped, however the request
+    # ends: a client disconnecting while it waits must not leave them behind
+    try:
+        try:
+            await asyncio.shield(job)
+        except Exception as e:
+            return _json_error(500, f"Erreur lors de l'assemblage: {str(e)}")
+        status = queue.get_status(job_id)
+        filename = os.path.basename(str(payload.get('filename') or 'contrat.docx')).replace('"', '')
+        # Clauses skipped or degraded during the merge, JSON-encoded (ASCII) in a header
+        headers = {WARNINGS_HEADER: json.dumps(status['warnings'])} if status['warnings'] else None
+        return await _stream_document(request, status['result_path'], filename, headers)
+    finally:
+        _discard_job(queue, job_id)
+
+
+async def contract_status(request: web.Request) -> web.Response:
+    status = request.app[JOB_QUEUE_KEY].get_status(request.match_info['job_id'])
+    if status is None:
+        return _json_error(404, "Assemblage inconnu")
+    return web.json_response(_job_response(request, status))
+
+
+async def contract_document(request: web.Request) -> web.StreamResponse:
+    status = request.app[JOB_QUEUE_KEY].get_status(request.match_info['job_id'])
+    if status is None:
+        return _json_error(404, "Assemblage inconnu")
+    key = 'summary_path' if request.match_info['kind'] == 'summary' else 'result_path'
+    if not status.get(key) or not os.path.exists(status[key]):
+        return _json_error(409, "Document pas encore disponible")
+    return web.FileResponse(status[key], headers=_document_headers(os.path.basename(status[key])))
+
+
+async def delete_contract(request: web.Request) -> web.Response:
+    queue = request.app[JOB_QUEUE_KEY]
+    job_id = request.match_info['job_id']
+    status = queue.get_status(job_id)
+    if status is None:
+        return _json_error(404, "Assemblage inconnu")
+    if status['status'] in ('queued', 'running') and not queue.cancel(job_id):
+        return _json_error(409, "Assemblage en cours, impossible de l'annuler")
+    queue.forget(job_id)
+    _delete_job_files(status)
+    return web.json_response({'id': job_id, 'deleted': True})
+
+
+def create_app(clauses_dir: str = "clauses", template_path: str = DEFAULT_TEMPLATE_PATH,
+               max_pending: Optional[int] = None) -> web.Application:
+    """Build the aiohttp application; the assembly worker pool starts with it"""
+    app = web.Application()
+    app[CATALOG_KEY] = get_clause_catalog(clauses_dir)
+    app[TEMPLATE_PATH_KEY] = template_path
+    app[ASSEMBLY_SLOTS_KEY] = asyncio.Semaphore(
+        max_pending or int(os.getenv('CLAUSIER_API_MAX_PENDING', DEFAULT_API_MAX_PENDING))
+    )
+    app[BACKGROUND_TASKS_KEY] = set()
+
+    async def job_queue_context(app: web.Application):
+        app[JOB_QUEUE_KEY] = AssemblyJobQueue()
+        yield
+        app[JOB_QUEUE_KEY].shutdown()
+
+    app.cleanup_ctx.append(job_queue_context)
+    app.router.add_get('/api/sections', sections)
+    app.router.add_get('/api/clauses', clauses)
+    app.router.add_get('/api/clauses/{clause_id:.+}/preview', clause_preview)
+    app.router.add_get('/api/search', search)
+    app.router.add_post('/api/contracts', create_contract)
+    app.router.add_get('/api/contracts/{job_id}', contract_status, name='contract')
+    app.router.add_get('/api/contracts/{job_id}/{kind:document|summary}', contract_document)
+    app.router.add_delete('/api/contracts/{job_id}', delete_contract)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP de l'agrégateur de clauses")
+    parser.add_argument('--host', default="127.0.0.1", help="Adresse d'écoute")
+    parser.add_argument('--port', type=int, default=8080, help="Port d'écoute")
+    parser.add_argument('--clauses-dir', default="clauses", help="Dossier de la bibliothèque de clauses")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE_PATH, help="Modèle de contrat")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="Assemblages acceptés simultanément avant de répondre 503")
+    args = parser.parse_args()
+
+    web.run_app(create_app(args.clauses_dir, args.template, args.max_pending), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,28 @@
 import streamlit as st
 import os
-import tempfile
+import shutil
 import time
+import uuid
+import functools
 from datetime import datetime
 from src.config import SharePointConfig
-from src.sharepoint_client import SharePointClient
-from src.local_client import LocalClauseClient
+from src.clause_catalog import get_clause_catalog
 from src.document_merger import DocumentMerger
-from src.parties_parser import PartiesParser
-from src.doc_converter import DocConverter
-from docx import Document
+from src.parties_parser import get_parties_parser
+from src.doc_converter import DocConverter, get_doc_converter
+from src.conversion_warmup import get_conversion_warmup
+from src.preview_cache import get_preview_cache
+from src.docx_text import extract_docx_text
+from src.clause_search import get_clause_search_index
+from src.job_queue import AssemblyJobQueue
+from src.scratch_space import get_scratch_space, session_owner
 import html
 
+# Seconds between two progress polls of a background assembly job
+JOB_POLL_INTERVAL = 1.0
+# Characters of contract preview sent to the browser per page
+PREVIEW_PAGE_CHARS = 6000
+
 def main():
     st.set_page_config(
         page_title="Agrégateur de clauses",
@@ -23,6 +34,14 @@ def main():
     if 'show_intro' not in st.session_state:
         st.session_state.show_intro = True
 
+    # Reattach to a running assembly job after a browser reconnect
+    if 'assembly_job' not in st.session_state and 'job' in st.query_params:
+        st.session_state.assembly_job = {
+            'id': st.query_params['job'],
+            'filename': st.query_params.get('file', f"document_{datetime.now().strftime('%Y%m%d')}.docx")
+        }
+        st.session_state.show_intro = False
+
     # Landing page (only these elements, centered, blur-in 1s)
     if st.session_state.show_intro:
         st.markdown(
@@ -250,20 +269,21 @@ div.stButton > button:active {
     # Initialize session state
     if 'sharepoint_client' not in st.session_state:
         st.session_state.sharepoint_client = None
-    if 'local_client' not in st.session_state:
-        st.session_state.local_client = None
+    # SharePoint listing of this session; the local library is shared (see _catalog_listing)
     if 'clause_files' not in st.session_state:
         st.session_state.clause_files = []
     if 'clauses_by_section' not in st.session_state:
         st.session_state.clauses_by_section = {}
+    if 'session_key' not in st.session_state:
+        # Routes this session's assemblies to the worker holding its previous assembly
+        st.session_state.session_key = uuid.uuid4().hex
+    # Temporary files of the session live in its scratch directory, collected once the session goes idle
+    scratch_owner = session_owner(st.session_state.session_key)
+    get_scratch_space().touch(scratch_owner)
     if 'merger' not in st.session_state:
-        st.session_state.merger = DocumentMerger(enable_summary=False)
-    if 'parties_parser' not in st.session_state:
-        st.session_state.parties_parser = PartiesParser()
+        st.session_state.merger = DocumentMerger(enable_summary=False, scratch_owner=scratch_owner)
     if 'connection_mode' not in st.session_state:
         st.session_state.connection_mode = "local"
-    if 'preview_converter' not in st.session_state:
-        st.session_state.preview_converter = DocConverter()
     
     # Inline preview panel (scrollable, non-disabled)
     show_preview = (
@@ -274,7 +294,12 @@ div.stButton > button:active {
     if show_preview:
         st.markdown("### Aperçu de la clause")
         st.markdown(f"**{st.session_state.get('preview_title', 'Clause')}**")
-        safe_html = html.escape(st.session_state['preview_content'])
+        if st.session_state.get('preview_kind') == 'contract':
+            # Only the current page of a long contract is sent to the browser
+            preview_text = _render_contract_preview_pager()
+        else:
+            preview_text = st.session_state['preview_content']
+        safe_html = html.escape(preview_text)
         st.markdown(
             f"""
 <div style="max-height: 320px; overflow-y: auto; padding: 8px; border: 1px solid #e6e6e6; border-radius: 6px; background: #fafafa; white-space: pre-wrap; line-height: 1.45; margin-bottom: 8px;">
@@ -285,7 +310,8 @@ div.stButton > button:active {
         )
         if st.button("Fermer l'aperçu", key="close_preview_panel"):
             # Clean up preview state without rerun
-            for key in ['preview_content', 'preview_title', 'hide_preview']:
+            for key in ['preview_content', 'preview_title', 'preview_kind', 'preview_pages', 'preview_page',
+                        'preview_section', 'hide_preview']:
                 if key in st.session_state:
                     del st.session_state[key]
             st.rerun()
@@ -304,7 +330,6 @@ div.stButton > button:active {
         
         # Clear data when switching modes
         if new_mode != st.session_state.connection_mode:
-            st.session_state.local_client = None
             st.session_state.sharepoint_client = None
             st.session_state.clause_files = []
             st.session_state.clauses_by_section = {}
@@ -315,24 +340,23 @@ div.stButton > button:active {
             st.info("📁 Mode local activé")
             st.markdown("Les clauses seront lues depuis le dossier `clauses/`")
             
-            # Auto-load clauses when switching to local mode
-            if not st.session_state.local_client:
-                st.session_state.local_client = LocalClauseClient()
-                st.session_state.clause_files = st.session_state.local_client.get_clause_files()
-                st.session_state.clauses_by_section = st.session_state.local_client.get_clauses_by_section()
+            # The catalog is shared by all sessions and rescanned only when the library changed
+            catalog = get_clause_catalog()
+            if catalog.refresh():
+                _warm_clause_previews(catalog.snapshot()[0])
             
             # Show status
-            if st.session_state.clause_files:
-                st.success(f"✅ {len(st.session_state.clause_files)} clauses chargées automatiquement!")
+            if catalog.snapshot()[0]:
+                st.success(f"✅ {len(catalog.snapshot()[0])} clauses chargées automatiquement!")
             else:
                 st.warning("⚠️ Aucune clause trouvée dans le dossier local")
             
             # Optional reload button
             if st.button("🔄 Recharger les clauses locales"):
-                st.session_state.clause_files = st.session_state.local_client.get_clause_files()
-                st.session_state.clauses_by_section = st.session_state.local_client.get_clauses_by_section()
-                if st.session_state.clause_files:
-                    st.success(f"✅ {len(st.session_state.clause_files)} clauses rechargées!")
+                catalog.refresh(force=True)
+                _warm_clause_previews(catalog.snapshot()[0])
+                if catalog.snapshot()[0]:
+                    st.success(f"✅ {len(catalog.snapshot()[0])} clauses rechargées!")
                 else:
                     st.warning("⚠️ Aucune clause trouvée dans le dossier local")
                 st.rerun()
@@ -369,7 +393,9 @@ div.stButton > button:active {
             # SharePoint connection button
             if st.button("🔌 Se connecter à SharePoint"):
                 if config.is_configured():
-                    st.session_state.sharepoint_client = SharePointClient(config)
+                    # Imported on first use: the SharePoint stack is not needed in local mode
+                    from src.sharepoint_client import SharePointClient
+                    st.session_state.sharepoint_client = SharePointClient(config, scratch_owner=scratch_owner)
                     if st.session_state.sharepoint_client.authenticate():
                         st.success("✅ Connexion réussie!")
                         st.session_state.clause_files = st.session_state.sharepoint_client.get_clause_files()
@@ -381,8 +407,8 @@ div.stButton > button:active {
     
     # Main content
     active_client = None
-    if st.session_state.connection_mode == "local" and st.session_state.local_client:
-        active_client = st.session_state.local_client
+    if st.session_state.connection_mode == "local":
+        active_client = get_clause_catalog().client
     elif st.session_state.connection_mode == "sharepoint" and st.session_state.sharepoint_client:
         active_client = st.session_state.sharepoint_client
     
@@ -422,49 +448,51 @@ div.stButton > button:active {
             )
             
             if selected_demo_clauses and st.button("🧩 Assembler les clauses (Mode Démo)"):
-                # Save uploaded files temporarily
+                # Save uploaded files in the session's scratch space, removed whatever happens
+                upload_dir = get_scratch_space().mkdtemp(scratch_owner, prefix='demo_')
                 temp_files = []
                 selected_names = []
                 
-                for clause in demo_clauses:
-                    if clause['name'] in selected_demo_clauses:
-                        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.docx')
-                        temp_file.write(clause['file_obj'].read())
-                        temp_file.close()
-                        temp_files.append(temp_file.name)
-                        selected_names.append(clause['name'])
-                
                 # Merge documents
                 try:
+                    for i, clause in enumerate(demo_clauses):
+                        if clause['name'] in selected_demo_clauses:
+                            temp_path = os.path.join(upload_dir, f"{i + 1:03d}.docx")
+                            with open(temp_path, 'wb') as temp_file:
+                                temp_file.write(clause['file_obj'].getvalue())
+                            temp_files.append(temp_path)
+                            selected_names.append(clause['name'])
+                    
                     merged_doc_path = st.session_state.merger.merge_documents(temp_files, selected_names)
+                    for warning in st.session_state.merger.warnings:
+                        st.warning(f"⚠️ {warning}")
                     
                     # Offer download
-                    with open(merged_doc_path, 'rb') as f:
-                        st.download_button(
-                            label="📥 Télécharger le document assemblé",
-                            data=f.read(),
-                            file_name=f"clauses_assemblees_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx",
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                        )
+                    st.download_button(
+                        label="📥 Télécharger le document assemblé",
+                        data=_read_on_download(merged_doc_path),
+                        file_name=f"clauses_assemblees_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx",
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                        on_click="ignore"
+                    )
                     
                     st.success("✅ Document assemblé avec succès!")
-                    
-                    # Cleanup
-                    for temp_file in temp_files:
-                        try:
-                            os.unlink(temp_file)
-                        except:
-                            pass
+                    st.session_state.demo_summary_future = st.session_state.merger.summary_future
                             
                 except Exception as e:
                     st.error(f"❌ Erreur lors de l'assemblage: {str(e)}")
+                finally:
+                    shutil.rmtree(upload_dir, ignore_errors=True)
+            
+            _render_demo_summary()
         
     else:
         # Active client mode (local or SharePoint)
+        clause_files, clauses_by_section = _catalog_listing()
         # Check if we have clauses to display
         has_clauses = (
-            st.session_state.clauses_by_section and 
-            any(clauses for clauses in st.session_state.clauses_by_section.values())
+            clauses_by_section and 
+            any(clauses for clauses in clauses_by_section.values())
         )
         
         if has_clauses:
@@ -473,16 +501,37 @@ div.stButton > button:active {
             selected_clauses_all = []
             
             # Use tabs for better organization
-            sections = st.session_state.parties_parser.get_sections()
+            sections = get_parties_parser().get_sections()
             
             # Create columns for better layout
             col1, col2 = st.columns([2, 1])
             
             with col1:
+                # Legacy clauses still being converted in the background
+                warmup = get_conversion_warmup()
+                if warmup is not None and warmup.pending_count():
+                    st.caption(f"⏳ Conversion de {warmup.pending_count()} fichier(s) .doc en arrière-plan...")
+                
+                # Full-text search over clause contents
+                search_query = st.text_input(
+                    "🔎 Rechercher dans le contenu des clauses",
+                    key="clause_search_query",
+                    placeholder="ex : résiliation, confidentialité, durée du contrat"
+                )
+                if search_query:
+                    _render_clause_search_results(search_query)
+                
+                st.toggle(
+                    "Regrouper les variantes proches",
+                    value=True,
+                    key="collapse_variants",
+                    help="N'affiche qu'une clause par famille de clauses quasi identiques dans chaque section"
+                )
+                
                 # Selection by sections
                 selected_clauses_all = []
                 for section in sections:
-                    section_clauses = st.session_state.clauses_by_section.get(section['key'], [])
+                    section_clauses = clauses_by_section.get(section['key'], [])
                     
                     if section_clauses:
                         st.markdown(f"### {section['order']}. {section['name']}")
@@ -490,7 +539,11 @@ div.stButton > button:active {
                         # Multiselect for selection
                         clause_options = []
                         clause_mapping = {}
+                        hidden_variants = []
                         for clause in section_clauses:
+                            if _is_collapsed_variant(clause, f"section_{section['key']}"):
+                                hidden_variants.append(clause)
+                                continue
                             if clause['file_name'].endswith('.doc'):
                                 legacy_indicator = " ⚠️"
                                 option_label = f"{clause['name']}{legacy_indicator}"
@@ -504,6 +557,10 @@ div.stButton > button:active {
                             key=f"section_{section['key']}",
                             help=f"Sélectionnez les clauses pour la section '{section['name']}'. ⚠️ = fichier .doc non supporté"
                         )
+                        if hidden_variants:
+                            st.caption("🔗 Variantes proches masquées : " + ", ".join(
+                                f"{c['name']} (≈ {c['variant_family']}, {c['variant_similarity']:.0%})" for c in hidden_variants
+                            ))
                         
                         # Add selected clauses to the main list
                         for label in selected_for_section:
@@ -515,7 +572,7 @@ div.stButton > button:active {
                         st.markdown("---")
                 
                 # Handle uncategorized clauses
-                uncategorized_clauses = st.session_state.clauses_by_section.get('uncategorized', [])
+                uncategorized_clauses = clauses_by_section.get('uncategorized', [])
                 if uncategorized_clauses:
                     st.markdown("### 📝 Clauses non catégorisées")
                     
@@ -560,9 +617,18 @@ div.stButton > button:active {
                         contract_preview = _generate_contract_preview(selected_clauses_all)
                         st.session_state['preview_title'] = "Aperçu du contrat complet"
                         st.session_state['preview_content'] = contract_preview
+                        st.session_state['preview_kind'] = 'contract'
                         st.session_state.hide_preview = False
                         st.rerun()
                 
+                # Keep an open contract preview in sync with the selection
+                if (selected_clauses_all and st.session_state.get('preview_kind') == 'contract'
+                        and not st.session_state.get('hide_preview', False)):
+                    contract_preview = _generate_contract_preview(selected_clauses_all)
+                    if contract_preview != st.session_state.get('preview_content'):
+                        st.session_state['preview_content'] = contract_preview
+                        st.rerun()
+                
                 if selected_clauses_all:
                     st.success(f"**{len(selected_clauses_all)} clause(s) sélectionnée(s)**")
                     
@@ -584,11 +650,12 @@ div.stButton > button:active {
                                     st.write(f"• {clause_name}")
                                 with cols_item[1]:
                                     if st.button("👁️", key=f"sum_prev_{section['key']}_{idx}", help="Aperçu"):
-                                        clause_obj = next((c for c in st.session_state.clauses_by_section.get(section['key'], []) if c['name'] == clause_name), None)
+                                        clause_obj = next((c for c in clauses_by_section.get(section['key'], []) if c['name'] == clause_name), None)
                                         if clause_obj:
                                             preview_text = _get_clause_preview(clause_obj)
                                             st.session_state['preview_title'] = clause_obj['name']
                                             st.session_state['preview_content'] = preview_text or "(Aucun aperçu disponible)"
+                                            st.session_state['preview_kind'] = 'clause'
                                             st.session_state.hide_preview = False
                                             st.rerun()
                     
@@ -600,11 +667,12 @@ div.stButton > button:active {
                                 st.write(f"• {clause_name}")
                             with cols_item[1]:
                                 if st.button("👁️", key=f"sum_prev_uncat_{idx}", help="Aperçu"):
-                                    clause_obj = next((c for c in st.session_state.clauses_by_section.get('uncategorized', []) if c['name'] == clause_name), None)
+                                    clause_obj = next((c for c in clauses_by_section.get('uncategorized', []) if c['name'] == clause_name), None)
                                     if clause_obj:
                                         preview_text = _get_clause_preview(clause_obj)
                                         st.session_state['preview_title'] = clause_obj['name']
                                         st.session_state['preview_content'] = preview_text or "(Aucun aperçu disponible)"
+                                        st.session_state['preview_kind'] = 'clause'
                                         st.session_state.hide_preview = False
                                         st.rerun()
                 else:
@@ -620,76 +688,61 @@ div.stButton > button:active {
                 
             # Assembly button outside the columns
             if selected_clauses_all and st.button("🧩 Assembler les clauses", type="primary"):
-                # Show loading GIF immediately
-                gif_placeholder = st.empty()
-                with gif_placeholder.container():
-                    _show_assembly_gif()
-                
                 # Sort selected clauses by section order
                 selected_clauses_all.sort(key=lambda x: (x.get('section_order', 999), x['name']))
                 
-                # Download/copy files
-                if st.session_state.connection_mode == "local":
-                    downloaded_files = active_client.download_selected_clauses(selected_clauses_all)
-                    # Fixed delay
-                    time.sleep(1.5)
-                else:
-                    downloaded_files = active_client.download_selected_clauses(selected_clauses_all)
-                    # Fixed delay
-                    time.sleep(1.5)
+                # Download/copy files, reporting each clause as it arrives
+                download_status = st.empty()
+                copy_label = "📥 Copie" if st.session_state.connection_mode == "local" else "📥 Téléchargement"
+                
+                def show_download_progress(stage, current, total, item):
+                    download_status.caption(f"{copy_label} des clauses... {current}/{total} — {item}")
+                
+                downloaded_files = active_client.download_selected_clauses(
+                    selected_clauses_all, progress_callback=show_download_progress, scratch_owner=scratch_owner
+                )
+                download_status.empty()
                     
                 if downloaded_files or st.session_state.connection_mode == "local":
-                    # Merge documents using section-based approach
+                    # Organize selected clauses by section
+                    selected_by_section = {}
+                    for clause in selected_clauses_all:
+                        section_key = clause.get('section_tag', 'uncategorized')
+                        if section_key not in selected_by_section:
+                            selected_by_section[section_key] = []
+                        selected_by_section[section_key].append(clause)
+                    
+                    # Get sections in order
+                    sections_order = get_parties_parser().get_sections()
+                    
+                    # Generate filename - simple format with custom name + date
+                    if custom_filename:
+                        filename = f"{custom_filename}_{datetime.now().strftime('%Y%m%d')}.docx"
+                    else:
+                        filename = f"document_{datetime.now().strftime('%Y%m%d')}.docx"
+                    
+                    # Run the section-based merge in a background worker process
                     try:
-                        # Organize selected clauses by section
-                        selected_by_section = {}
-                        for clause in selected_clauses_all:
-                            section_key = clause.get('section_tag', 'uncategorized')
-                            if section_key not in selected_by_section:
-                                selected_by_section[section_key] = []
-                            selected_by_section[section_key].append(clause)
-                        
-                        # Get sections in order
-                        sections_order = st.session_state.parties_parser.get_sections()
-                        
-                        # Use new section-based merge method
-                        merged_doc_path = st.session_state.merger.merge_documents_by_sections(
+                        job_id = _get_job_queue().submit_assembly(
                             selected_by_section,
-                            sections_order
+                            sections_order,
+                            template_path=st.session_state.merger.template_path,
+                            enable_summary=st.session_state.ai_summary_enabled,
+                            session_key=st.session_state.session_key
                         )
-                        
-                        # Fixed delay for assembly
-                        time.sleep(1.5)
-                        
-                        # Generate filename - simple format with custom name + date
-                        if custom_filename:
-                            filename = f"{custom_filename}_{datetime.now().strftime('%Y%m%d')}.docx"
-                        else:
-                            filename = f"document_{datetime.now().strftime('%Y%m%d')}.docx"
-                        
-                        # Hide the GIF with fade out
-                        _hide_assembly_gif(gif_placeholder)
-                        
-                        # Offer download
-                        with open(merged_doc_path, 'rb') as f:
-                            st.download_button(
-                                label="📥 Télécharger le document assemblé",
-                                data=f.read(),
-                                file_name=filename,
-                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-                        
-                        st.success("✅ Document assemblé avec succès!")
-                        st.balloons()
-                            
+                        st.session_state.assembly_job = {
+                            'id': job_id,
+                            'filename': filename,
+                            'enable_summary': st.session_state.ai_summary_enabled
+                        }
+                        st.query_params['job'] = job_id
+                        st.query_params['file'] = filename
                     except Exception as e:
-                        # Hide the GIF in case of error
-                        _hide_assembly_gif(gif_placeholder)
                         st.error(f"❌ Erreur lors de l'assemblage: {str(e)}")
                 else:
-                    # Hide the GIF if no files downloaded
-                    _hide_assembly_gif(gif_placeholder)
                     st.error("❌ Aucun fichier n'a pu être téléchargé")
+            
+            _render_assembly_job()
         
         else:
             if st.session_state.connection_mode == "local":
@@ -713,27 +766,228 @@ div.stButton > button:active {
     st.markdown("---")
     st.markdown("*Clausier v1.0 - Assembleur de clauses contractuelles*")
 
+@st.cache_resource
+def _get_job_queue() -> AssemblyJobQueue:
+    """Process-wide assembly job queue shared by all sessions"""
+    return AssemblyJobQueue()
+
+
+def _clear_assembly_job():
+    """Forget the assembly job attached to this session"""
+    st.session_state.pop('assembly_job', None)
+    for key in ['job', 'file']:
+        if key in st.query_params:
+            del st.query_params[key]
+
+
+def _render_assembly_job():
+    """Show progress of this session's background assembly job and offer the result when ready"""
+    job = st.session_state.get('assembly_job')
+    if not job:
+        return
+
+    status = _get_job_queue().get_status(job['id'])
+    if status is None:
+        # Job unknown to this server (restart or expired)
+        _clear_assembly_job()
+        st.warning("⚠️ L'assemblage précédent n'est plus disponible, veuillez relancer l'assemblage.")
+        return
+
+    running = status['status'] in ('queued', 'running')
+    # The document is delivered as soon as it is merged, before the AI summary
+    job['document_ready'] = bool(status['result_path'])
+    if job['document_ready']:
+        st.download_button(
+            label="📥 Télécharger le document assemblé",
+            data=_read_on_download(status['result_path']),
+            file_name=job['filename'],
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            key="download_assembled",
+            on_click="ignore"
+        )
+        if not job.get('notified'):
+            st.success("✅ Document assemblé avec succès!")
+            st.balloons()
+            job['notified'] = True
+        # Clauses skipped or degraded by the worker, which cannot write to the page itself
+        for warning in status['warnings']:
+            st.warning(f"⚠️ {warning}")
+
+    if running:
+        if not job['document_ready']:
+            # Loading GIF is rendered once; only the progress fragment reruns while polling
+            _show_assembly_gif()
+        _poll_assembly_job()
+        return
+
+    if status['status'] == 'done':
+        if status.get('summary_path'):
+            st.download_button(
+                label="📝 Télécharger avec la synthèse IA",
+                data=_read_on_download(status['summary_path']),
+                file_name=job['filename'].replace('.docx', '_synthese.docx'),
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                key="download_assembled_summary",
+                on_click="ignore"
+            )
+        elif status['stage'] == 'done' and job.get('enable_summary'):
+            st.caption("📝 Synthèse IA indisponible pour ce document")
+    else:
+        st.error(f"❌ Erreur lors de l'assemblage: {status['error'] or 'assemblage annulé'}")
+        _clear_assembly_job()
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def _poll_assembly_job():
+    """Poll the job queue without rerunning the whole script"""
+    job = st.session_state.get('assembly_job')
+    status = _get_job_queue().get_status(job['id']) if job else None
+    if (not status or status['status'] not in ('queued', 'running')
+            or bool(status['result_path']) != job.get('document_ready')):
+        # Document or summary ready: full rerun to render the downloads
+        st.rerun()
+    if status['status'] == 'queued':
+        st.caption("⏳ En attente d'un worker disponible...")
+    elif status['stage'] == 'summary':
+        st.caption("📝 Synthèse IA en cours de génération...")
+    elif status['stage'] == 'save':
+        st.caption(f"💾 Enregistrement du document... {int(status['progress'] * 100)}%")
+    elif status.get('detail'):
+        st.caption(f"⚙️ Assemblage en cours... {int(status['progress'] * 100)}% — {status['detail']}")
+    else:
+        st.caption(f"⚙️ Assemblage en cours... {int(status['progress'] * 100)}%")
+
+
+def _read_on_download(path: str):
+    """Download button data read from disk on click only, so the session does not keep the file in memory.
+
+    Streamlit runs the callable when the button is clicked and drops the served
+    bytes once no session references them; reruns and repeated assemblies add nothing.
+    """
+    def read() -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+    return read
+
+
+def _render_demo_summary():
+    """Offer the summarised version of the demo assembly once the background summary is ready"""
+    future = st.session_state.get('demo_summary_future')
+    if not future:
+        return
+    if not future.done():
+        _poll_demo_summary()
+        return
+    summary_path = future.result() if future.exception() is None else None
+    if summary_path:
+        st.download_button(
+            label="📝 Télécharger avec la synthèse IA",
+            data=_read_on_download(summary_path),
+            file_name=f"clauses_assemblees_synthese_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx",
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            key="download_demo_summary",
+            on_click="ignore"
+        )
+    else:
+        st.caption("📝 Synthèse IA indisponible pour ce document")
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def _poll_demo_summary():
+    """Wait for the demo summary without rerunning the whole script"""
+    future = st.session_state.get('demo_summary_future')
+    if not future or future.done():
+        st.rerun()
+    st.caption("📝 Synthèse IA en cours de génération...")
+
+
+def _catalog_listing() -> tuple:
+    """Return (clause files, clauses by section): the shared catalog locally, the session's listing on SharePoint."""
+    if st.session_state.connection_mode == "local":
+        return get_clause_catalog().snapshot()
+    return st.session_state.clause_files, st.session_state.clauses_by_section
+
+
+def _render_clause_search_results(query: str):
+    """Show the ranked clauses matching a full-text query, each with a button adding it to the selection."""
+    start = time.perf_counter()
+    results = get_clause_search_index().search(query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    # The index is keyed by absolute path
+    clauses_by_path = {os.path.abspath(clause['file_path']): clause
+                       for clause in _catalog_listing()[0] if clause.get('file_path')}
+    matches = [(result, clauses_by_path[result['path']]) for result in results if result['path'] in clauses_by_path]
+    st.caption(f"{len(matches)} résultat(s) en {elapsed_ms:.0f} ms")
+    
+    for idx, (result, clause) in enumerate(matches):
+        cols_item = st.columns([0.9, 0.1])
+        with cols_item[0]:
+            st.markdown(f"**{clause['name']}** · {clause.get('section_name', '')}")
+            st.caption(result['snippet'])
+        with cols_item[1]:
+            st.button("➕", key=f"search_add_{idx}", help="Ajouter à la sélection",
+                      on_click=_add_clause_to_selection, args=(clause,))
+
+
+def _add_clause_to_selection(clause: dict):
+    """Select a clause in its section multiselect (button callback, runs before the widgets are created)."""
+    label = f"{clause['name']} ⚠️" if clause['file_name'].endswith('.doc') else clause['name']
+    state_key = f"section_{clause.get('section_tag', 'uncategorized')}"
+    selected = st.session_state.get(state_key, [])
+    if label not in selected:
+        st.session_state[state_key] = selected + [label]
+
+
+def _is_collapsed_variant(clause: dict, widget_key: str) -> bool:
+    """Tell whether a clause is a near-duplicate variant hidden behind its family's first clause."""
+    if not st.session_state.get('collapse_variants', True):
+        return False
+    family = clause.get('variant_family')
+    if not family or family == clause['name']:
+        return False
+    # Variants already selected stay visible
+    selected = st.session_state.get(widget_key, [])
+    return clause['name'] not in selected and f"{clause['name']} ⚠️" not in selected
+
+
 def _get_clause_preview(clause: dict) -> str:
     """Return a short text preview of a clause (.docx directly or .doc via conversion)."""
     try:
         path = clause.get('file_path') or clause.get('local_path')
         if not path:
             return ""
-        if path.endswith('.doc'):
-            # Convert to docx temporarily
-            converter = st.session_state.get('preview_converter')
-            docx_path = converter.convert_doc_to_docx(path)
-            return _extract_docx_text(docx_path)
-        else:
-            return _extract_docx_text(path)
+        return get_preview_cache().get(path, functools.partial(_load_clause_preview, converter=get_doc_converter()))
     except Exception as e:
         return f"Erreur d'aperçu: {str(e)}"
 
 
+def _load_clause_preview(path: str, converter: DocConverter) -> str:
+    """Read the preview text of a clause file (cache miss path of _get_clause_preview)."""
+    if path.endswith('.doc'):
+        # Read the Word streams directly, converting only if they cannot be parsed
+        text = converter.extract_text(path)
+        if text:
+            return text
+        docx_path = converter.convert_doc_to_docx(path)
+        return _extract_docx_text(docx_path)
+    return _extract_docx_text(path)
+
+
+def _warm_clause_previews(clause_files: list):
+    """Fill the shared preview cache in the background once the catalog is loaded."""
+    if os.getenv('CLAUSIER_PREVIEW_WARMUP', '1') == '0':
+        return
+    get_preview_cache().warm(
+        [clause.get('file_path') or clause.get('local_path') for clause in clause_files],
+        functools.partial(_load_clause_preview, converter=get_doc_converter())
+    )
+
+
 def _generate_contract_preview(selected_clauses: list) -> str:
     """Generate a complete contract preview by concatenating all selected clauses."""
     try:
-        sections = st.session_state.parties_parser.get_sections()
+        sections = get_parties_parser().get_sections()
         
         # Organize clauses by section
         clauses_by_section = {}
@@ -743,94 +997,135 @@ def _generate_contract_preview(selected_clauses: list) -> str:
                 clauses_by_section[section_key] = []
             clauses_by_section[section_key].append(clause)
         
-        contract_parts = []
-        contract_parts.append("=== APERÇU DU CONTRAT COMPLET ===\n")
+        has_uncategorized = 'uncategorized' in clauses_by_section
+        separator = "="*50 + "\n"
         
-        # Process sections in order
-        for i, section in enumerate(sections):
-            section_key = section['key']
-            section_has_clauses = section_key in clauses_by_section
-            
-            if section_has_clauses:
-                contract_parts.append(f"\n**--- {section['order']}. {section['name']} ---**\n")
-                
-                for clause in clauses_by_section[section_key]:
-                    contract_parts.append(f"\n[{clause['name']}]\n")
-                    clause_content = _get_clause_preview(clause)
-                    if clause_content:
-                        contract_parts.append(clause_content)
-                    else:
-                        contract_parts.append("(Contenu non disponible)")
-                    contract_parts.append("\n")
-                
-                # Always add separator after section with clauses
-                contract_parts.append("="*50 + "\n")
-            else:
-                contract_parts.append(f"\n**--- {section['order']}. {section['name']} ---** : aucune clause sélectionnée\n")
+        # Section blocks of the previous preview, reused when their clauses are unchanged
+        previous_blocks = st.session_state.get('contract_preview_blocks', {})
+        blocks = {}
         
-        # Now add separators after empty sections that are followed by sections with content
-        # We need to do this in a second pass to avoid separator duplication
-        final_parts = []
-        for i, part in enumerate(contract_parts):
-            final_parts.append(part)
-            
-            # Check if this is an empty section line
-            if " : aucune clause sélectionnée" in part:
-                # Find the next section in the remaining contract_parts
-                next_section_has_content = False
-                for j in range(i + 1, len(contract_parts)):
-                    next_part = contract_parts[j]
-                    # If we find another section header
-                    if next_part.startswith("\n**---") and "---**" in next_part:
-                        # Check if it's NOT an empty section
-                        if " : aucune clause sélectionnée" not in next_part:
-                            next_section_has_content = True
-                        break
-                
-                # Also check uncategorized section if no more regular sections with content
-                if not next_section_has_content and 'uncategorized' in clauses_by_section:
-                    next_section_has_content = True
-                
-                # Add separator if next section has content
-                if next_section_has_content:
-                    final_parts.append("="*50 + "\n")
+        contract_parts = ["=== APERÇU DU CONTRAT COMPLET ===\n"]
         
-        contract_parts = final_parts
+        # Single pass over the sections in order
+        for i, section in enumerate(sections):
+            section_clauses = clauses_by_section.get(section['key'])
+            header = f"\n**--- {section['order']}. {section['name']} ---**"
+            if section_clauses:
+                contract_parts.extend(_contract_preview_block(header, section_clauses, previous_blocks, blocks))
+            else:
+                contract_parts.append(f"{header} : aucune clause sélectionnée\n")
+                # Separator after an empty section when content follows it
+                next_has_content = i + 1 < len(sections) and sections[i + 1]['key'] in clauses_by_section
+                if next_has_content or has_uncategorized:
+                    contract_parts.append(separator)
         
         # Add uncategorized clauses at the end
-        if 'uncategorized' in clauses_by_section:
-            contract_parts.append("\n**--- Clauses non catégorisées ---**\n")
-            for clause in clauses_by_section['uncategorized']:
-                contract_parts.append(f"\n[{clause['name']}]\n")
-                clause_content = _get_clause_preview(clause)
-                if clause_content:
-                    contract_parts.append(clause_content)
-                else:
-                    contract_parts.append("(Contenu non disponible)")
-                contract_parts.append("\n")
-            
-            # Add separator after uncategorized section if it has clauses
-            contract_parts.append("="*50 + "\n")
+        if has_uncategorized:
+            contract_parts.extend(_contract_preview_block(
+                "\n**--- Clauses non catégorisées ---**", clauses_by_section['uncategorized'], previous_blocks, blocks
+            ))
         
+        st.session_state['contract_preview_blocks'] = blocks
         return "\n".join(contract_parts)
         
     except Exception as e:
         return f"Erreur lors de la génération de l'aperçu du contrat: {str(e)}"
 
 
+def _split_preview_pages(content: str) -> tuple:
+    """Pack a contract preview into pages of about PREVIEW_PAGE_CHARS, cut at line breaks.
+
+    Consecutive sections share a page while they fit, long sections span several pages.
+    Returns (pages, jumps): the page texts, and (section label, page index) for each
+    section that has clauses, in order.
+    """
+    # Sections start with a "**--- ... ---**" header line; the preview title goes with the first one
+    chunks = content.split("\n**--- ")
+    # (label, text, has clauses) of each section
+    sections = [(None, chunks[0], False)] if len(chunks) == 1 else [
+        (chunk.split(" ---**", 1)[0], (chunks[0] + "\n" if index == 1 else "") + "**--- " + chunk,
+         not chunk.split("\n", 1)[0].endswith(" : aucune clause sélectionnée"))
+        for index, chunk in enumerate(chunks) if index > 0
+    ]
+    pages, jumps = [], []
+    current, size = [], 0
+    for label, text, populated in sections:
+        for line in text.split("\n"):
+            if current and size + len(line) > PREVIEW_PAGE_CHARS:
+                pages.append("\n".join(current))
+                current, size = [], 0
+            # The section's header is the line starting with "**--- " (after the title for the first one)
+            if populated and line.startswith("**--- "):
+                jumps.append((label, len(pages)))
+                populated = False
+            current.append(line)
+            size += len(line) + 1
+    pages.append("\n".join(current))
+    return pages, jumps
+
+
+def _render_contract_preview_pager() -> str:
+    """Render the page navigation and the jump list of selected sections, and return the text of the current page."""
+    content = st.session_state['preview_content']
+    cached = st.session_state.get('preview_pages')
+    if not cached or cached[0] is not content:
+        cached = (content, *_split_preview_pages(content))
+        st.session_state['preview_pages'] = cached
+    _, pages, jumps = cached
+    
+    page = min(st.session_state.get('preview_page', 0), len(pages) - 1)
+    st.session_state['preview_page'] = page
+    
+    def move(step):
+        st.session_state['preview_page'] = max(0, min(len(pages) - 1, st.session_state['preview_page'] + step))
+    
+    def jump():
+        # The jump list is a command: go to the section's page, then show the placeholder again
+        st.session_state['preview_page'] = jumps[st.session_state['preview_section']][1]
+        st.session_state['preview_section'] = None
+    
+    nav_cols = st.columns([0.15, 0.7, 0.15])
+    with nav_cols[0]:
+        st.button("◀", key="preview_prev_page", on_click=move, args=(-1,), disabled=page == 0, use_container_width=True)
+    with nav_cols[1]:
+        st.selectbox(
+            "Aller à la section",
+            options=list(range(len(jumps))),
+            format_func=lambda i: jumps[i][0],
+            index=None,
+            placeholder="Aller à la section...",
+            key="preview_section",
+            on_change=jump,
+            disabled=not jumps,
+            label_visibility="collapsed"
+        )
+    with nav_cols[2]:
+        st.button("▶", key="preview_next_page", on_click=move, args=(1,), disabled=page == len(pages) - 1, use_container_width=True)
+    
+    page = st.session_state['preview_page']
+    on_page = [label for label, jump_page in jumps if jump_page == page]
+    st.caption(f"Page {page + 1}/{len(pages)}" + (f" — {', '.join(on_page)}" if on_page else ""))
+    return pages[page]
+
+
+def _contract_preview_block(header: str, clauses: list, previous_blocks: dict, blocks: dict) -> list:
+    """Return the preview parts of one section, reused while its clauses are unchanged."""
+    block_key = (header, tuple((c.get('file_path') or c.get('local_path'), c.get('content_hash')) for c in clauses))
+    parts = previous_blocks.get(block_key)
+    if parts is None:
+        parts = [f"{header}\n"]
+        for clause in clauses:
+            parts.append(f"\n[{clause['name']}]\n")
+            parts.append(_get_clause_preview(clause) or "(Contenu non disponible)")
+            parts.append("\n")
+        parts.append("="*50 + "\n")
+    blocks[block_key] = parts
+    return parts
+
+
 def _extract_docx_text(docx_path: str, max_chars: int = None) -> str:
     try:
-        doc = Document(docx_path)
-        texts = []
-        for p in doc.paragraphs:
-            if p.text and p.text.strip():
-                texts.append(p.text.strip())
-            if max_chars is not None and sum(len(t) for t in texts) > max_chars:
-                break
-        content = '\n'.join(texts)
-        if max_chars is not None and len(content) > max_chars:
-            content = content[:max_chars] + '…'
-        return content
+        return extract_docx_text(docx_path, max_chars)
     except Exception as e:
         return f"Erreur de lecture .docx: {str(e)}"
 
@@ -894,41 +1189,5 @@ def _show_assembly_gif():
             unsafe_allow_html=True
         )
 
-def _hide_assembly_gif(gif_placeholder):
-    """Hide the puzzle GIF with fade out and scale effect"""
-    gif_base64 = _get_base64_image("apigee_puzzle.gif")
-    if gif_base64:
-        gif_placeholder.markdown(
-            f"""
-            <div style="display: flex; justify-content: flex-start; margin-bottom: 15px;
-                        animation: collapseHeight 0.2s ease-out forwards;">
-                <img src="data:image/gif;base64,{gif_base64}" 
-                     alt="Assemblage en cours..." 
-                     style="width: 300px; height: auto; max-width: 100%; 
-                            opacity: 1; transform: scale(1);
-                            animation: fadeOutScale 0.2s ease-out forwards;">
-            </div>
-            <style>
-            @keyframes fadeOutScale {{
-                from {{ 
-                    opacity: 1; 
-                    transform: scale(1);
-                }}
-                to {{ 
-                    opacity: 0; 
-                    transform: scale(0);
-                }}
-            }}
-            @keyframes collapseHeight {{
-                from {{ height: auto; }}
-                to {{ height: 0; }}
-            }}
-            </style>
-            """,
-            unsafe_allow_html=True
-        )
-        time.sleep(0.2)  # Wait for fade out to complete
-        gif_placeholder.empty()
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
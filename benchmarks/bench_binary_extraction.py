@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark of the byte-scan text extraction used as last-resort .doc fallback.
+
+Compares DocConverter._extract_text_from_binary with the former per-byte loop on
+the legacy clauses of the library, inflated to large file sizes, and checks that
+both produce the same text.
+
+    python -m benchmarks.bench_binary_extraction --size-mb 20
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.doc_converter import DocConverter  # noqa: E402
+
+
+def reference_extract_text_from_binary(binary_content: bytes) -> str:
+    """Former per-byte implementation, kept as the reference for output and timing"""
+    text_chars = []
+
+    for byte in binary_content:
+        if 32 <= byte <= 126 or 128 <= byte <= 255:
+            text_chars.append(chr(byte))
+        elif byte in [10, 13]:
+            text_chars.append('\n')
+        else:
+            if text_chars and text_chars[-1] not in [' ', '\n']:
+                text_chars.append(' ')
+
+    raw_text = ''.join(text_chars)
+
+    lines = []
+    for line in raw_text.split('\n'):
+        cleaned_line = ' '.join(line.split())
+        if (len(cleaned_line) > 5 and
+                not cleaned_line.startswith(('>', '<', '{', '}', '\\', 'x')) and
+                not all(c in '~=-_*+#@$%^&()[]{}|\\<>/?.,;:\'"`' for c in cleaned_line) and
+                any(c.isalpha() for c in cleaned_line)):
+            lines.append(cleaned_line)
+
+    return '\n\n'.join(lines)
+
+
+def find_legacy_files(clauses_dir: str) -> List[str]:
+    paths = []
+    for root, _, files in os.walk(clauses_dir):
+        paths.extend(os.path.join(root, name) for name in files if name.endswith('.doc'))
+    return sorted(paths)
+
+
+def build_sample(seed: bytes, size: int) -> bytes:
+    """Repeat seed up to size bytes"""
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+def best_time(func: Callable[[bytes], str], data: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure l'extraction de texte brut des fichiers .doc")
+    parser.add_argument('--clauses-dir', default="clauses", help="Dossier contenant des clauses .doc")
+    parser.add_argument('--size-mb', type=float, default=10, help="Taille des fichiers simulés, en Mo")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre de mesures (meilleur temps retenu)")
+    args = parser.parse_args()
+
+    converter = DocConverter()
+    size = int(args.size_mb * 1024 * 1024)
+    samples = []
+    for path in find_legacy_files(args.clauses_dir):
+        with open(path, 'rb') as f:
+            samples.append((os.path.basename(path), build_sample(f.read(), size)))
+    samples.append(("octets aléatoires", random.Random(0).randbytes(size)))
+
+    print(f"{'Fichier':<25} {'Mo':>6} {'Avant (s)':>10} {'Après (s)':>10} {'Gain':>7}")
+    for name, data in samples:
+        if converter._extract_text_from_binary(data) != reference_extract_text_from_binary(data):
+            print(f"{name}: résultat différent de l'implémentation de référence")
+            sys.exit(1)
+        before = best_time(reference_extract_text_from_binary, data, args.repeat)
+        after = best_time(converter._extract_text_from_binary, data, args.repeat)
+        print(f"{name:<25} {len(data) / 1024 / 1024:>6.1f} {before:>10.3f} {after:>10.3f} {before / after:>6.0f}x")
+
+    converter.cleanup()
+
+
+if __name__ == "__main__":
+    main()
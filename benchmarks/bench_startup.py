@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark of the application's cold import time.
+
+Imports app.py in fresh interpreters with ``python -X importtime``, reports the
+total import time and the heaviest modules, and fails if a dependency that
+should only load on first use (SharePoint, LLM calls, conversion fallbacks) is
+imported at startup.
+
+    python -m benchmarks.bench_startup --repeat 5 --max-ms 1000
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level packages that must not be imported until the feature using them is
+LAZY_PACKAGES = ('office365', 'requests', 'pandas', 'mammoth', 'docx2txt')
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def measure_import(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Import module in a fresh interpreter; return the total in ms and {module: (cumulative us, depth)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        depth = (len(indent) - 1) // 2
+        modules[name] = (cumulative, depth)
+        if depth == 0:
+            total_us += cumulative
+    return total_us / 1000, modules
+
+
+def heaviest_modules(modules: Dict[str, Tuple[int, int]], count: int) -> List[Tuple[str, int]]:
+    """Top-level imports and their direct children, by cumulative import time"""
+    direct = [(name, cumulative) for name, (cumulative, depth) in modules.items() if depth <= 1]
+    return sorted(direct, key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le temps d'import au démarrage de l'application")
+    parser.add_argument('--module', default="app", help="Module à importer")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de mesures (meilleur temps retenu)")
+    parser.add_argument('--top', type=int, default=10, help="Nombre de modules les plus lents affichés")
+    parser.add_argument('--max-ms', type=float, default=None, help="Échec si le meilleur temps dépasse ce seuil")
+    args = parser.parse_args()
+
+    runs = [measure_import(args.module) for _ in range(args.repeat)]
+    best_ms, modules = min(runs, key=lambda run: run[0])
+
+    print(f"Import de {args.module}: meilleur {best_ms:.0f} ms, "
+          f"médiane {sorted(run[0] for run in runs)[len(runs) // 2]:.0f} ms sur {len(runs)} mesures")
+    print(f"{'Module':<40} {'Cumulé (ms)':>12}")
+    for name, cumulative in heaviest_modules(modules, args.top):
+        print(f"{name:<40} {cumulative / 1000:>12.1f}")
+
+    eager = sorted({name.split('.')[0] for name in modules} & set(LAZY_PACKAGES))
+    failed = False
+    if eager:
+        print(f"Dépendances importées au démarrage alors qu'elles devraient l'être à la demande: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and best_ms > args.max_ms:
+        print(f"Temps d'import {best_ms:.0f} ms au-delà du seuil de {args.max_ms:.0f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
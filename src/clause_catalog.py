@@ -0,0 +1,98 @@
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+from .local_client import LocalClauseClient
+from .parties_parser import get_parties_parser
+from .summarizer import ClauseSummaryStore
+
+# Minimum delay between two stat walks of the library, whichever session asks
+LIBRARY_CHECK_INTERVAL = 3.0
+
+
+class ClauseCatalog:
+    """Clause library listing shared by every session of the process.
+
+    The library is scanned once and the result is handed to all sessions as-is
+    (callers must not modify it). A cheap stat walk of the library tells when files
+    were added, removed or edited, or when parties.ini changed; only then is the
+    library scanned again. The walk runs at most once every LIBRARY_CHECK_INTERVAL
+    seconds per process, not on every rerun of every session.
+    """
+
+    def __init__(self, clauses_dir: str = "clauses"):
+        self.clauses_dir = clauses_dir
+        self.client = LocalClauseClient(clauses_dir)
+        # (clause files, clauses by section), replaced as a whole on each scan
+        self._listing: Tuple[List[Dict], Dict[str, List[Dict]]] = ([], {})
+        self._version: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def library_version(self) -> Tuple:
+        """Fingerprint of the library: section directories, clause files (mtime, size), summary store and sections"""
+        parser = get_parties_parser()
+        parser.reload_if_changed()
+        entries = []
+        try:
+            top_level = sorted(os.scandir(self.clauses_dir), key=lambda entry: entry.name)
+        except OSError:
+            return (None, parser.get_sections())
+        for entry in top_level:
+            if entry.is_dir():
+                try:
+                    files = sorted(os.scandir(entry.path), key=lambda item: item.name)
+                except OSError:
+                    continue
+                for item in files:
+                    if item.name.endswith(('.doc', '.docx')):
+                        stat = item.stat()
+                        entries.append((entry.name, item.name, stat.st_mtime_ns, stat.st_size))
+            else:
+                # Template (and former summary store) live at the top level
+                stat = entry.stat()
+                entries.append(('', entry.name, stat.st_mtime_ns, stat.st_size))
+        try:
+            # Precomputed clause summaries are kept in the cache directory
+            stat = os.stat(ClauseSummaryStore.store_path(self.clauses_dir))
+            entries.append((None, None, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            pass
+        return (tuple(entries), parser.get_sections())
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rescan the library if it changed since the last scan; return whether it did"""
+        now = time.monotonic()
+        if not force and self._version is not None and now - self._checked_at < LIBRARY_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        version = self.library_version()
+        if not force and version == self._version:
+            return False
+        with self._lock:
+            # Another session may have rescanned while this one waited
+            if not force and version == self._version:
+                return False
+            clause_files = self.client.get_clause_files()
+            self._listing = (clause_files, self.client.group_by_section(clause_files))
+            self._version = version
+        return True
+
+    def snapshot(self) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+        """Return the (clause files, clauses by section) of the last scan"""
+        return self._listing
+
+
+_catalogs: Dict[str, ClauseCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_clause_catalog(clauses_dir: str = "clauses") -> ClauseCatalog:
+    """Return the process-wide catalog of a clause library directory"""
+    path = os.path.abspath(clauses_dir)
+    with _catalogs_lock:
+        catalog = _catalogs.get(path)
+        if catalog is None:
+            catalog = ClauseCatalog(clauses_dir)
+            _catalogs[path] = catalog
+        return catalog
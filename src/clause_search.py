@@ -0,0 +1,210 @@
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+from .config import get_cache_dir
+from .docx_text import extract_docx_text
+from .word_binary import try_extract_word_text
+
+# Clauses written per transaction, so searches interleave with a long indexing run
+INDEX_BATCH_SIZE = 200
+# Relative weights of the name, section and content columns in the ranking
+RANK_WEIGHTS = (5.0, 2.0, 1.0)
+
+FRENCH_STOPWORDS = {
+    'a', 'au', 'aux', 'avec', 'ce', 'ces', 'd', 'dans', 'de', 'des', 'du', 'elle', 'en', 'et', 'il', 'ils',
+    'l', 'la', 'le', 'les', 'leur', 'leurs', 'lui', 'mais', 'ne', 'ni', 'nous', 'on', 'ou', 'par', 'pas',
+    'pour', 'qu', 'que', 'qui', 's', 'sa', 'se', 'ses', 'son', 'sur', 'un', 'une', 'vous',
+}
+# Inflectional and derivational endings removed from query terms (longest first)
+FRENCH_SUFFIXES = (
+    'issements', 'issement', 'atrices', 'ateurs', 'ations', 'atrice', 'ateur', 'ation', 'ements', 'ement',
+    'ances', 'ences', 'ables', 'ibles', 'istes', 'iques', 'euses', 'ance', 'ence', 'able', 'ible', 'iste',
+    'ique', 'euse', 'ites', 'ite', 'ives', 'ive', 'ifs', 'if', 'eaux', 'aux', 'ees', 'ee', 'es', 'er', 'ez',
+    'e', 's', 'x',
+)
+MIN_STEM_LENGTH = 4
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase text and strip diacritics (é -> e, ç -> c)"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def french_stem(term: str) -> str:
+    """Light French stemming: remove the longest known ending, keeping a minimal stem"""
+    for suffix in FRENCH_SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= MIN_STEM_LENGTH:
+            return term[:-len(suffix)]
+    return term
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn a free-text query into an FTS5 MATCH expression of stemmed prefix terms"""
+    terms = [fold_accents(token) for token in TOKEN_PATTERN.findall(query)]
+    stems = [french_stem(term) for term in terms if term not in FRENCH_STOPWORDS]
+    if not stems:
+        return None
+    # Each stem matches every word it prefixes: "resili" finds résilier, résiliation...
+    return ' '.join(f'"{stem}"*' for stem in dict.fromkeys(stems))
+
+
+def load_clause_text(path: str) -> str:
+    """Read the plain text of a clause file for indexing"""
+    if path.endswith('.doc'):
+        return try_extract_word_text(path) or ''
+    return extract_docx_text(path)
+
+
+class ClauseSearchIndex:
+    """Full-text index of clause contents, backed by SQLite FTS5.
+
+    The index is stored in the cache directory and updated incrementally from the
+    clause catalog: only clauses whose content hash changed are re-read. Accents are
+    folded by the unicode61 tokenizer and query terms are lightly stemmed.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(get_cache_dir('search'), 'clauses.sqlite')
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._indexing: Optional[threading.Thread] = None
+        # Makes the "already running?" check and the start of an update atomic
+        self._indexing_lock = threading.Lock()
+        # Latest (clause list, callback) of each library received while the indexer was running
+        self._pending: Dict[Optional[str], Tuple[List[Dict], Optional[Callable[[List[Dict]], None]]]] = {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS clauses (id INTEGER PRIMARY KEY, path TEXT UNIQUE, content_hash TEXT)"
+            )
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS clauses_fts USING fts5("
+                "name, section, content, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def update(self, clauses: List[Dict], library_dir: Optional[str] = None) -> int:
+        """Index new or changed clauses, drop the ones no longer in the catalog; return the number indexed.
+
+        Clauses are keyed by absolute path, so processes started from another working
+        directory share the index. When library_dir is given, only clauses of that
+        library are dropped, leaving other libraries sharing the index untouched.
+        """
+        with self._lock:
+            indexed = dict(self._conn.execute("SELECT path, content_hash FROM clauses").fetchall())
+
+        by_path = {os.path.abspath(clause['file_path']): clause for clause in clauses}
+        library_prefix = os.path.join(os.path.abspath(library_dir), '') if library_dir else ''
+        # Relative paths come from indexes written before paths were made absolute
+        removed = [path for path in indexed
+                   if not os.path.isabs(path) or (path not in by_path and path.startswith(library_prefix))]
+        changed = [(path, clause) for path, clause in by_path.items()
+                   if indexed.get(path) != clause.get('content_hash') or not clause.get('content_hash')]
+
+        with self._lock, self._conn:
+            for path in removed:
+                self._delete(path)
+
+        for start in range(0, len(changed), INDEX_BATCH_SIZE):
+            batch = changed[start:start + INDEX_BATCH_SIZE]
+            # Read files outside the lock, searches keep running meanwhile
+            rows = []
+            for path, clause in batch:
+                try:
+                    rows.append((path, clause, load_clause_text(path)))
+                except Exception:
+                    continue
+            with self._lock, self._conn:
+                for path, clause, text in rows:
+                    self._delete(path)
+                    cursor = self._conn.execute(
+                        "INSERT INTO clauses (path, content_hash) VALUES (?, ?)",
+                        (path, clause.get('content_hash'))
+                    )
+                    self._conn.execute(
+                        "INSERT INTO clauses_fts (rowid, name, section, content) VALUES (?, ?, ?, ?)",
+                        (cursor.lastrowid, clause['name'], clause.get('section_name', ''), text)
+                    )
+        return len(changed)
+
+    def update_in_background(self, clauses: List[Dict], library_dir: Optional[str] = None,
+                             on_indexed: Optional[Callable[[List[Dict]], None]] = None):
+        """Run update on a background thread, then on_indexed(clauses) on the same thread.
+
+        While an update runs, the list is kept for the thread to index next.
+        """
+        with self._indexing_lock:
+            self._pending[library_dir] = (list(clauses), on_indexed)
+            if self._indexing is not None and self._indexing.is_alive():
+                return
+            self._indexing = threading.Thread(target=self._index_pending, name='clausier-search-index', daemon=True)
+            self._indexing.start()
+
+    def _index_pending(self):
+        """Indexer thread: update from the latest pending lists until none is left"""
+        while True:
+            with self._indexing_lock:
+                if not self._pending:
+                    # Exiting under the lock: a list arriving now starts a new thread
+                    self._indexing = None
+                    return
+                library_dir, (clauses, on_indexed) = self._pending.popitem()
+            try:
+                self.update(clauses, library_dir)
+                if on_indexed is not None:
+                    on_indexed(clauses)
+            except Exception:
+                continue
+
+    def indexed_text(self, path: str, content_hash: Optional[str]) -> Optional[str]:
+        """Return the text indexed for a clause, or None if it is not indexed at this content hash"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT clauses.content_hash, clauses_fts.content FROM clauses "
+                "JOIN clauses_fts ON clauses_fts.rowid = clauses.id WHERE clauses.path = ?",
+                (os.path.abspath(path),)
+            ).fetchone()
+        if row is None or not content_hash or row[0] != content_hash:
+            return None
+        return row[1]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Return the best matching clauses: absolute path, name, section, snippet and score"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT clauses.path, clauses_fts.name, clauses_fts.section, "
+                "snippet(clauses_fts, 2, '**', '**', '…', 12), bm25(clauses_fts, ?, ?, ?) AS score "
+                "FROM clauses_fts JOIN clauses ON clauses.id = clauses_fts.rowid "
+                "WHERE clauses_fts MATCH ? ORDER BY score LIMIT ?",
+                (*RANK_WEIGHTS, match, limit)
+            ).fetchall()
+        return [
+            {'path': path, 'name': name, 'section': section, 'snippet': snippet, 'score': -score}
+            for path, name, section, snippet, score in rows
+        ]
+
+    def _delete(self, path: str):
+        """Remove a clause from the index (caller holds the lock, inside a transaction)"""
+        row = self._conn.execute("SELECT id FROM clauses WHERE path = ?", (path,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM clauses_fts WHERE rowid = ?", row)
+            self._conn.execute("DELETE FROM clauses WHERE id = ?", row)
+
+
+_search_index: Optional[ClauseSearchIndex] = None
+_search_index_lock = threading.Lock()
+
+
+def get_clause_search_index() -> ClauseSearchIndex:
+    """Return the process-wide clause search index"""
+    global _search_index
+    with _search_index_lock:
+        if _search_index is None:
+            _search_index = ClauseSearchIndex()
+        return _search_index
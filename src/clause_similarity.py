@@ -0,0 +1,160 @@
+import os
+import hashlib
+import threading
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from .clause_search import fold_accents, get_clause_search_index, load_clause_text, TOKEN_PATTERN
+
+# Signature slots (bins of the one-permutation MinHash)
+NUM_PERMUTATIONS = 128
+# Words per shingle
+SHINGLE_SIZE = 3
+# Estimated Jaccard similarity above which two clauses are variants of each other
+DEFAULT_VARIANT_THRESHOLD = 0.6
+# (bands, rows) splits of the signature; the LSH threshold is about (1/bands) ** (1/rows)
+LSH_LAYOUTS = ((8, 16), (16, 8), (32, 4), (64, 2))
+
+# Bin values are 57-bit: the offset keeps borrowed values distinct from native ones
+EMPTY_BIN = (1 << 64) - 1
+ROTATION_OFFSET = 1 << 57
+
+# Content hash -> MinHash signature, shared by all catalog loads of the process
+_signature_cache: Dict[str, array] = {}
+_signature_lock = threading.Lock()
+
+
+def shingles(text: str) -> set:
+    """Return the accent-folded word shingles of text"""
+    words = TOKEN_PATTERN.findall(fold_accents(text))
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text: str) -> Optional[array]:
+    """Return the MinHash signature of text, or None if it has no words.
+
+    One-permutation hashing: each shingle is hashed once and kept if it is the
+    minimum of its bin, so the cost is linear in the text length. Empty bins borrow
+    the value of the next non-empty bin (rotation densification).
+    """
+    signature = [EMPTY_BIN] * NUM_PERMUTATIONS
+    for shingle in shingles(text):
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        slot, value = h % NUM_PERMUTATIONS, h // NUM_PERMUTATIONS
+        if value < signature[slot]:
+            signature[slot] = value
+    if all(value == EMPTY_BIN for value in signature):
+        return None
+
+    filled = list(signature)
+    for slot in range(NUM_PERMUTATIONS):
+        distance = 1
+        while filled[slot] == EMPTY_BIN:
+            borrowed = signature[(slot + distance) % NUM_PERMUTATIONS]
+            if borrowed != EMPTY_BIN:
+                filled[slot] = borrowed + distance * ROTATION_OFFSET
+            distance += 1
+    return array('Q', filled)
+
+
+def estimated_similarity(first: array, second: array) -> float:
+    """Fraction of equal signature slots, an estimate of the Jaccard similarity"""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERMUTATIONS
+
+
+def lsh_layout(threshold: float) -> Tuple[int, int]:
+    """Pick the (bands, rows) split whose LSH threshold is the closest below threshold"""
+    candidates = [(bands, rows) for bands, rows in LSH_LAYOUTS if (1 / bands) ** (1 / rows) <= threshold]
+    if not candidates:
+        return LSH_LAYOUTS[-1]
+    return max(candidates, key=lambda layout: (1 / layout[0]) ** (1 / layout[1]))
+
+
+def find_variant_families(items: Iterable[Tuple[str, str, array]], threshold: float) -> List[List[Tuple[str, float]]]:
+    """Group (key, group, signature) items into families of near-duplicates within each group.
+
+    Candidate pairs come from LSH buckets, so only items sharing a band of their
+    signature are compared; candidates are kept when their estimated similarity
+    reaches threshold. Returns families of two or more (key, similarity to the
+    family's first key) pairs, in the order items were given.
+    """
+    items = list(items)
+    bands, rows = lsh_layout(threshold)
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = defaultdict(list)
+    for index, (_, group, signature) in enumerate(items):
+        for band in range(bands):
+            buckets[(group, band, tuple(signature[band * rows:(band + 1) * rows]))].append(index)
+
+    checked = set()
+    for members in buckets.values():
+        for position, i in enumerate(members):
+            for j in members[position + 1:]:
+                if (i, j) in checked or find(i) == find(j):
+                    continue
+                checked.add((i, j))
+                if estimated_similarity(items[i][2], items[j][2]) >= threshold:
+                    parent[max(find(i), find(j))] = min(find(i), find(j))
+
+    families = defaultdict(list)
+    for index in range(len(items)):
+        families[find(index)].append(index)
+    return [
+        [(items[index][0], estimated_similarity(items[root][2], items[index][2])) for index in members]
+        for root, members in families.items() if len(members) > 1
+    ]
+
+
+def annotate_variant_families(clauses: List[Dict], threshold: Optional[float] = None):
+    """Set 'variant_family' (name of the family's first clause, or None) and 'variant_similarity' on each clause.
+
+    Runs after search indexing, off the listing path: the signatures are computed
+    first and the clauses are annotated afterwards in a single quick pass.
+    """
+    threshold = threshold or float(os.getenv('CLAUSIER_VARIANT_THRESHOLD', DEFAULT_VARIANT_THRESHOLD))
+    items = []
+    for clause in clauses:
+        signature = _clause_signature(clause)
+        if signature is not None:
+            items.append((clause['file_path'], clause.get('section_tag'), signature))
+
+    by_path = {clause['file_path']: clause for clause in clauses}
+    families = {}
+    for family in find_variant_families(items, threshold):
+        representative = by_path[family[0][0]]['name']
+        for path, similarity in family:
+            families[path] = (representative, similarity)
+
+    for clause in clauses:
+        representative, similarity = families.get(clause['file_path'], (None, None))
+        # Readers check the family first: its similarity must already be there
+        clause['variant_similarity'] = similarity
+        clause['variant_family'] = representative
+
+
+def _clause_signature(clause: Dict) -> Optional[array]:
+    content_hash = clause.get('content_hash')
+    with _signature_lock:
+        if content_hash in _signature_cache:
+            return _signature_cache[content_hash]
+    try:
+        # The search index already holds the text of indexed clauses
+        text = get_clause_search_index().indexed_text(clause['file_path'], content_hash)
+        if text is None:
+            text = load_clause_text(clause['file_path'])
+        signature = minhash_signature(text)
+    except Exception:
+        return None
+    if content_hash:
+        with _signature_lock:
+            _signature_cache[content_hash] = signature
+    return signature
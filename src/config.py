@@ -27,4 +27,41 @@ class SharePointConfig:
             config.password = secrets.get('password', '')
             config.document_library = secrets.get('document_library', 'Documents partagés')
             config.clauses_folder = secrets.get('clauses_folder', 'Clauses')
-        return config
\ No newline at end of file
+        return config
+
+
+def get_cache_dir(name: str) -> str:
+    """Return (and create) a persistent cache directory shared by all sessions"""
+    import tempfile
+    base_dir = os.getenv('CLAUSIER_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'clausier_cache'))
+    cache_dir = os.path.join(base_dir, name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+
+def prune_cache_dir(cache_dir: str, suffix: str, max_bytes: int, keep: Optional[str] = None):
+    """Remove the least recently used entries (files ending in suffix, except keep) until the
+    directory fits within max_bytes; callers mark entries as used by touching their mtime"""
+    entries = []
+    total = 0
+    try:
+        for entry in os.scandir(cache_dir):
+            if entry.is_file() and entry.name.endswith(suffix):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+    except OSError:
+        return
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            continue
+        if total <= max_bytes:
+            break
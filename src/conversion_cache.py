@@ -0,0 +1,74 @@
+import os
+import shutil
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+from .config import get_cache_dir, prune_cache_dir
+from .hashing import file_content_hash
+
+# Default size bound of the on-disk conversion cache
+DEFAULT_MAX_CACHE_MB = 500
+
+
+class ConversionCache:
+    """On-disk cache of converted legacy documents shared by all sessions.
+
+    Entries are keyed by the source file's content hash and the converter version,
+    so a legacy clause is converted at most once per change. The least recently
+    used entries are evicted when the cache exceeds its size bound.
+    """
+
+    def __init__(self, converter_version: str, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.converter_version = converter_version
+        self.cache_dir = cache_dir or get_cache_dir('conversions')
+        self.max_bytes = max_bytes or int(os.getenv('CLAUSIER_CONVERSION_CACHE_MB', DEFAULT_MAX_CACHE_MB)) * 1024 * 1024
+        # Avoid re-hashing unchanged files: (path, mtime, size) -> content hash
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source_path: str) -> Optional[str]:
+        """Return the cached conversion of source_path, if any"""
+        entry_path = self._entry_path(source_path)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            # Mark as recently used for eviction
+            os.utime(entry_path)
+        except OSError:
+            return None
+        return entry_path
+
+    def contains(self, source_path: str) -> bool:
+        """Tell whether source_path has a cached conversion, without touching it"""
+        try:
+            return os.path.exists(self._entry_path(source_path))
+        except OSError:
+            return False
+
+    def put(self, source_path: str, converted_path: str) -> str:
+        """Store a converted document and return the cached copy's path"""
+        entry_path = self._entry_path(source_path)
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(converted_path, tmp_path)
+        os.replace(tmp_path, entry_path)
+        self._evict(keep=entry_path)
+        return entry_path
+
+    def _entry_path(self, source_path: str) -> str:
+        key = hashlib.sha256(f"{self._content_hash(source_path)}:{self.converter_version}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.docx")
+
+    def _content_hash(self, source_path: str) -> str:
+        stat = os.stat(source_path)
+        memo_key = (os.path.abspath(source_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            content_hash = self._hash_memo.get(memo_key)
+        if content_hash is None:
+            content_hash = file_content_hash(source_path)
+            with self._lock:
+                self._hash_memo[memo_key] = content_hash
+        return content_hash
+
+    def _evict(self, keep: str):
+        """Remove least recently used entries (except keep) until the cache fits its size bound"""
+        prune_cache_dir(self.cache_dir, '.docx', self.max_bytes, keep=keep)
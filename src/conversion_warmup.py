@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from .doc_converter import get_doc_converter
+from .libreoffice_pool import get_libreoffice_pool
+
+# Legacy clauses converted together, in one soffice invocation when UNO is not available
+WARMUP_BATCH_SIZE = 16
+
+
+class ConversionWarmup:
+    """Converts the legacy clauses of the catalog ahead of time, in the background.
+
+    Queued clauses are converted in batches on a single thread and a single
+    LibreOffice worker, so the others stay free for on-demand conversions and,
+    without the UNO bindings, each batch pays the soffice start-up only once.
+    Results land in the shared conversion cache, where assemblies pick them up.
+    """
+
+    def __init__(self):
+        self.converter = get_doc_converter()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='clausier-warmup')
+        # Source path -> catalog entries waiting for its conversion
+        self._waiting: Dict[str, List[Dict]] = {}
+        # Source paths not yet handed to the converter, in scheduling order
+        self._queued: List[str] = []
+        self._draining = False
+        self._lock = threading.Lock()
+
+    def schedule(self, clauses: List[Dict]):
+        """Queue the conversion of every legacy clause not converted yet"""
+        with self._lock:
+            for clause in clauses:
+                if clause.get('conversion_ready', True):
+                    continue
+                path = clause['file_path']
+                if path not in self._waiting:
+                    self._queued.append(path)
+                self._waiting.setdefault(path, []).append(clause)
+            start = bool(self._queued) and not self._draining
+            if start:
+                self._draining = True
+        if start:
+            self._executor.submit(self._drain)
+
+    def _drain(self):
+        """Convert queued clauses batch by batch until the queue is empty"""
+        while True:
+            with self._lock:
+                batch = self._queued[:WARMUP_BATCH_SIZE]
+                del self._queued[:WARMUP_BATCH_SIZE]
+                if not batch:
+                    self._draining = False
+                    return
+            try:
+                results = self.converter.convert_many(batch, spread=1)
+            except Exception:
+                results = {}
+            for path in batch:
+                with self._lock:
+                    clauses = self._waiting.pop(path, [])
+                # Publish readiness in the catalog entries
+                for clause in clauses:
+                    clause['conversion_ready'] = results.get(path) is not None
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._waiting)
+
+
+_warmup: Optional[ConversionWarmup] = None
+_warmup_lock = threading.Lock()
+
+
+def get_conversion_warmup() -> Optional[ConversionWarmup]:
+    """Return the process-wide warm-up queue, or None if LibreOffice is not installed"""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None and get_libreoffice_pool() is not None:
+            _warmup = ConversionWarmup()
+        return _warmup
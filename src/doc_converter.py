@@ -1,18 +1,77 @@
 #!/usr/bin/env python3
 
 import os
+import re
+import time
+import argparse
 import tempfile
-from typing import Optional, Tuple
+import uuid
+import threading
+from typing import Dict, List, Optional, Tuple
 from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 import streamlit as st
+from .libreoffice_pool import LibreOfficePool, find_soffice, get_libreoffice_pool
+from .conversion_cache import ConversionCache
+from .word_binary import try_extract_word_text
+from .scratch_space import get_scratch_space
+
+# Bump when the conversion output changes, to invalidate cached conversions
+CONVERTER_VERSION = "libreoffice-1"
+# Uncached outputs (text extraction, placeholders) are read right away by the caller;
+# the converter deletes the ones older than this when it writes new outputs
+OUTPUT_RETENTION_SECONDS = 600
+
+# Byte-scan fallback: control bytes (and Latin-1 whitespace) become spaces, CR/LF newlines
+BINARY_TEXT_TABLE = bytes(
+    10 if byte in (10, 13) else 32 if byte < 32 or byte in (127, 0x85, 0xA0) else byte
+    for byte in range(256)
+)
+# Lines longer than 5 characters, containing a letter and not starting like formatting code
+TEXT_LINE_PATTERN = re.compile(
+    rb'^(?![<>{}\\x])(?=[^\n]*?[A-Za-z\xaa\xb5\xba\xc0-\xd6\xd8-\xf6\xf8-\xff])[^\n]{6,}$',
+    re.MULTILINE
+)
 
 class DocConverter:
     """Handles conversion of legacy .doc files to .docx format for processing"""
     
     def __init__(self):
-        self.temp_dir = tempfile.mkdtemp()
+        self._scratch_name = f"converter-{uuid.uuid4().hex[:8]}"
+        self.cache = ConversionCache(CONVERTER_VERSION)
+    
+    @property
+    def temp_dir(self) -> str:
+        """Working directory of the converter in the scratch space (recreated if it was collected)"""
+        return get_scratch_space().directory('converters', self._scratch_name)
+    
+    def _output_path(self, doc_file_path: str, prefix: str) -> str:
+        """New uniquely named .docx in the converter's directory: the converter is shared, so
+        concurrent conversions (and same-named files of different sections) never share an output"""
+        temp_dir = self.temp_dir
+        self._prune_outputs(temp_dir)
+        base_name = os.path.splitext(os.path.basename(doc_file_path))[0]
+        fd, path = tempfile.mkstemp(prefix=f"{prefix}_{base_name}_", suffix='.docx', dir=temp_dir)
+        os.close(fd)
+        return path
+    
+    def _prune_outputs(self, temp_dir: str):
+        """Delete outputs older than OUTPUT_RETENTION_SECONDS (the shared converter never goes idle long enough for the scratch TTL)"""
+        cutoff = time.time() - OUTPUT_RETENTION_SECONDS
+        try:
+            for entry in os.scandir(temp_dir):
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    self._remove_output(entry.path)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _remove_output(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
     
     def is_legacy_doc_file(self, file_path: str) -> bool:
         """Check if a file is a legacy .doc file that needs conversion"""
@@ -30,12 +89,49 @@ class DocConverter:
                 'not a word file', 'content type', 'zip', 'ole', 'compound'
             ])
     
-    def convert_doc_to_docx(self, doc_file_path: str) -> Optional[str]:
-        """Convert legacy .doc file to .docx format - for now, create a placeholder"""
+    def convert_doc_to_docx(self, doc_file_path: str, warnings: Optional[List[str]] = None) -> Optional[str]:
+        """Convert legacy .doc file to .docx format, falling back to a placeholder document.
+
+        Degraded conversions are reported in warnings when a list is given (callers
+        running outside a Streamlit session, such as job workers), on the page otherwise.
+        """
+        
+        # Converted at most once per content change, across sessions
+        cached_path = self.cache.get(doc_file_path)
+        if cached_path:
+            return cached_path
+        
+        # Real conversion through the shared pool of LibreOffice workers
+        converted_path = None
+        try:
+            converted_path = self._convert_using_libreoffice(doc_file_path)
+            return self.cache.put(doc_file_path, converted_path)
+        except Exception:
+            pass
+        finally:
+            # Only the cached copy is kept
+            if converted_path:
+                self._remove_output(converted_path)
+        
+        # Without LibreOffice, keep at least the text read from the Word streams
+        try:
+            converted_path = self._convert_using_basic_extraction(doc_file_path)
+            message = f"{os.path.basename(doc_file_path)} : texte extrait sans mise en forme (LibreOffice indisponible)"
+            if warnings is not None:
+                warnings.append(message)
+            else:
+                st.warning(f"⚠️ {message}")
+            return converted_path
+        except Exception:
+            pass
         
         # For problematic .doc files, create a clear placeholder document
-        st.error(f"⚠️ Fichier .doc non supporté: {os.path.basename(doc_file_path)}")
-        st.info("💡 Solution: Convertir manuellement ce fichier .doc en .docx avec Microsoft Word ou LibreOffice")
+        if warnings is not None:
+            warnings.append(f"Fichier .doc non supporté: {os.path.basename(doc_file_path)} "
+                            "(à convertir manuellement en .docx avec Microsoft Word ou LibreOffice)")
+        else:
+            st.error(f"⚠️ Fichier .doc non supporté: {os.path.basename(doc_file_path)}")
+            st.info("💡 Solution: Convertir manuellement ce fichier .doc en .docx avec Microsoft Word ou LibreOffice")
         
         # Create a placeholder document explaining the issue
         new_doc = Document()
@@ -73,11 +169,53 @@ class DocConverter:
             step_run.font.size = Pt(10)
         
         # Save placeholder document
-        temp_docx_path = os.path.join(self.temp_dir, f"placeholder_{os.path.basename(doc_file_path)}.docx")
+        temp_docx_path = self._output_path(doc_file_path, 'placeholder')
         new_doc.save(temp_docx_path)
         
         return temp_docx_path
     
+    def convert_many(self, doc_file_paths: List[str], max_workers: Optional[int] = None,
+                     spread: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """Convert many legacy .doc files at once.
+
+        Cached conversions are reused; the others are converted in a single converter
+        session per LibreOffice worker, with the files spread over max_workers workers
+        (a dedicated pool) or over spread workers of the shared pool. Returns source
+        path -> converted path, or None for files that could not be converted.
+        """
+        results: Dict[str, Optional[str]] = {}
+        pending = []
+        for doc_file_path in doc_file_paths:
+            cached_path = self.cache.get(doc_file_path)
+            if cached_path:
+                results[doc_file_path] = cached_path
+            else:
+                pending.append(doc_file_path)
+        
+        if not pending:
+            return results
+        
+        if max_workers and find_soffice():
+            pool = LibreOfficePool(size=max_workers)
+        else:
+            pool = None if max_workers else get_libreoffice_pool()
+        if pool is None:
+            # Without LibreOffice nothing is converted; callers fall back on text extraction
+            results.update({doc_file_path: None for doc_file_path in pending})
+            return results
+        
+        jobs = [(doc_file_path, self._output_path(doc_file_path, 'converted')) for doc_file_path in pending]
+        try:
+            for doc_file_path, converted_path in pool.convert_batch(jobs, spread=spread).items():
+                results[doc_file_path] = self.cache.put(doc_file_path, converted_path) if converted_path else None
+        finally:
+            if max_workers:
+                pool.shutdown()
+            # Converted files now live in the cache; failed ones left empty outputs behind
+            for _, converted_path in jobs:
+                self._remove_output(converted_path)
+        return results
+    
     def _convert_using_textract(self, doc_file_path: str) -> str:
         """Convert using mammoth library for clean text extraction"""
         try:
@@ -127,7 +265,7 @@ class DocConverter:
                     run.font.size = Pt(11)
         
         # Save to temporary file
-        temp_docx_path = os.path.join(self.temp_dir, f"mammoth_converted_{os.path.basename(doc_file_path)}.docx")
+        temp_docx_path = self._output_path(doc_file_path, 'mammoth_converted')
         new_doc.save(temp_docx_path)
         
         return temp_docx_path
@@ -180,7 +318,7 @@ class DocConverter:
                     run.font.size = Pt(11)
         
         # Save to temporary file
-        temp_docx_path = os.path.join(self.temp_dir, f"converted_{os.path.basename(doc_file_path)}.docx")
+        temp_docx_path = self._output_path(doc_file_path, 'converted')
         new_doc.save(temp_docx_path)
         
         return temp_docx_path
@@ -217,14 +355,23 @@ class DocConverter:
         except Exception as e:
             raise ValueError(f"Erreur antiword: {str(e)}")
     
+    def extract_text(self, doc_file_path: str) -> Optional[str]:
+        """Return the plain text of a legacy .doc file, or None if it cannot be read"""
+        # Decoding the Word piece table is far cheaper than a full conversion
+        text_content = try_extract_word_text(doc_file_path)
+        if text_content is not None:
+            return text_content
+        
+        try:
+            with open(doc_file_path, 'rb') as f:
+                return self._extract_text_from_binary(f.read())
+        except Exception:
+            return None
+    
     def _convert_using_basic_extraction(self, doc_file_path: str) -> str:
         """Basic text extraction as last resort"""
         try:
-            with open(doc_file_path, 'rb') as f:
-                content = f.read()
-            
-            # Try to extract readable text
-            text_content = self._extract_text_from_binary(content)
+            text_content = self.extract_text(doc_file_path)
             
             if not text_content or len(text_content.strip()) < 10:
                 raise ValueError("Pas assez de texte extrait")
@@ -235,83 +382,22 @@ class DocConverter:
             raise ValueError(f"Extraction basique échouée: {str(e)}")
     
     def _convert_using_libreoffice(self, doc_file_path: str) -> str:
-        """Convert using LibreOffice command line (explicit Word filter)"""
-        import subprocess
-        import shutil
-        
-        # Check if LibreOffice is available
-        libreoffice_cmd = None
-        for cmd in ['libreoffice', 'soffice']:
-            if shutil.which(cmd):
-                libreoffice_cmd = cmd
-                break
-        
-        if not libreoffice_cmd:
+        """Convert using the shared pool of long-lived headless LibreOffice workers"""
+        pool = get_libreoffice_pool()
+        if pool is None:
             raise ValueError("LibreOffice non trouvé sur le système")
         
-        # Convert using LibreOffice headless mode
-        output_dir = tempfile.mkdtemp()
-        cmd = [
-            libreoffice_cmd,
-            '--headless',
-            '--convert-to', 'docx:"MS Word 2007 XML"',
-            '--outdir', output_dir,
-            doc_file_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        
-        if result.returncode != 0:
-            raise ValueError(f"Conversion LibreOffice échouée: {result.stderr or result.stdout}")
-        
-        # Find the converted file
-        base_name = os.path.splitext(os.path.basename(doc_file_path))[0]
-        converted_path = os.path.join(output_dir, f"{base_name}.docx")
-        
-        if not os.path.exists(converted_path):
-            raise ValueError("Fichier converti non trouvé")
-        
-        # Move to our temp directory
-        final_path = os.path.join(self.temp_dir, f"converted_{base_name}.docx")
-        shutil.move(converted_path, final_path)
-        shutil.rmtree(output_dir, ignore_errors=True)
-        
-        return final_path
+        return pool.convert(doc_file_path, self._output_path(doc_file_path, 'converted'))
     
     def _extract_text_from_binary(self, binary_content: bytes) -> str:
         """Extract readable text from binary .doc content (improved approach)"""
-        # This is a more sophisticated text extraction approach
-        text_chars = []
-        
-        for byte in binary_content:
-            # Look for printable ASCII characters and extended ASCII for accents
-            if 32 <= byte <= 126 or 128 <= byte <= 255:  # Extended ASCII range
-                text_chars.append(chr(byte))
-            elif byte in [10, 13]:  # Newline characters
-                text_chars.append('\n')
-            else:
-                # Skip control characters but keep spacing
-                if text_chars and text_chars[-1] not in [' ', '\n']:
-                    text_chars.append(' ')
-        
-        # Clean up the extracted text
-        raw_text = ''.join(text_chars)
+        # Control bytes become spaces and CR a newline, over the whole buffer at once
+        buffer = binary_content.translate(BINARY_TEXT_TABLE)
+        # Collapse and trim spaces, one C-level split/join per line
+        buffer = b'\n'.join([b' '.join(line.split()) for line in buffer.split(b'\n')])
         
-        # Better text cleaning
-        lines = []
-        for line in raw_text.split('\n'):
-            # Remove excessive spaces and clean up
-            cleaned_line = ' '.join(line.split())
-            
-            # Filter out lines that are likely formatting artifacts
-            if (len(cleaned_line) > 5 and  # Minimum length
-                not cleaned_line.startswith(('>', '<', '{', '}', '\\', 'x')) and  # Skip formatting chars
-                not all(c in '~=-_*+#@$%^&()[]{}|\\<>/?.,;:\'"`' for c in cleaned_line) and  # Skip symbol lines
-                any(c.isalpha() for c in cleaned_line)):  # Must contain letters
-                lines.append(cleaned_line)
-        
-        # Join with proper paragraph breaks
-        return '\n\n'.join(lines)
+        # Keep lines that look like text, joined with paragraph breaks
+        return b'\n\n'.join(TEXT_LINE_PATTERN.findall(buffer)).decode('latin-1')
     
     def _create_docx_from_text(self, text_content: str, original_path: str) -> str:
         """Create a .docx file from extracted text"""
@@ -324,8 +410,7 @@ class DocConverter:
                 para = new_doc.add_paragraph(para_text.strip())
         
         # Save to temporary file
-        base_name = os.path.splitext(os.path.basename(original_path))[0]
-        temp_docx_path = os.path.join(self.temp_dir, f"converted_{base_name}.docx")
+        temp_docx_path = self._output_path(original_path, 'converted')
         new_doc.save(temp_docx_path)
         
         return temp_docx_path
@@ -346,7 +431,60 @@ class DocConverter:
     def cleanup(self):
         """Clean up temporary files"""
         try:
-            import shutil
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            get_scratch_space().release('converters', self._scratch_name)
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+_shared_converter: Optional[DocConverter] = None
+_shared_converter_lock = threading.Lock()
+
+
+def get_doc_converter() -> DocConverter:
+    """Return the converter shared by the catalog, previews and mergers of this process"""
+    global _shared_converter
+    with _shared_converter_lock:
+        if _shared_converter is None:
+            _shared_converter = DocConverter()
+        return _shared_converter
+
+
+def convert_library(clauses_dir: str = "clauses", max_workers: Optional[int] = None) -> Dict[str, float]:
+    """Convert every legacy .doc file of the clause library and return throughput statistics"""
+    converter = DocConverter()
+    doc_files = []
+    for root, _, files in os.walk(clauses_dir):
+        for filename in files:
+            file_path = os.path.join(root, filename)
+            if filename.endswith('.doc') and not filename.startswith('~$') and converter.is_legacy_doc_file(file_path):
+                doc_files.append(file_path)
+    
+    cached = sum(1 for file_path in doc_files if converter.cache.get(file_path))
+    start = time.perf_counter()
+    results = converter.convert_many(doc_files, max_workers=max_workers or os.cpu_count())
+    elapsed = time.perf_counter() - start
+    converter.cleanup()
+    
+    converted = sum(1 for path in results.values() if path)
+    return {
+        'libreoffice': find_soffice() is not None,
+        'files': len(doc_files),
+        'converted': converted,
+        'cached': cached,
+        'failed': len(doc_files) - converted,
+        'seconds': elapsed,
+        'files_per_second': (converted - cached) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convertit en .docx tous les fichiers .doc legacy de la bibliothèque de clauses")
+    parser.add_argument('--clauses-dir', default="clauses", help="Dossier racine des clauses")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre d'instances LibreOffice en parallèle (par défaut: nombre de cœurs)")
+    args = parser.parse_args()
+    
+    stats = convert_library(args.clauses_dir, args.workers)
+    if not stats['libreoffice']:
+        print("LibreOffice non disponible sur ce système : seules les conversions déjà en cache sont disponibles")
+    print(f"{stats['files']} fichier(s) .doc : {stats['converted']} converti(s) dont {stats['cached']} depuis le cache, {stats['failed']} échec(s)")
+    print(f"Durée : {stats['seconds']:.2f} s, débit : {stats['files_per_second']:.1f} fichiers/s")
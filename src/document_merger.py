@@ -1,23 +1,66 @@
 import os
-import tempfile
-from typing import List
-import requests
+import uuid
+import threading
+from io import BytesIO
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from copy import deepcopy
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.shared import OxmlElement, qn
-import streamlit as st
-from .doc_converter import DocConverter
+from docx.text.paragraph import Paragraph
+from .doc_converter import get_doc_converter
+from .summarizer import ContractSummarizer
+from .progress import ProgressCallback, report_progress
+from .scratch_space import get_scratch_space
+
+# Summaries are produced off the critical path; the LLM call is network bound
+_summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='clausier-summary')
+
+# Template path -> (mtime_ns, size, file bytes), shared by every merger of the process
+_template_cache: Dict[str, Tuple[int, int, bytes]] = {}
+_template_cache_lock = threading.Lock()
+
+
+def _load_template(template_path: str) -> Document:
+    """Open the template from the process-wide copy of its bytes, re-read when the file changes"""
+    path = os.path.abspath(template_path)
+    stat = os.stat(path)
+    with _template_cache_lock:
+        cached = _template_cache.get(path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            with open(path, 'rb') as f:
+                cached = (stat.st_mtime_ns, stat.st_size, f.read())
+            _template_cache[path] = cached
+    return Document(BytesIO(cached[2]))
+
 
 class DocumentMerger:
     """Handle merging of Word documents containing clauses"""
     
-    def __init__(self, template_path: str = "clauses/Exemple contrat V2 clausier km.docx", enable_summary: bool = False):
-        self.output_dir = tempfile.mkdtemp()
+    def __init__(self, template_path: str = "clauses/Exemple contrat V2 clausier km.docx", enable_summary: bool = False,
+                 summary_endpoint: Optional[str] = None, scratch_owner: Optional[str] = None):
+        # Outputs live in the owner's scratch directory (the browser session's when given);
+        # a merger without owner is its own owner, collected once it has been idle long enough
+        name = f"merger-{uuid.uuid4().hex[:8]}"
+        self.scratch_owner = scratch_owner or name
+        self._scratch_parts = (name,) if scratch_owner else ()
         self.template_path = template_path
-        self.doc_converter = DocConverter()
+        self.doc_converter = get_doc_converter()
         self.enable_summary = enable_summary
+        self.summarizer = ContractSummarizer(endpoint=summary_endpoint)
+        # Pending summarised version of the last merged document (when enable_summary is on)
+        self.summary_future: Optional[Future] = None
+        # Splice state of the last section-based assembly, reused for incremental re-assembly
+        self._assembly_state = None
+        # Problems met by the last merge (skipped clauses, degraded conversions), for the caller to show
+        self.warnings: List[str] = []
+    
+    @property
+    def output_dir(self) -> str:
+        """Output directory in the scratch space (recreated if it was collected)"""
+        return get_scratch_space().directory(self.scratch_owner, *self._scratch_parts)
     
     def merge_documents(self, file_paths: List[str], clause_names: List[str]) -> str:
         """
@@ -32,12 +75,13 @@ class DocumentMerger:
         """
         if not file_paths:
             raise ValueError("Aucun document à fusionner")
+        self.warnings = []
         
         # Use template as base document
         if os.path.exists(self.template_path):
-            final_doc = Document(self.template_path)
+            final_doc = _load_template(self.template_path)
         else:
-            st.warning(f"Template non trouvé: {self.template_path}, utilisation d'un document vide")
+            self.warnings.append(f"Template non trouvé: {self.template_path}, utilisation d'un document vide")
             final_doc = Document()
             
         # Find insertion point (after existing content)
@@ -63,109 +107,224 @@ class DocumentMerger:
                     final_doc.add_page_break()
                     
             except Exception as e:
-                st.warning(f"Erreur lors de la fusion de {clause_name}: {str(e)}")
+                self.warnings.append(f"Erreur lors de la fusion de {clause_name}: {str(e)}")
                 continue
         
         # Save merged document
+        get_scratch_space().ensure_capacity(self.scratch_owner)
         output_path = os.path.join(self.output_dir, 'document_final.docx')
         final_doc.save(output_path)
         
-        status_text.text("Fusion terminée!")
-        # Try to generate and embed a brief summary
-        if self.enable_summary:
-            try:
-                summary = self.summarize_document(output_path)
-                if summary:
-                    st.info("📝 Résumé automatique généré et inséré en tête de document.")
-                    # Save alongside document as .txt for convenience
-                    with open(os.path.join(self.output_dir, 'document_final_summary.txt'), 'w', encoding='utf-8') as f:
-                        f.write(summary)
-                    # Embed near template marker ("Synthèse") if found, otherwise at top
-                    doc = Document(output_path)
-                    if not self._insert_summary_after_marker(doc, summary):
-                        self._insert_summary_at_top(doc, summary)
-                    doc.save(output_path)
-            except Exception as _e:
-                pass
+        # Summarised version is generated in the background, the document is available now
+        self.summary_future = self.start_summary(output_path) if self.enable_summary else None
         return output_path
     
-    def merge_documents_by_sections(self, clauses_by_section: dict, sections_order: list) -> str:
+    def merge_documents_by_sections(self, clauses_by_section: dict, sections_order: list,
+                                    progress_callback: Optional[ProgressCallback] = None) -> str:
         """
         Merge documents organized by contract sections
         
+        The assembled document and its section boundaries are kept between calls:
+        when the template is unchanged, only sections whose clause selection changed
+        are re-spliced, the others are reused as-is.
+        
         Args:
             clauses_by_section: Dictionary of section_key -> list of clause objects
             sections_order: List of section objects in order
+            progress_callback: Optional callback receiving ('merge', clauses done, total, clause name)
+                events as each clause is placed, then ('save', 0, 1, None) and ('save', 1, 1, None)
             
         Returns:
-            Path to the merged document
+            Path to the merged document; problems met along the way are listed in self.warnings
         """
-        # Use template as base document
-        if os.path.exists(self.template_path):
-            final_doc = Document(self.template_path)
-        else:
-            st.warning(f"Template non trouvé: {self.template_path}, utilisation d'un document vide")
-            final_doc = Document()
+        template_key = self._template_key()
+        state = self._assembly_state
+        if state is None or state['template_key'] != template_key:
+            template_warnings = []
+            # Use template as base document
+            if os.path.exists(self.template_path):
+                final_doc = _load_template(self.template_path)
+            else:
+                template_warnings.append(f"Template non trouvé: {self.template_path}, utilisation d'un document vide")
+                final_doc = Document()
+            state = {'template_key': template_key, 'doc': final_doc, 'sections': {}, 'separators': [],
+                     'warnings': template_warnings}
+        final_doc = state['doc']
         
-        total_sections = len([s for s in sections_order if clauses_by_section.get(s['key'], [])])
-        current_section = 0
-        displayed_index = 0  # Dynamic numbering counter for displayed sections only
+        active_sections = [s for s in sections_order if clauses_by_section.get(s['key'], [])]
+        previous_sections = state['sections']
+        new_sections = {}
+        total_clauses = sum(len(clauses_by_section[s['key']]) for s in active_sections)
+        merged_clauses = 0
         
-        for section in sections_order:
-            section_clauses = clauses_by_section.get(section['key'], [])
+        # Dynamic numbering counter for displayed sections only
+        for displayed_index, section in enumerate(active_sections, 1):
+            section_clauses = clauses_by_section[section['key']]
+            header_text = f"{displayed_index}. {section['name'].upper()}"
+            fingerprint = self._section_fingerprint(section, section_clauses)
+            previous = previous_sections.pop(section['key'], None)
             
-            if not section_clauses:
+            if previous and previous['fingerprint'] == fingerprint:
+                # Unchanged selection: only the displayed number may have moved
+                if previous['header_text'] != header_text:
+                    Paragraph(previous['elements'][0], None).runs[0].text = header_text
+                    previous['header_text'] = header_text
+                new_sections[section['key']] = previous
+                merged_clauses += len(section_clauses)
+                report_progress(progress_callback, 'merge', merged_clauses, total_clauses, section['name'])
                 continue
-                
-            current_section += 1
-            displayed_index += 1
             
-            # Add section title and create an anchor right after
-            header_para = self._add_section_header(final_doc, f"{displayed_index}. {section['name'].upper()}")
-            spacer_para = final_doc.add_paragraph()
-            anchor_el = spacer_para._element
+            if previous:
+                self._remove_section_blocks(final_doc, previous)
             
-            # Process each clause in this section
-            for clause in section_clauses:
-                try:
-                    # Read source document with error handling for different formats
-                    source_doc = self._safe_load_document(clause['file_path'])
-                    
-                    # Insert content after the current anchor, then advance anchor
-                    anchor_el = self._insert_document_body_after(final_doc, anchor_el, source_doc)
-                    
-                    # Add spacing paragraph and move anchor to it
-                    spacer_para = final_doc.add_paragraph()
-                    anchor_el = spacer_para._element
-                    
-                except Exception as e:
-                    st.warning(f"Erreur lors de la fusion de {clause['name']}: {str(e)}")
-                    continue
+            def clause_done(clause_name):
+                nonlocal merged_clauses
+                merged_clauses += 1
+                report_progress(progress_callback, 'merge', merged_clauses, total_clauses, clause_name)
             
-            # Add spacing between sections (except for the last one)
-            if current_section < total_sections:
-                final_doc.add_paragraph()  # First line break
-                final_doc.add_paragraph()  # Second line break
+            new_sections[section['key']] = self._build_section_blocks(
+                final_doc, section_clauses, header_text, fingerprint, on_clause_done=clause_done
+            )
+        
+        # Drop sections that are no longer selected
+        for stale in previous_sections.values():
+            self._remove_section_blocks(final_doc, stale)
+        
+        state['sections'] = new_sections
+        self._layout_sections(final_doc, state, [s['key'] for s in active_sections])
+        self._assembly_state = state
+        # Reused sections keep the warnings of the merge that built them
+        self.warnings = state['warnings'] + [
+            warning for s in active_sections for warning in new_sections[s['key']]['warnings']
+        ]
             
         # Save merged document
+        report_progress(progress_callback, 'save', 0, 1)
+        get_scratch_space().ensure_capacity(self.scratch_owner)
         output_path = os.path.join(self.output_dir, 'document_final.docx')
         final_doc.save(output_path)
-        # Try to generate and embed a brief summary
+        report_progress(progress_callback, 'save', 1, 1)
+        # Summarised version is generated in the background, the document is available now.
+        # When every clause has a precomputed summary, the synthesis is composed without any LLM call.
         if self.enable_summary:
-            try:
-                summary = self.summarize_document(output_path)
-                if summary:
-                    st.info("📝 Résumé automatique généré et inséré en tête de document.")
-                    with open(os.path.join(self.output_dir, 'document_final_summary.txt'), 'w', encoding='utf-8') as f:
-                        f.write(summary)
-                    doc = Document(output_path)
-                    if not self._insert_summary_after_marker(doc, summary):
-                        self._insert_summary_at_top(doc, summary)
-                    doc.save(output_path)
-            except Exception:
-                pass
+            composed = self.compose_summary_from_clauses(clauses_by_section, sections_order)
+            self.summary_future = self.start_summary(output_path, summary=composed)
+        else:
+            self.summary_future = None
         return output_path
     
+    def reset_assembly_state(self):
+        """Forget the previous assembly so the next merge rebuilds from the template"""
+        self._assembly_state = None
+    
+    def _template_key(self) -> tuple:
+        """Identify the template version the kept assembly was built from"""
+        try:
+            return (self.template_path, os.path.getmtime(self.template_path))
+        except OSError:
+            return (self.template_path, None)
+    
+    def _section_fingerprint(self, section: dict, section_clauses: list) -> tuple:
+        """Identify a section's clause selection, including the clause files' versions"""
+        clause_ids = []
+        for clause in section_clauses:
+            path = clause.get('file_path')
+            try:
+                stat = os.stat(path)
+                version = (stat.st_mtime_ns, stat.st_size)
+            except (OSError, TypeError):
+                version = None
+            clause_ids.append((clause.get('name'), path, version))
+        return (section['name'], tuple(clause_ids))
+    
+    def _build_section_blocks(self, final_doc: Document, section_clauses: list, header_text: str, fingerprint: tuple,
+                              on_clause_done=None) -> dict:
+        """Append a section (header and clauses) at the end of the body and return its splice state"""
+        body = final_doc._body._element
+        start = self._body_end_index(body)
+        numbering_start = self._numbering_size(final_doc)
+        warnings = []
+        
+        # Add section title and create an anchor right after
+        self._add_section_header(final_doc, header_text)
+        spacer_para = final_doc.add_paragraph()
+        anchor_el = spacer_para._element
+        
+        # Process each clause in this section
+        for clause in section_clauses:
+            try:
+                # Read source document with error handling for different formats
+                source_doc = self._safe_load_document(clause['file_path'], warnings)
+                
+                # Insert content after the current anchor, then advance anchor
+                anchor_el = self._insert_document_body_after(final_doc, anchor_el, source_doc)
+                
+                # Add spacing paragraph and move anchor to it
+                spacer_para = final_doc.add_paragraph()
+                anchor_el = spacer_para._element
+                
+            except Exception as e:
+                warnings.append(f"Erreur lors de la fusion de {clause['name']}: {str(e)}")
+            finally:
+                if on_clause_done is not None:
+                    on_clause_done(clause['name'])
+        
+        numbering_el = self._numbering_element(final_doc)
+        return {
+            'fingerprint': fingerprint,
+            'header_text': header_text,
+            'elements': list(body[start:self._body_end_index(body)]),
+            'numbering': list(numbering_el[numbering_start:]) if numbering_el is not None else [],
+            'warnings': warnings,
+        }
+    
+    def _remove_section_blocks(self, final_doc: Document, section_state: dict):
+        """Remove a previously spliced section and the numbering definitions it imported"""
+        for el in section_state['elements'] + section_state['numbering']:
+            parent = el.getparent()
+            if parent is not None:
+                parent.remove(el)
+    
+    def _layout_sections(self, final_doc: Document, state: dict, ordered_keys: list):
+        """Place section blocks in order after the template content, with spacing between sections"""
+        body = final_doc._body._element
+        for el in state['separators']:
+            body.remove(el)
+        state['separators'] = []
+        
+        sect_pr = body.find(qn('w:sectPr'))
+        def place(el):
+            if sect_pr is not None:
+                sect_pr.addprevious(el)
+            else:
+                body.append(el)
+        
+        for i, key in enumerate(ordered_keys):
+            for el in state['sections'][key]['elements']:
+                place(el)
+            # Add spacing between sections (except for the last one)
+            if i < len(ordered_keys) - 1:
+                for _ in range(2):
+                    separator = OxmlElement('w:p')
+                    place(separator)
+                    state['separators'].append(separator)
+    
+    def _body_end_index(self, body) -> int:
+        """Index where python-docx appends new blocks (before the trailing sectPr)"""
+        if len(body) and body[-1].tag == qn('w:sectPr'):
+            return len(body) - 1
+        return len(body)
+    
+    def _numbering_element(self, doc: Document):
+        try:
+            return doc.part.numbering_part.element
+        except Exception:
+            return None
+    
+    def _numbering_size(self, doc: Document) -> int:
+        numbering_el = self._numbering_element(doc)
+        return len(numbering_el) if numbering_el is not None else 0
+    
     def add_table_of_contents(self, doc: Document, clause_names: List[str]):
         """Add a simple table of contents"""
         toc_heading = doc.add_heading('Table des Matières', level=1)
@@ -193,6 +352,7 @@ class DocumentMerger:
         # Add spacing after for line break before first clause
         para.space_after = Pt(12)
         para.space_before = Pt(24)
+        return para
     
     def _add_clause_content(self, doc: Document, content: str):
         """Deprecated: kept for compatibility; prefer _append_document_body."""
@@ -268,7 +428,7 @@ class DocumentMerger:
                             if old_val in numid_map:
                                 numId.set(qn('w:val'), str(numid_map[old_val]))
             # Insert after anchor
-            body.insert(body.index(last_inserted) + 1, clone)
+            last_inserted.addnext(clone)
             last_inserted = clone
             inserted_blocks.append(clone)
 
@@ -279,52 +439,49 @@ class DocumentMerger:
     def _apply_montserrat_and_clean_fields(self, doc: Document, appended_blocks: list) -> None:
         """Force Montserrat blue font on appended content while preserving bold/italics and remove page-number fields."""
         from docx.oxml.ns import qn
-        appended_set = set(appended_blocks)
-
-        # Paragraphs
-        for para in doc.paragraphs:
-            if para._element in appended_set:
-                # Fallback normalization for lists that use symbol fonts or bullet glyphs
-                self._fallback_convert_symbol_bullets(para)
-                for run in para.runs:
-                    # Remove field instruction text like PAGE/NUMPAGES
-                    for child in list(run._element):
-                        tag = child.tag.rsplit('}', 1)[-1]
-                        if tag == 'instrText':
-                            text_val = (child.text or '').upper()
-                            if any(key in text_val for key in [' PAGE ', 'NUMPAGES', 'PAGEREF', 'TOC']):
-                                child.text = ''
-                        elif tag == 'fldChar':
-                            # Clear run if it's part of a field
-                            run.text = ''
-                    # Enforce template font (keep bold/italic as-is)
-                    run.font.name = 'Montserrat Medium'
-                    run.font.size = Pt(11)
-                    run.font.color.rgb = RGBColor(0x00, 0x3D, 0xA5)
+        # Paragraphs (wrap appended elements directly instead of scanning the whole document)
+        appended_paragraphs = [Paragraph(blk, doc._body) for blk in appended_blocks
+                               if blk.tag.rsplit('}', 1)[-1] == 'p']
+        for para in appended_paragraphs:
+            # Fallback normalization for lists that use symbol fonts or bullet glyphs
+            self._fallback_convert_symbol_bullets(para)
+            for run in para.runs:
+                # Remove field instruction text like PAGE/NUMPAGES
+                for child in list(run._element):
+                    tag = child.tag.rsplit('}', 1)[-1]
+                    if tag == 'instrText':
+                        text_val = (child.text or '').upper()
+                        if any(key in text_val for key in [' PAGE ', 'NUMPAGES', 'PAGEREF', 'TOC']):
+                            child.text = ''
+                    elif tag == 'fldChar':
+                        # Clear run if it's part of a field
+                        run.text = ''
+                # Enforce template font (keep bold/italic as-is)
+                run.font.name = 'Montserrat Medium'
+                run.font.size = Pt(11)
+                run.font.color.rgb = RGBColor(0x00, 0x3D, 0xA5)
 
         # Tables
-        from docx.table import _Cell, Table
-        # Build map of appended table elements
-        appended_tables = {blk for blk in appended_set if blk.tag.rsplit('}', 1)[-1] == 'tbl'}
-        if appended_tables:
-            for table in doc.tables:
-                if table._element in appended_tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            for p in cell.paragraphs:
-                                self._fallback_convert_symbol_bullets(p)
-                                for run in p.runs:
-                                    for child in list(run._element):
-                                        tag = child.tag.rsplit('}', 1)[-1]
-                                        if tag == 'instrText':
-                                            text_val = (child.text or '').upper()
-                                            if any(key in text_val for key in [' PAGE ', 'NUMPAGES', 'PAGEREF', 'TOC']):
-                                                child.text = ''
-                                        elif tag == 'fldChar':
-                                            run.text = ''
-                                    run.font.name = 'Montserrat Medium'
-                                    run.font.size = Pt(11)
-                                    run.font.color.rgb = RGBColor(0x00, 0x3D, 0xA5)
+        from docx.table import Table
+        appended_tables = [Table(blk, doc._body) for blk in appended_blocks
+                           if blk.tag.rsplit('}', 1)[-1] == 'tbl']
+        for table in appended_tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    for p in cell.paragraphs:
+                        self._fallback_convert_symbol_bullets(p)
+                        for run in p.runs:
+                            for child in list(run._element):
+                                tag = child.tag.rsplit('}', 1)[-1]
+                                if tag == 'instrText':
+                                    text_val = (child.text or '').upper()
+                                    if any(key in text_val for key in [' PAGE ', 'NUMPAGES', 'PAGEREF', 'TOC']):
+                                        child.text = ''
+                                elif tag == 'fldChar':
+                                    run.text = ''
+                            run.font.name = 'Montserrat Medium'
+                            run.font.size = Pt(11)
+                            run.font.color.rgb = RGBColor(0x00, 0x3D, 0xA5)
 
 
     def _import_numbering_and_build_map(self, target: Document, source: Document) -> dict:
@@ -445,8 +602,8 @@ class DocumentMerger:
                 except Exception:
                     pass
     
-    def _safe_load_document(self, file_path: str) -> Document:
-        """Safely load a Word document with format detection and automatic conversion"""
+    def _safe_load_document(self, file_path: str, warnings: Optional[List[str]] = None) -> Document:
+        """Safely load a Word document with format detection and automatic conversion (conversion problems go to warnings)"""
         try:
             # Try loading as standard Word document
             return Document(file_path)
@@ -455,7 +612,7 @@ class DocumentMerger:
             # Check if it's a legacy .doc file that needs conversion
             if file_path.endswith('.doc') and self.doc_converter.is_legacy_doc_file(file_path):
                 # Generate placeholder for unsupported .doc files
-                converted_path = self.doc_converter.convert_doc_to_docx(file_path)
+                converted_path = self.doc_converter.convert_doc_to_docx(file_path, warnings=warnings)
                 
                 if converted_path and os.path.exists(converted_path):
                     try:
@@ -463,7 +620,6 @@ class DocumentMerger:
                         converted_doc = Document(converted_path)
                         return converted_doc
                     except Exception as conv_error:
-                        st.error(f"❌ Erreur lors du traitement: {str(conv_error)}")
                         raise ValueError(f"Impossible de traiter le fichier: {str(conv_error)}")
                 else:
                     raise ValueError(f"Impossible de traiter le fichier: {os.path.basename(file_path)}")
@@ -485,85 +641,67 @@ class DocumentMerger:
             
             raise ValueError(error_msg)
 
-    def summarize_document(self, docx_path: str, max_chars: int = 16000) -> str:
-        """Create a short summary in French of the generated contract using OpenAI API key from cleAPI.txt."""
-        try:
-            text = self._read_docx_text(docx_path, max_chars=max_chars)
-        except Exception as e:
-            raise e
-
-        api_key = self._read_api_key()
-        if not api_key:
-            return ""
-
-        payload = {
-            "model": "gpt-4o-mini",
-            "temperature": 0.3,
-            "max_tokens": 500,
-            "messages": [
-                {"role": "system", "content": "Tu es un assistant juridique. Produis des synthèses structurées, claires et factuelles en français. Utilise uniquement du texte brut, sans formatting markdown."},
-                {"role": "user", "content": f"Analyse le contrat suivant et produis une synthèse structurée en texte brut avec :\n\nPOINTS CLÉS\n• [Liste des éléments essentiels du contrat]\n• [Un point par ligne avec des puces simples]\n\nCONFLITS\n• [0 à 3 points sur d'éventuelles contradictions entre clauses]\n• [Ou indiquer \"Aucun conflit de clause détecté\" si tu n'en trouves pas]\n\nUtilise uniquement des caractères simples (•) pour les listes, pas de markdown.\n\nTexte:\n{text}"}
-            ]
-        }
+    def start_summary(self, docx_path: str, summary: Optional[str] = None) -> Future:
+        """Build the summarised version of a merged document in a background thread"""
+        return _summary_executor.submit(self.build_summarized_copy, docx_path, summary)
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+    def build_summarized_copy(self, docx_path: str, summary: Optional[str] = None) -> Optional[str]:
+        """Write a copy of the document with the 'Synthèse' block inserted and return its path.
 
-        resp = requests.post("https://api.openai.com/v1/chat/completions", json=payload, headers=headers, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
-        content = data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-        return content
-
-    def _read_docx_text(self, path: str, max_chars: int = 16000) -> str:
-        doc = Document(path)
-        parts = []
-        for p in doc.paragraphs:
-            if p.text and p.text.strip():
-                parts.append(p.text.strip())
-            if sum(len(x) for x in parts) >= max_chars:
-                break
-        return "\n".join(parts)[:max_chars]
+        A precomputed summary (see compose_summary_from_clauses) is used as-is; otherwise
+        the assembled contract is summarised by the LLM. Returns None when no summary
+        could be produced (no API key, empty document).
+        """
+        if not summary:
+            summary = self.summarize_document(docx_path)
+        if not summary:
+            return None
+
+        base_path = os.path.splitext(docx_path)[0]
+        with open(f"{base_path}_summary.txt", 'w', encoding='utf-8') as f:
+            f.write(summary)
+
+        # Embed near template marker ("Synthèse") if found, otherwise at top
+        doc = Document(docx_path)
+        if not self._insert_summary_after_marker(doc, summary):
+            self._insert_summary_at_top(doc, summary)
+        summarized_path = f"{base_path}_synthese.docx"
+        doc.save(summarized_path)
+        return summarized_path
+
+    def compose_summary_from_clauses(self, clauses_by_section: dict, sections_order: list) -> Optional[str]:
+        """Compose the synthesis from the clause summaries stored in the catalog, without network calls.
+
+        Returns None if any selected clause has no precomputed summary.
+        """
+        points = []
+        multi_clause_sections = []
+        for section in sections_order:
+            section_clauses = clauses_by_section.get(section['key'], [])
+            if any(not clause.get('summary') for clause in section_clauses):
+                return None
+            if len(section_clauses) > 1:
+                multi_clause_sections.append(section['name'])
+            for clause in section_clauses:
+                points.append(f"• {section['name']} ({clause['name']})")
+                for line in clause['summary'].split('\n'):
+                    line = line.strip().lstrip('•-– ').strip()
+                    if line:
+                        points.append(f"  – {line}")
+
+        if not points:
+            return None
+
+        lines = ["POINTS CLÉS"] + points + ["", "CONFLITS"]
+        if multi_clause_sections:
+            lines += [f"• Plusieurs clauses retenues pour « {name} » : vérifier leur cohérence" for name in multi_clause_sections]
+        else:
+            lines.append("• Aucune section ne combine plusieurs clauses")
+        return "\n".join(lines)
 
-    def _read_api_key(self) -> str:
-        """Read API key from cleAPI.txt in project root or Streamlit secrets."""
-        # First try Streamlit secrets (works in cloud deployments)
-        try:
-            import streamlit as st
-            if hasattr(st, 'secrets') and 'OPENAI_API_KEY' in st.secrets:
-                key = st.secrets['OPENAI_API_KEY']
-                if key and key.strip():
-                    return key.strip()
-        except Exception:
-            pass
-        
-        # Then try environment variable
-        try:
-            import os
-            key = os.getenv('OPENAI_API_KEY')
-            if key and key.strip():
-                return key.strip()
-        except Exception:
-            pass
-        
-        # Finally try local file
-        candidates = [
-            os.path.join(os.getcwd(), 'cleAPI.txt'),
-            os.path.abspath(os.path.join(os.path.dirname(__file__), 'cleAPI.txt')),
-            os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleAPI.txt')),
-        ]
-        for p in candidates:
-            try:
-                if os.path.exists(p):
-                    with open(p, 'r', encoding='utf-8') as f:
-                        key = f.read().strip()
-                        if key:
-                            return key
-            except Exception:
-                continue
-        return ""
+    def summarize_document(self, docx_path: str, max_chars: int = 16000) -> str:
+        """Create a short summary in French of the generated contract (cached by text hash)."""
+        return self.summarizer.summarize_document(docx_path, max_chars=max_chars)
 
     def _insert_summary_at_top(self, doc: Document, summary_text: str) -> None:
         """Insert a 'Synthèse' section at the very beginning of the document with styled heading and body."""
@@ -690,9 +828,7 @@ class DocumentMerger:
     def cleanup(self):
         """Clean up temporary files"""
         try:
-            import shutil
-            shutil.rmtree(self.output_dir, ignore_errors=True)
-            # Also cleanup converter temporary files
-            self.doc_converter.cleanup()
+            # The converter is shared with the rest of the process and outlives the merger
+            get_scratch_space().release(self.scratch_owner, *self._scratch_parts)
         except Exception:
             pass
\ No newline at end of file
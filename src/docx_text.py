@@ -0,0 +1,93 @@
+import posixpath
+import zipfile
+from typing import Iterator, Optional
+from lxml import etree
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+BODY = W_NS + 'body'
+PARAGRAPH = W_NS + 'p'
+RUN = W_NS + 'r'
+HYPERLINK = W_NS + 'hyperlink'
+TEXT = W_NS + 't'
+BREAK = W_NS + 'br'
+BREAK_TYPE = W_NS + 'type'
+# Run content other than w:t and w:br, with its text equivalent (as python-docx reads it)
+RUN_CONTENT_TEXT = {
+    W_NS + 'tab': '\t',
+    W_NS + 'ptab': '\t',
+    W_NS + 'cr': '\n',
+    W_NS + 'noBreakHyphen': '-',
+}
+
+
+def iter_docx_paragraphs(docx_path: str) -> Iterator[str]:
+    """Yield the stripped, non-empty body paragraphs of a .docx file.
+
+    The main document part is streamed with iterparse instead of building the
+    python-docx object model; the text matches ``Paragraph.text`` for body-level
+    paragraphs. Stopping the iteration stops the parsing.
+    """
+    with zipfile.ZipFile(docx_path) as package:
+        with package.open(_main_document_part(package)) as document_xml:
+            parts = []
+            # Tags of the currently open elements: document, body, paragraph, ...
+            stack = []
+            for event, elem in etree.iterparse(document_xml, events=('start', 'end')):
+                if event == 'start':
+                    stack.append(elem.tag)
+                    continue
+
+                stack.pop()
+                depth = len(stack)
+                if depth >= 4 and stack[1] == BODY and stack[2] == PARAGRAPH and stack[-1] == RUN and (
+                        depth == 4 or (depth == 5 and stack[3] == HYPERLINK)):
+                    parts.append(_run_content_text(elem))
+                elif depth == 2 and stack[1] == BODY:
+                    # End of a body-level block: emit paragraphs and free the parsed tree
+                    if elem.tag == PARAGRAPH:
+                        text = ''.join(parts).strip()
+                        if text:
+                            yield text
+                    parts = []
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+
+
+def extract_docx_text(docx_path: str, max_chars: Optional[int] = None) -> str:
+    """Return the paragraphs of a .docx file joined by newlines, cut after max_chars"""
+    texts = []
+    total = 0
+    for text in iter_docx_paragraphs(docx_path):
+        texts.append(text)
+        total += len(text)
+        if max_chars is not None and total > max_chars:
+            break
+    content = '\n'.join(texts)
+    if max_chars is not None and len(content) > max_chars:
+        content = content[:max_chars] + '…'
+    return content
+
+
+def _run_content_text(elem) -> str:
+    if elem.tag == TEXT:
+        return elem.text or ''
+    if elem.tag == BREAK:
+        # Page and column breaks have no text equivalent
+        return '' if elem.get(BREAK_TYPE) in ('page', 'column') else '\n'
+    return RUN_CONTENT_TEXT.get(elem.tag, '')
+
+
+def _main_document_part(package: zipfile.ZipFile) -> str:
+    """Return the name of the main document part, usually word/document.xml"""
+    try:
+        rels = etree.fromstring(package.read('_rels/.rels'))
+        for rel in rels.iter(RELS_NS + 'Relationship'):
+            if rel.get('Type') == OFFICE_DOCUMENT_REL:
+                return posixpath.normpath(rel.get('Target').lstrip('/'))
+    except (KeyError, etree.XMLSyntaxError):
+        pass
+    return 'word/document.xml'
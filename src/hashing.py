@@ -0,0 +1,13 @@
+import hashlib
+
+# Read size used when hashing clause files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,216 @@
+import os
+import time
+import uuid
+import threading
+import zlib
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, List, Optional
+
+# Maximum number of heavy jobs (merges, summaries) running at once on this host
+DEFAULT_MAX_JOBS = 2
+# Finished jobs are forgotten after this many seconds
+JOB_RETENTION_SECONDS = 3600
+# Mergers (and their incremental assembly state) kept per worker process
+WORKER_MERGER_CACHE_SIZE = 8
+# (start, span) of the overall progress covered by each merger progress stage
+STAGE_PROGRESS_RANGES = {'merge': (0.1, 0.6), 'save': (0.7, 0.1)}
+
+# Worker-process cache of DocumentMerger instances keyed by (session, template)
+_worker_mergers: "OrderedDict[tuple, object]" = OrderedDict()
+
+
+def _get_worker_merger(session_key: Optional[str], template_path: str):
+    """Return the merger kept for this session in the current worker process"""
+    from .document_merger import DocumentMerger
+    from .scratch_space import session_owner
+
+    if session_key is None:
+        return DocumentMerger(template_path=template_path)
+
+    cache_key = (session_key, template_path)
+    merger = _worker_mergers.get(cache_key)
+    if merger is None:
+        merger = DocumentMerger(template_path=template_path, scratch_owner=session_owner(session_key))
+        _worker_mergers[cache_key] = merger
+        while len(_worker_mergers) > WORKER_MERGER_CACHE_SIZE:
+            # Only the in-memory splice state goes: the session's documents may still be
+            # waiting for download, their files are left to the scratch space TTL collection
+            _, evicted = _worker_mergers.popitem(last=False)
+            evicted.reset_assembly_state()
+    _worker_mergers.move_to_end(cache_key)
+    return merger
+
+
+def _run_assembly_job(job_id: str, spec: Dict, progress) -> Dict:
+    """Worker entry point: merge the selected clauses, then build the summarised version if requested"""
+    progress[job_id] = {'stage': 'merge', 'progress': 0.1}
+
+    def report(stage: str, current: int, total: int, item: Optional[str]):
+        start, span = STAGE_PROGRESS_RANGES[stage]
+        progress[job_id] = {'stage': stage, 'progress': start + span * current / max(total, 1), 'detail': item}
+
+    merger = _get_worker_merger(spec.get('session_key'), spec['template_path'])
+    # The summary is built below, after the document has been published
+    merger.enable_summary = False
+    output_path = merger.merge_documents_by_sections(
+        spec['clauses_by_section'],
+        spec['sections_order'],
+        progress_callback=report
+    )
+    # Worker processes have no Streamlit page: merge problems travel with the result
+    result = {'result_path': output_path, 'summary_path': None, 'warnings': list(merger.warnings)}
+    if not spec['enable_summary']:
+        progress[job_id] = {'stage': 'done', 'progress': 1.0}
+        return result
+
+    # The document can be downloaded while the summary is generated
+    progress[job_id] = {'stage': 'summary', 'progress': 0.8, 'result_path': output_path,
+                        'warnings': result['warnings']}
+    try:
+        # Precomputed clause summaries avoid the LLM call entirely
+        summary = merger.compose_summary_from_clauses(spec['clauses_by_section'], spec['sections_order'])
+        result['summary_path'] = merger.build_summarized_copy(output_path, summary=summary)
+    except Exception as e:
+        result['summary_error'] = str(e)
+    progress[job_id] = {'stage': 'done', 'progress': 1.0}
+    return result
+
+
+class AssemblyJobQueue:
+    """Local job queue running contract assemblies in worker processes
+
+    Each worker is a single-process executor. Jobs carrying a session key go to
+    the worker that ran the session's previous assembly, so that its kept merger
+    can re-splice only the sections that changed, unless that worker is busier
+    than another one: the job then runs there with a full rebuild rather than
+    waiting behind other sessions' jobs.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv('CLAUSIER_MAX_JOBS', DEFAULT_MAX_JOBS))
+        # Spawn rather than fork: the Streamlit server is multi-threaded
+        mp_context = multiprocessing.get_context('spawn')
+        self._manager = mp_context.Manager()
+        self._progress = self._manager.dict()
+        self._executors = [ProcessPoolExecutor(max_workers=1, mp_context=mp_context)
+                           for _ in range(self.max_workers)]
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def submit_assembly(self, clauses_by_section: Dict[str, List[Dict]], sections_order: List[Dict],
+                        template_path: str, enable_summary: bool = False,
+                        session_key: Optional[str] = None) -> str:
+        """Queue a section-based assembly and return its job id"""
+        job_id = uuid.uuid4().hex
+        spec = {
+            'clauses_by_section': clauses_by_section,
+            'sections_order': list(sections_order),
+            'template_path': template_path,
+            'enable_summary': enable_summary,
+            'session_key': session_key,
+        }
+        with self._lock:
+            self._prune_finished_jobs()
+            worker = self._pick_worker(session_key)
+            future = self._executors[worker].submit(_run_assembly_job, job_id, spec, self._progress)
+            self._jobs[job_id] = {'future': future, 'worker': worker, 'session_key': session_key,
+                                  'created_at': time.time()}
+        return job_id
+
+    def _pick_worker(self, session_key: Optional[str]) -> int:
+        """Worker of the session's previous assembly while it is no busier than the others,
+        least loaded worker otherwise (caller holds the lock)"""
+        pending = [0] * self.max_workers
+        preferred = None
+        latest = None
+        for job in self._jobs.values():
+            if not job['future'].done():
+                pending[job['worker']] += 1
+            if session_key is not None and job['session_key'] == session_key and (
+                    latest is None or job['created_at'] >= latest):
+                preferred, latest = job['worker'], job['created_at']
+        if session_key is not None and preferred is None:
+            preferred = zlib.crc32(session_key.encode('utf-8')) % self.max_workers
+        least_loaded = pending.index(min(pending))
+        if preferred is not None and pending[preferred] == pending[least_loaded]:
+            return preferred
+        # A busy preferred worker would queue this session behind others: rebuild in full elsewhere
+        return least_loaded
+
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """Return the current state of a job, or None if the id is unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if not job:
+            return None
+
+        future: Future = job['future']
+        progress = self._progress.get(job_id) or {}
+        status = {
+            'id': job_id,
+            'status': 'queued' if not progress else 'running',
+            'stage': progress.get('stage', 'queued'),
+            'progress': progress.get('progress', 0.0),
+            'detail': progress.get('detail'),
+            'result_path': progress.get('result_path'),
+            'summary_path': None,
+            'warnings': progress.get('warnings', []),
+            'error': None,
+        }
+
+        if future.done():
+            if future.cancelled():
+                status['status'] = 'cancelled'
+            elif future.exception() is not None:
+                status['status'] = 'error'
+                status['error'] = str(future.exception())
+            else:
+                status['status'] = 'done'
+                status['progress'] = 1.0
+                status.update(future.result())
+        return status
+
+    def get_future(self, job_id: str) -> Optional[Future]:
+        """Return the future of a job (e.g. to await it with asyncio.wrap_future), or None if the id is unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job['future'] if job else None
+
+    def get_result(self, job_id: str) -> Optional[str]:
+        """Return the output path of a finished job, or None if not ready"""
+        status = self.get_status(job_id)
+        if status and status['status'] == 'done':
+            return status['result_path']
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return bool(job and job['future'].cancel())
+
+    def forget(self, job_id: str):
+        """Drop a job from the registry"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+        self._progress.pop(job_id, None)
+
+    def _prune_finished_jobs(self):
+        """Forget finished jobs older than the retention delay (caller holds the lock)"""
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['future'].done() and job['created_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._progress.pop(job_id, None)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        try:
+            for executor in self._executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+        except Exception:
+            pass
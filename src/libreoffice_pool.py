@@ -0,0 +1,352 @@
+import os
+import time
+import uuid
+import queue
+import shutil
+import socket
+import atexit
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .scratch_space import get_scratch_space
+
+# Number of long-lived LibreOffice workers per process
+DEFAULT_POOL_SIZE = 2
+# Per-conversion timeout in seconds
+DEFAULT_JOB_TIMEOUT = 30
+# Time allowed for a fresh soffice listener to accept UNO connections
+STARTUP_TIMEOUT = 30
+
+WORD_2007_FILTER = "MS Word 2007 XML"
+
+
+def find_soffice() -> Optional[str]:
+    """Return the LibreOffice executable available on this system, if any"""
+    for cmd in ['soffice', 'libreoffice']:
+        path = shutil.which(cmd)
+        if path:
+            return path
+    return None
+
+
+def _uno_available() -> bool:
+    try:
+        import uno  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class LibreOfficeWorker:
+    """A headless LibreOffice instance with its own user profile.
+
+    With the UNO bindings available, the worker keeps a soffice listener running and
+    converts documents through it, so only the first conversion pays the start-up.
+    Without them (the usual case in a virtualenv), each single conversion runs a
+    cold ``soffice --convert-to`` on the worker's already initialised profile; only
+    batches (convert_batch) share one invocation, and so one start-up, per worker.
+    """
+
+    def __init__(self, soffice_cmd: str, index: int, base_dir: str):
+        self.soffice_cmd = soffice_cmd
+        self.index = index
+        self.profile_dir = os.path.join(base_dir, f"profile_{index}")
+        self.use_uno = _uno_available()
+        self.process: Optional[subprocess.Popen] = None
+        self.port: Optional[int] = None
+        self._desktop = None
+
+    @property
+    def profile_url(self) -> str:
+        return 'file://' + os.path.abspath(self.profile_dir)
+
+    def is_alive(self) -> bool:
+        if not self.use_uno:
+            return True
+        return self.process is not None and self.process.poll() is None and self._desktop is not None
+
+    def start(self):
+        """Start the soffice listener and connect to it"""
+        if not self.use_uno:
+            return
+        self.port = self._free_port()
+        self.process = subprocess.Popen(
+            [
+                self.soffice_cmd, '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+                f'-env:UserInstallation={self.profile_url}',
+                f'--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext'
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        self._desktop = self._connect()
+
+    def stop(self):
+        """Terminate the soffice listener"""
+        self._desktop = None
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def convert(self, source_path: str, target_path: str, timeout: float) -> str:
+        """Convert source_path to .docx at target_path within timeout seconds"""
+        if not self.use_uno:
+            return self._convert_with_cli(source_path, target_path, timeout)
+
+        outcome = {}
+
+        def run():
+            try:
+                self._convert_with_uno(source_path, target_path)
+                outcome['done'] = True
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            # Hung conversion: kill the instance, the pool restarts it
+            self.stop()
+            raise TimeoutError(f"Conversion LibreOffice trop longue (> {timeout}s)")
+        if 'error' in outcome:
+            raise outcome['error']
+        return target_path
+
+    def convert_batch(self, jobs: List[Tuple[str, str]], timeout: float) -> Dict[str, Optional[str]]:
+        """Convert (source, target) pairs in a single converter session.
+
+        Returns source -> target path, or None for documents that failed. Without UNO,
+        documents are passed to one ``soffice --convert-to`` invocation (split only when
+        two sources share a file name), so the start-up is paid once per batch.
+        """
+        results: Dict[str, Optional[str]] = {}
+        if self.use_uno:
+            for source_path, target_path in jobs:
+                try:
+                    results[source_path] = self.convert(source_path, target_path, timeout)
+                except Exception:
+                    results[source_path] = None
+                    if not self.is_alive():
+                        self.restart()
+            return results
+
+        # soffice names outputs after the source file: keep names unique per invocation
+        batches: List[List[Tuple[str, str]]] = []
+        batch_names: List[set] = []
+        for job in jobs:
+            base_name = os.path.splitext(os.path.basename(job[0]))[0]
+            index = next((i for i, names in enumerate(batch_names) if base_name not in names), None)
+            if index is None:
+                batches.append([])
+                batch_names.append(set())
+                index = len(batches) - 1
+            batches[index].append(job)
+            batch_names[index].add(base_name)
+
+        for batch in batches:
+            results.update(self._convert_batch_with_cli(batch, timeout * len(batch)))
+        return results
+
+    def _convert_batch_with_cli(self, jobs: List[Tuple[str, str]], timeout: float) -> Dict[str, Optional[str]]:
+        output_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(jobs[0][1])))
+        results: Dict[str, Optional[str]] = {source_path: None for source_path, _ in jobs}
+        try:
+            subprocess.run(
+                [
+                    self.soffice_cmd, '--headless', '--norestore',
+                    f'-env:UserInstallation={self.profile_url}',
+                    '--convert-to', f'docx:{WORD_2007_FILTER}',
+                    '--outdir', output_dir
+                ] + [source_path for source_path, _ in jobs],
+                capture_output=True, text=True, timeout=timeout
+            )
+            # Collect whatever was converted, even if some documents failed
+            for source_path, target_path in jobs:
+                base_name = os.path.splitext(os.path.basename(source_path))[0]
+                converted_path = os.path.join(output_dir, f"{base_name}.docx")
+                if os.path.exists(converted_path):
+                    shutil.move(converted_path, target_path)
+                    results[source_path] = target_path
+        except subprocess.TimeoutExpired:
+            pass
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        return results
+
+    def _convert_with_uno(self, source_path: str, target_path: str):
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name = name
+            p.Value = value
+            return p
+
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(source_path)), "_blank", 0, (prop("Hidden", True),)
+        )
+        if document is None:
+            raise ValueError("Document illisible par LibreOffice")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(target_path)), (prop("FilterName", WORD_2007_FILTER),)
+            )
+        finally:
+            document.close(True)
+
+    def _convert_with_cli(self, source_path: str, target_path: str, timeout: float) -> str:
+        output_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(target_path)))
+        try:
+            result = subprocess.run(
+                [
+                    self.soffice_cmd, '--headless', '--norestore',
+                    f'-env:UserInstallation={self.profile_url}',
+                    '--convert-to', f'docx:{WORD_2007_FILTER}',
+                    '--outdir', output_dir,
+                    source_path
+                ],
+                capture_output=True, text=True, timeout=timeout
+            )
+            if result.returncode != 0:
+                raise ValueError(f"Conversion LibreOffice échouée: {result.stderr or result.stdout}")
+
+            base_name = os.path.splitext(os.path.basename(source_path))[0]
+            converted_path = os.path.join(output_dir, f"{base_name}.docx")
+            if not os.path.exists(converted_path):
+                raise ValueError("Fichier converti non trouvé")
+            shutil.move(converted_path, target_path)
+            return target_path
+        except subprocess.TimeoutExpired:
+            raise TimeoutError(f"Conversion LibreOffice trop longue (> {timeout}s)")
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    def _connect(self):
+        """Connect to the listener, waiting for it to accept connections"""
+        import uno
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_ctx)
+        deadline = time.time() + STARTUP_TIMEOUT
+        while True:
+            try:
+                ctx = resolver.resolve(f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext")
+                return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+            except Exception:
+                if self.process.poll() is not None or time.time() > deadline:
+                    raise RuntimeError("Impossible de démarrer LibreOffice")
+                time.sleep(0.25)
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(('127.0.0.1', 0))
+            return s.getsockname()[1]
+
+
+class LibreOfficePool:
+    """Pool of long-lived LibreOffice workers for .doc -> .docx conversion
+
+    The worker profiles live in the pool's own scratch space directory, so they count
+    towards the scratch quotas and are collected after a crash like any idle owner.
+    """
+
+    def __init__(self, size: Optional[int] = None, job_timeout: Optional[float] = None, soffice_cmd: Optional[str] = None):
+        self.soffice_cmd = soffice_cmd or find_soffice()
+        if not self.soffice_cmd:
+            raise ValueError("LibreOffice non trouvé sur le système")
+        self.size = size or int(os.getenv('CLAUSIER_LIBREOFFICE_WORKERS', DEFAULT_POOL_SIZE))
+        self.job_timeout = job_timeout or float(os.getenv('CLAUSIER_LIBREOFFICE_TIMEOUT', DEFAULT_JOB_TIMEOUT))
+        self.scratch_owner = f"libreoffice-{uuid.uuid4().hex[:8]}"
+        base_dir = get_scratch_space().directory(self.scratch_owner)
+        self._workers: List[LibreOfficeWorker] = [
+            LibreOfficeWorker(self.soffice_cmd, i, base_dir) for i in range(self.size)
+        ]
+        self._idle: "queue.Queue[LibreOfficeWorker]" = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def _mark_active(self):
+        """Touch the profiles directory (recreating it if it was collected) so it is kept while in use"""
+        get_scratch_space().directory(self.scratch_owner)
+
+    def convert(self, source_path: str, target_path: str, timeout: Optional[float] = None) -> str:
+        """Convert a document on the next idle worker and return target_path"""
+        timeout = timeout or self.job_timeout
+        self._mark_active()
+        worker = self._idle.get()
+        try:
+            if not worker.is_alive():
+                worker.restart()
+            try:
+                return worker.convert(source_path, target_path, timeout)
+            except TimeoutError:
+                raise
+            except Exception:
+                # The instance may have crashed on this document: restart and retry once
+                if worker.is_alive():
+                    raise
+                worker.restart()
+                return worker.convert(source_path, target_path, timeout)
+        finally:
+            self._idle.put(worker)
+
+    def convert_batch(self, jobs: List[Tuple[str, str]], timeout: Optional[float] = None,
+                      spread: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """Convert many (source, target) pairs, fanning them out over spread workers in parallel (all by default)"""
+        timeout = timeout or self.job_timeout
+        self._mark_active()
+        spread = min(spread or self.size, self.size)
+        chunks = [jobs[i::spread] for i in range(spread)]
+
+        def run(chunk):
+            if not chunk:
+                return {}
+            worker = self._idle.get()
+            try:
+                if not worker.is_alive():
+                    worker.restart()
+                return worker.convert_batch(chunk, timeout)
+            finally:
+                self._idle.put(worker)
+
+        results: Dict[str, Optional[str]] = {}
+        with ThreadPoolExecutor(max_workers=spread) as executor:
+            for chunk_results in executor.map(run, chunks):
+                results.update(chunk_results)
+        return results
+
+    def shutdown(self):
+        """Stop every worker and remove their profiles"""
+        for worker in self._workers:
+            try:
+                worker.stop()
+            except Exception:
+                pass
+        get_scratch_space().release(self.scratch_owner)
+
+
+_pool: Optional[LibreOfficePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_libreoffice_pool() -> Optional[LibreOfficePool]:
+    """Return the process-wide LibreOffice pool, or None if LibreOffice is not installed"""
+    global _pool
+    with _pool_lock:
+        if _pool is None and find_soffice():
+            _pool = LibreOfficePool()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -1,19 +1,27 @@
 import os
-import tempfile
+import uuid
 import shutil
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import streamlit as st
-from .parties_parser import PartiesParser
-from .doc_converter import DocConverter
+from .parties_parser import get_parties_parser
+from .doc_converter import get_doc_converter
+from .conversion_warmup import get_conversion_warmup
+from .clause_search import get_clause_search_index
+from .clause_similarity import annotate_variant_families
+from .hashing import file_content_hash
+from .summarizer import ClauseSummaryStore
+from .progress import ProgressCallback, report_progress
+from .scratch_space import ScratchQuotaExceeded, get_scratch_space
 
 class LocalClauseClient:
     """Client for reading clauses from local directory structure"""
     
     def __init__(self, clauses_dir: str = "clauses"):
         self.clauses_dir = clauses_dir
-        self.parties_parser = PartiesParser()
-        self._temp_dir = tempfile.mkdtemp()
-        self.doc_converter = DocConverter()
+        self.parties_parser = get_parties_parser()
+        # Owner of the copies made when the caller does not give its own
+        self.scratch_owner = f"local-{uuid.uuid4().hex[:8]}"
+        self.doc_converter = get_doc_converter()
     
     def get_clause_files(self) -> List[Dict[str, str]]:
         """Get list of clause files from local directories"""
@@ -21,7 +29,33 @@ class LocalClauseClient:
             st.error(f"Le dossier {self.clauses_dir} n'existe pas")
             return []
         
+        # Use streamlit warning instead of print
+        clause_files = self.scan_clause_files(
+            on_invalid=lambda filename, reason: st.warning(f"⚠️ Fichier ignoré: {filename} - {reason}")
+        )
+        
+        # Convert legacy clauses in the background so assemblies find them in the cache
+        warmup = get_conversion_warmup()
+        if warmup is not None:
+            warmup.schedule(clause_files)
+        # Re-index the contents of new or changed clauses for full-text search, then flag
+        # near-duplicate variants from the indexed text; the listing is returned meanwhile,
+        # its clauses get 'variant_family' once the families are known
+        get_clause_search_index().update_in_background(
+            clause_files, library_dir=self.clauses_dir, on_indexed=annotate_variant_families
+        )
+        return clause_files
+    
+    def scan_clause_files(self, on_invalid: Optional[Callable[[str, str], None]] = None) -> List[Dict[str, str]]:
+        """List the clause files of the library, sorted by section, without any background work.
+
+        on_invalid receives (file name, reason) for each file that cannot be read or converted.
+        """
         clause_files = []
+        if not os.path.isdir(self.clauses_dir):
+            return clause_files
+        # Precomputed per-clause summaries (see summarizer.precompute_clause_summaries)
+        summary_store = ClauseSummaryStore(self.clauses_dir)
         
         # Iterate through section directories
         for section_dir in sorted(os.listdir(self.clauses_dir)):
@@ -43,6 +77,8 @@ class LocalClauseClient:
                         is_valid, reason = self._is_valid_word_file(file_path)
                         if is_valid:
                             clause_name = filename.replace('.docx', '').replace('.doc', '')
+                            content_hash = file_content_hash(file_path)
+                            is_legacy_doc = filename.endswith('.doc') and self.doc_converter.is_legacy_doc_file(file_path)
                             
                             clause_files.append({
                                 'name': clause_name,
@@ -51,14 +87,16 @@ class LocalClauseClient:
                                 'section_tag': section_info['key'],
                                 'section_order': section_info['order'],
                                 'section_name': section_info['name'],
-                                'is_legacy_doc': filename.endswith('.doc') and self.doc_converter.is_legacy_doc_file(file_path)
+                                'is_legacy_doc': is_legacy_doc,
+                                'conversion_ready': not is_legacy_doc or self.doc_converter.cache.contains(file_path),
+                                'content_hash': content_hash,
+                                'summary': summary_store.get(content_hash)
                             })
-                        else:
-                            # Use streamlit warning instead of print
-                            import streamlit as st
-                            st.warning(f"⚠️ Fichier ignoré: {filename} - {reason}")
+                        elif on_invalid is not None:
+                            on_invalid(filename, reason)
         
-        return sorted(clause_files, key=lambda x: (x['section_order'], x['name']))
+        clause_files.sort(key=lambda x: (x['section_order'], x['name']))
+        return clause_files
     
     def _parse_directory_name(self, dir_name: str) -> Dict[str, any]:
         """Parse directory name to extract section info"""
@@ -71,13 +109,13 @@ class LocalClauseClient:
                 name_part = parts[1].replace('_', ' ')
                 
                 # Find corresponding section in parties.ini
-                for section in self.parties_parser.get_sections():
-                    if section['order'] == order:
-                        return {
-                            'order': order,
-                            'key': section['key'],
-                            'name': section['name']
-                        }
+                section = self.parties_parser.find_section_by_order(order)
+                if section:
+                    return {
+                        'order': order,
+                        'key': section['key'],
+                        'name': section['name']
+                    }
                 
                 # Fallback if not found in parties.ini
                 return {
@@ -97,7 +135,10 @@ class LocalClauseClient:
     
     def get_clauses_by_section(self) -> Dict[str, List[Dict[str, str]]]:
         """Get clauses grouped by section"""
-        all_clauses = self.get_clause_files()
+        return self.group_by_section(self.get_clause_files())
+    
+    def group_by_section(self, all_clauses: List[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+        """Group already listed clauses by section, every parties.ini section included"""
         clauses_by_section = {}
         
         # Initialize with all sections
@@ -142,32 +183,45 @@ class LocalClauseClient:
             else:
                 return False, f"Erreur de lecture: {str(e)[:50]}"
     
-    def download_selected_clauses(self, selected_clauses: List[Dict[str, str]]) -> List[str]:
-        """Copy selected clause files to temp directory and return paths"""
+    def download_selected_clauses(self, selected_clauses: List[Dict[str, str]],
+                                  progress_callback: Optional[ProgressCallback] = None,
+                                  scratch_owner: Optional[str] = None) -> List[str]:
+        """Copy selected clause files to a scratch directory and return paths.
+
+        The client is shared by all sessions, so each session passes its own scratch_owner.
+        progress_callback receives ('download', copied, total, clause name) after each clause.
+        """
         downloaded_files = []
         
         if not selected_clauses:
             return downloaded_files
         
+        scratch = get_scratch_space()
+        owner = scratch_owner or self.scratch_owner
+        try:
+            scratch.ensure_capacity(owner)
+        except ScratchQuotaExceeded as e:
+            st.warning(f"Copie des clauses impossible: {str(e)}")
+            return downloaded_files
+        target_dir = scratch.directory(owner, 'clauses')
         for i, clause in enumerate(selected_clauses):
             try:
                 source_path = clause['file_path']
                 temp_filename = f"{i+1:03d}_{clause['file_name']}"
-                temp_path = os.path.join(self._temp_dir, temp_filename)
+                temp_path = os.path.join(target_dir, temp_filename)
                 
                 shutil.copy2(source_path, temp_path)
                 downloaded_files.append(temp_path)
                 
             except Exception as e:
                 st.warning(f"Erreur lors de la copie de {clause['name']}: {str(e)}")
-                continue
+            report_progress(progress_callback, 'download', i + 1, len(selected_clauses), clause['name'])
         return downloaded_files
     
     def cleanup(self):
         """Clean up temporary files"""
         try:
-            shutil.rmtree(self._temp_dir, ignore_errors=True)
-            # Also cleanup converter temporary files
-            self.doc_converter.cleanup()
+            # The converter is shared with the rest of the process and outlives the client
+            get_scratch_space().release(self.scratch_owner)
         except Exception:
             pass
\ No newline at end of file
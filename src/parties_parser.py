@@ -1,16 +1,79 @@
 import os
-from typing import List, Dict, Optional
+import time
+import threading
+from typing import List, Dict, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Looked up in this order, relative to the working directory then to the project root
+PARTIES_FILE_CANDIDATES = ("parties.ini", os.path.join("config", "parties.ini"))
+# Minimum delay between two checks of the file's modification time
+RELOAD_CHECK_INTERVAL = 2.0
+
+
+def resolve_parties_file() -> str:
+    """Return the parties.ini to use: CLAUSIER_PARTIES_FILE, ./parties.ini or config/parties.ini"""
+    configured = os.getenv('CLAUSIER_PARTIES_FILE')
+    if configured:
+        return configured
+    for base_dir in (os.getcwd(), PROJECT_ROOT):
+        for candidate in PARTIES_FILE_CANDIDATES:
+            path = os.path.join(base_dir, candidate)
+            if os.path.exists(path):
+                return path
+    return PARTIES_FILE_CANDIDATES[0]
+
 
 class PartiesParser:
-    """Parser for the parties.ini file to extract contract sections"""
+    """Parser for the parties.ini file to extract contract sections
     
-    def __init__(self, parties_file_path: str = "parties.ini"):
-        self.parties_file_path = parties_file_path
+    Sections are indexed by key, name and order, and reloaded when the file's
+    modification time changes (checked at most every RELOAD_CHECK_INTERVAL seconds).
+    """
+    
+    def __init__(self, parties_file_path: Optional[str] = None):
+        self.parties_file_path = parties_file_path or resolve_parties_file()
         self.sections: List[Dict[str, any]] = []
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
         self._load_sections()
+        self._build_indexes()
+    
+    def reload_if_changed(self) -> bool:
+        """Reload the sections if the file changed since the last load; return whether it did"""
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        if self._file_mtime() == self._mtime:
+            return False
+        with self._lock:
+            if self._file_mtime() == self._mtime:
+                return False
+            self._load_sections()
+            self._build_indexes()
+        return True
+    
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.parties_file_path).st_mtime
+        except OSError:
+            return None
+    
+    def _build_indexes(self):
+        """Swap in the lookup tables of the freshly loaded sections"""
+        sections = tuple(self.sections)
+        by_key, by_name, by_order = {}, {}, {}
+        for section in sections:
+            # First occurrence wins, as with the former linear scans
+            by_key.setdefault(section['key'], section)
+            by_name.setdefault(section['name'].lower(), section)
+            by_order.setdefault(section['order'], section)
+        self._indexes = (sections, by_key, by_name, by_order)
     
     def _load_sections(self):
         """Load sections from parties.ini file"""
+        self._mtime = self._file_mtime()
         if not os.path.exists(self.parties_file_path):
             # Default sections if file doesn't exist
             self.sections = [
@@ -74,33 +137,50 @@ class PartiesParser:
         key = re.sub(r'[-\s]+', '_', key)
         return key
     
-    def get_sections(self) -> List[Dict[str, any]]:
-        """Get all contract sections"""
-        return self.sections.copy()
+    def get_sections(self) -> Tuple[Dict[str, any], ...]:
+        """Get all contract sections (shared, read-only)"""
+        self.reload_if_changed()
+        return self._indexes[0]
     
     def get_section_names(self) -> List[str]:
         """Get list of section names in order"""
-        return [section['name'] for section in self.sections]
+        return [section['name'] for section in self.get_sections()]
     
     def get_section_keys(self) -> List[str]:
         """Get list of section keys in order"""
-        return [section['key'] for section in self.sections]
+        return [section['key'] for section in self.get_sections()]
     
     def find_section_by_key(self, key: str) -> Optional[Dict[str, any]]:
         """Find section by key"""
-        for section in self.sections:
-            if section['key'] == key:
-                return section
-        return None
+        self.reload_if_changed()
+        return self._indexes[1].get(key)
     
     def find_section_by_name(self, name: str) -> Optional[Dict[str, any]]:
         """Find section by name"""
-        for section in self.sections:
-            if section['name'].lower() == name.lower():
-                return section
-        return None
+        self.reload_if_changed()
+        return self._indexes[2].get(name.lower())
+    
+    def find_section_by_order(self, order: int) -> Optional[Dict[str, any]]:
+        """Find section by order"""
+        self.reload_if_changed()
+        return self._indexes[3].get(order)
     
     def get_section_order(self, key: str) -> int:
         """Get the order of a section by key"""
         section = self.find_section_by_key(key)
-        return section['order'] if section else 999
\ No newline at end of file
+        return section['order'] if section else 999
+
+
+_parsers: Dict[str, PartiesParser] = {}
+_parsers_lock = threading.Lock()
+
+
+def get_parties_parser(parties_file_path: Optional[str] = None) -> PartiesParser:
+    """Return the process-wide parser of a parties.ini file (resolved when not given)"""
+    path = os.path.abspath(parties_file_path or resolve_parties_file())
+    with _parsers_lock:
+        parser = _parsers.get(path)
+        if parser is None:
+            parser = PartiesParser(path)
+            _parsers[path] = parser
+        return parser
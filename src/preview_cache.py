@@ -0,0 +1,78 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Tuple
+
+# Number of clause previews kept in memory per process
+DEFAULT_PREVIEW_CACHE_SIZE = 256
+
+
+class PreviewCache:
+    """Bounded LRU cache of clause preview texts shared by all sessions.
+
+    Entries are keyed by the file's path, modification time and size, so an edited
+    clause is re-read on its next preview while unchanged ones are served from memory.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv('CLAUSIER_PREVIEW_CACHE_SIZE', DEFAULT_PREVIEW_CACHE_SIZE))
+        self._entries: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, loader: Callable[[str], str]) -> str:
+        """Return the preview of path, loading it with loader on a miss"""
+        key = self._key(path)
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                return text
+
+        text = loader(path)
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def contains(self, path: str) -> bool:
+        try:
+            key = self._key(path)
+        except OSError:
+            return False
+        with self._lock:
+            return key in self._entries
+
+    def warm(self, paths: Iterable[str], loader: Callable[[str], str]):
+        """Load the previews of paths not cached yet on a background thread"""
+        missing = [path for path in paths if path and not self.contains(path)]
+        if not missing:
+            return
+
+        def run():
+            for path in missing[:self.max_entries]:
+                try:
+                    self.get(path, loader)
+                except Exception:
+                    continue
+
+        threading.Thread(target=run, name='clausier-preview-warmup', daemon=True).start()
+
+    @staticmethod
+    def _key(path: str) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+_preview_cache: Optional[PreviewCache] = None
+_preview_cache_lock = threading.Lock()
+
+
+def get_preview_cache() -> PreviewCache:
+    """Return the process-wide preview cache"""
+    global _preview_cache
+    with _preview_cache_lock:
+        if _preview_cache is None:
+            _preview_cache = PreviewCache()
+        return _preview_cache
@@ -0,0 +1,16 @@
+from typing import Callable, Optional
+
+# progress_callback(stage, current, total, item): `current` of `total` steps of `stage` are done,
+# `item` names the clause or section just processed
+ProgressCallback = Callable[[str, int, int, Optional[str]], None]
+
+
+def report_progress(callback: Optional[ProgressCallback], stage: str, current: int, total: int,
+                    item: Optional[str] = None):
+    """Send a progress event if a callback was given; a failing callback never breaks the work"""
+    if callback is None:
+        return
+    try:
+        callback(stage, current, total, item)
+    except Exception:
+        pass
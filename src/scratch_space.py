@@ -0,0 +1,249 @@
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Owner directories left untouched for this long are deleted
+DEFAULT_SCRATCH_TTL_HOURS = 6
+# Disk space one owner (usually a session) may use
+DEFAULT_SESSION_QUOTA_MB = 200
+# Disk space of the whole scratch area, across owners and processes
+DEFAULT_SCRATCH_QUOTA_MB = 2048
+# Seconds between two opportunistic garbage collections of a process
+GC_INTERVAL_SECONDS = 300
+
+
+class ScratchQuotaExceeded(OSError):
+    """Raised when writing more temporary files would exceed a scratch quota"""
+
+
+def session_owner(session_key: str) -> str:
+    """Owner name of a browser session's scratch directory"""
+    return f"session-{session_key}"
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class ScratchSpace:
+    """Temporary working files of the application, under a single root directory.
+
+    Each owner (a session, or a shared component such as the converter) gets its
+    own directory, whose modification time records the owner's last activity.
+    Directories idle for longer than the TTL are garbage collected, whichever
+    process created them, and the least recently active owners are evicted when
+    the whole area exceeds its quota. Writers call ensure_capacity before
+    producing files so that one owner cannot fill the disk.
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 owner_quota_bytes: Optional[int] = None, total_quota_bytes: Optional[int] = None):
+        self.root = root or os.getenv('CLAUSIER_SCRATCH_DIR', os.path.join(tempfile.gettempdir(), 'clausier_scratch'))
+        self.ttl_seconds = ttl_seconds or float(os.getenv('CLAUSIER_SCRATCH_TTL_HOURS', DEFAULT_SCRATCH_TTL_HOURS)) * 3600
+        self.owner_quota_bytes = owner_quota_bytes or int(
+            os.getenv('CLAUSIER_SESSION_QUOTA_MB', DEFAULT_SESSION_QUOTA_MB)) * 1024 * 1024
+        self.total_quota_bytes = total_quota_bytes or int(
+            os.getenv('CLAUSIER_SCRATCH_QUOTA_MB', DEFAULT_SCRATCH_QUOTA_MB)) * 1024 * 1024
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._last_collection = 0.0
+        self._collecting = False
+        # Garbage collection counters of this process
+        self._collected_owners = 0
+        self._freed_bytes = 0
+        # Bytes per owner as measured by the last collection; ensure_capacity estimates
+        # the total from it instead of walking the whole area on every save
+        self._owner_sizes: Dict[str, int] = {}
+
+    def directory(self, owner: str, *parts: str) -> str:
+        """Return (and create) the directory of owner, or a subdirectory of it, and mark the owner active"""
+        path = os.path.join(self.root, owner, *parts)
+        os.makedirs(path, exist_ok=True)
+        self.touch(owner)
+        self.maybe_collect()
+        return path
+
+    def mkdtemp(self, owner: str, prefix: str = '') -> str:
+        """Create a new uniquely named directory inside the owner's directory"""
+        return tempfile.mkdtemp(prefix=prefix, dir=self.directory(owner))
+
+    def touch(self, owner: str):
+        """Mark owner as active, postponing the collection of its directory"""
+        try:
+            os.utime(os.path.join(self.root, owner))
+        except OSError:
+            pass
+
+    def release(self, owner: str, *parts: str):
+        """Delete the directory of owner (or one of its subdirectories) now"""
+        shutil.rmtree(os.path.join(self.root, owner, *parts), ignore_errors=True)
+        if not parts:
+            with self._lock:
+                self._owner_sizes.pop(owner, None)
+
+    def ensure_capacity(self, owner: str):
+        """Raise ScratchQuotaExceeded if owner, or the whole area, is over quota.
+
+        Only the owner's directory is walked. The total is estimated from the sizes
+        measured by the last (periodic) collection, updated with the owner's current
+        size; the whole area is walked only when that estimate exceeds the quota.
+        """
+        owner_bytes = _tree_size(os.path.join(self.root, owner))
+        if owner_bytes > self.owner_quota_bytes:
+            raise ScratchQuotaExceeded(
+                f"Espace temporaire de la session saturé ({owner_bytes // (1024 * 1024)} Mo, "
+                f"limite {self.owner_quota_bytes // (1024 * 1024)} Mo)"
+            )
+        with self._lock:
+            self._owner_sizes[owner] = owner_bytes
+            estimate = sum(self._owner_sizes.values())
+        if estimate > self.total_quota_bytes:
+            self.collect_garbage(keep=owner)
+            with self._lock:
+                total = sum(self._owner_sizes.values())
+            if total > self.total_quota_bytes:
+                raise ScratchQuotaExceeded(
+                    f"Espace temporaire saturé ({total // (1024 * 1024)} Mo, "
+                    f"limite {self.total_quota_bytes // (1024 * 1024)} Mo)"
+                )
+
+    def usage(self) -> Dict[str, int]:
+        """Bytes used by each owner"""
+        return {owner: _tree_size(os.path.join(self.root, owner)) for owner, _ in self._owners()}
+
+    def collect_garbage(self, keep: Optional[str] = None) -> int:
+        """Delete idle owner directories, then the least recently active ones while over quota; return bytes freed"""
+        now = time.time()
+        freed = 0
+        remaining = []
+        for owner, last_active in self._owners():
+            size = _tree_size(os.path.join(self.root, owner))
+            if owner != keep and now - last_active > self.ttl_seconds:
+                self.release(owner)
+                freed += size
+                self._collected_owners += 1
+            else:
+                remaining.append((last_active, owner, size))
+
+        total = sum(size for _, _, size in remaining)
+        sizes = {owner: size for _, owner, size in remaining}
+        for _, owner, size in sorted(remaining):
+            if total <= self.total_quota_bytes:
+                break
+            if owner == keep:
+                continue
+            self.release(owner)
+            del sizes[owner]
+            total -= size
+            freed += size
+            self._collected_owners += 1
+
+        with self._lock:
+            self._owner_sizes = sizes
+
+        self._freed_bytes += freed
+        self._last_collection = time.monotonic()
+        return freed
+
+    def maybe_collect(self):
+        """Collect garbage on a background thread if the last collection is old enough"""
+        with self._lock:
+            if self._collecting or time.monotonic() - self._last_collection < GC_INTERVAL_SECONDS:
+                return
+            self._collecting = True
+
+        def run():
+            try:
+                self.collect_garbage()
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._collecting = False
+                    self._last_collection = time.monotonic()
+
+        threading.Thread(target=run, name='clausier-scratch-gc', daemon=True).start()
+
+    def metrics(self) -> Dict:
+        """Disk usage of the scratch area and garbage collection counters of this process"""
+        usage = self.usage()
+        largest = sorted(usage.items(), key=lambda item: item[1], reverse=True)[:5]
+        try:
+            disk = shutil.disk_usage(self.root)
+            disk_free = disk.free
+        except OSError:
+            disk_free = None
+        return {
+            'root': self.root,
+            'owners': len(usage),
+            'total_bytes': sum(usage.values()),
+            'largest_owners': largest,
+            'total_quota_bytes': self.total_quota_bytes,
+            'owner_quota_bytes': self.owner_quota_bytes,
+            'disk_free_bytes': disk_free,
+            'collected_owners': self._collected_owners,
+            'freed_bytes': self._freed_bytes,
+        }
+
+    def _owners(self) -> List[Tuple[str, float]]:
+        """(owner, last activity time) of every owner directory"""
+        owners = []
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return owners
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    owners.append((entry.name, entry.stat().st_mtime))
+            except OSError:
+                continue
+        return owners
+
+
+_scratch_space: Optional[ScratchSpace] = None
+_scratch_space_lock = threading.Lock()
+
+
+def get_scratch_space() -> ScratchSpace:
+    """Return the process-wide scratch space"""
+    global _scratch_space
+    with _scratch_space_lock:
+        if _scratch_space is None:
+            _scratch_space = ScratchSpace()
+        return _scratch_space
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Affiche l'occupation de l'espace temporaire et le nettoie")
+    parser.add_argument('--collect', action='store_true', help="Supprime les dossiers inactifs ou au-delà du quota")
+    args = parser.parse_args()
+
+    scratch = get_scratch_space()
+    if args.collect:
+        freed = scratch.collect_garbage()
+        print(f"Libéré: {freed / 1024 / 1024:.1f} Mo")
+
+    metrics = scratch.metrics()
+    print(f"Dossier: {metrics['root']}")
+    print(f"Occupation: {metrics['total_bytes'] / 1024 / 1024:.1f} Mo "
+          f"(quota {metrics['total_quota_bytes'] / 1024 / 1024:.0f} Mo) pour {metrics['owners']} propriétaire(s)")
+    if metrics['disk_free_bytes'] is not None:
+        print(f"Espace disque libre: {metrics['disk_free_bytes'] / 1024 / 1024:.0f} Mo")
+    for owner, size in metrics['largest_owners']:
+        print(f"  {owner:<45} {size / 1024 / 1024:>8.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
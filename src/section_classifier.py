@@ -0,0 +1,131 @@
+import re
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# "[TAG] Clause Name" or "TAG - Clause Name"
+TAGGED_NAME_PATTERN = re.compile(r'\[([^\]]+)\]\s*(.+)|([^-]+?)\s*-\s*(.+)')
+NON_WORD_PATTERN = re.compile(r'[^\w\s-]')
+SEPARATOR_PATTERN = re.compile(r'[-\s]+')
+
+NO_MATCH = -1
+
+
+def normalize_tag(tag: str) -> str:
+    """Turn a tag or section name into key form ("Objet du Contrat" -> "objet_du_contrat")"""
+    return SEPARATOR_PATTERN.sub('_', NON_WORD_PATTERN.sub('', tag.lower()))
+
+
+def _lowest_index(first: int, second: int) -> int:
+    if first == NO_MATCH:
+        return second
+    if second == NO_MATCH:
+        return first
+    return min(first, second)
+
+
+class _AhoCorasick:
+    """Multi-pattern substring matcher returning the lowest pattern index found in a text"""
+
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lowest index of the patterns ending at each node (through its fail chain)
+        self._best: List[int] = [NO_MATCH]
+
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(NO_MATCH)
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            if self._best[node] == NO_MATCH or index < self._best[node]:
+                self._best[node] = index
+
+        # Breadth-first: fail links point to the longest proper suffix present in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._best[child] = _lowest_index(self._best[child], self._best[self._fail[child]])
+
+    def lowest_match(self, text: str) -> int:
+        """Return the lowest index of the patterns occurring in text, or NO_MATCH"""
+        # The root only matches the empty pattern
+        best = self._best[0]
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            best = _lowest_index(best, self._best[node])
+        return best
+
+
+class SectionClassifier:
+    """Maps clause file names to section keys in a single pass per name.
+
+    Built once per set of sections: an Aho-Corasick automaton over section names
+    (names found inside the file name) and one over section keys (keys found inside a
+    tag), plus a table of every substring of the keys (tags found inside a key).
+    When several sections match, the first one in parties.ini order wins.
+    """
+
+    def __init__(self, sections: List[Dict]):
+        self.keys = [section['key'] for section in sections]
+        self._key_set = set(self.keys)
+        self._name_matcher = _AhoCorasick([section['name'].lower() for section in sections])
+        self._key_matcher = _AhoCorasick(self.keys)
+        self._key_substrings: Dict[str, int] = {}
+        for index, key in enumerate(self.keys):
+            for start in range(len(key) + 1):
+                for end in range(start, len(key) + 1):
+                    self._key_substrings.setdefault(key[start:end], index)
+
+    def classify(self, clause_name: str) -> Optional[str]:
+        """Return the section key of a clause name, the normalised tag if unknown, or None"""
+        match = TAGGED_NAME_PATTERN.match(clause_name)
+        if match:
+            tag = match.group(1) if match.group(1) is not None else match.group(3)
+            return self.normalize(tag.strip())
+
+        index = self._name_matcher.lowest_match(clause_name.lower())
+        return self.keys[index] if index != NO_MATCH else None
+
+    def normalize(self, tag: str) -> str:
+        """Return the section key a tag refers to, or the normalised tag itself"""
+        normalized = normalize_tag(tag)
+        if normalized in self._key_set:
+            return normalized
+
+        index = _lowest_index(
+            self._key_substrings.get(normalized, NO_MATCH),
+            self._key_matcher.lowest_match(normalized)
+        )
+        return self.keys[index] if index != NO_MATCH else normalized
+
+
+_classifiers: Dict[Tuple, SectionClassifier] = {}
+_classifiers_lock = threading.Lock()
+
+
+def get_section_classifier(sections: List[Dict]) -> SectionClassifier:
+    """Return the classifier for this set of sections, built once per parties.ini content"""
+    version = tuple((section['order'], section['name'], section['key']) for section in sections)
+    with _classifiers_lock:
+        classifier = _classifiers.get(version)
+        if classifier is None:
+            classifier = SectionClassifier(sections)
+            # Only the current parties.ini version is worth keeping
+            _classifiers.clear()
+            _classifiers[version] = classifier
+        return classifier
@@ -1,25 +1,32 @@
 import os
-import tempfile
-import re
-from typing import List, Dict, Optional
-from office365.runtime.auth.user_credential import UserCredential
-from office365.sharepoint.client_context import ClientContext
-from office365.sharepoint.files.file import File
+import uuid
+from typing import TYPE_CHECKING, List, Dict, Optional
 import streamlit as st
 from .config import SharePointConfig
-from .parties_parser import PartiesParser
+from .parties_parser import get_parties_parser
+from .section_classifier import SectionClassifier, get_section_classifier
+from .progress import ProgressCallback, report_progress
+from .scratch_space import get_scratch_space
+
+if TYPE_CHECKING:
+    from office365.sharepoint.client_context import ClientContext
 
 class SharePointClient:
     """Client for interacting with SharePoint documents"""
     
-    def __init__(self, config: SharePointConfig):
+    def __init__(self, config: SharePointConfig, scratch_owner: Optional[str] = None):
         self.config = config
-        self.ctx: Optional[ClientContext] = None
-        self._temp_dir = tempfile.mkdtemp()
-        self.parties_parser = PartiesParser()
+        self.ctx: Optional["ClientContext"] = None
+        # Downloads go to this owner's scratch directory (usually the browser session's)
+        self.scratch_owner = scratch_owner or f"sharepoint-{uuid.uuid4().hex[:8]}"
+        self.parties_parser = get_parties_parser()
     
     def authenticate(self) -> bool:
         """Authenticate with SharePoint"""
+        # office365 takes a good part of a second to import: only load it once SharePoint is used
+        from office365.runtime.auth.user_credential import UserCredential
+        from office365.sharepoint.client_context import ClientContext
+        
         try:
             credentials = UserCredential(self.config.username, self.config.password)
             self.ctx = ClientContext(self.config.site_url).with_credentials(credentials)
@@ -42,10 +49,11 @@ class SharePointClient:
             files = folder.files.get().execute_query()
             
             clause_files = []
+            classifier = self._section_classifier()
             for file in files:
                 if file.name.endswith(('.doc', '.docx')):
                     clause_name = file.name.replace('.docx', '').replace('.doc', '')
-                    section_tag = self._extract_section_tag(clause_name)
+                    section_tag = classifier.classify(clause_name)
                     clause_files.append({
                         'name': clause_name,
                         'file_name': file.name,
@@ -60,13 +68,17 @@ class SharePointClient:
             st.error(f"Erreur lors de la récupération des clauses: {str(e)}")
             return []
     
-    def download_clause_file(self, server_relative_url: str, file_name: str) -> Optional[str]:
+    def download_clause_file(self, server_relative_url: str, file_name: str,
+                             scratch_owner: Optional[str] = None) -> Optional[str]:
         """Download a clause file and return local path"""
         if not self.ctx:
             return None
         
         try:
-            local_path = os.path.join(self._temp_dir, file_name)
+            scratch = get_scratch_space()
+            owner = scratch_owner or self.scratch_owner
+            scratch.ensure_capacity(owner)
+            local_path = os.path.join(scratch.directory(owner, 'sharepoint'), file_name)
             file = self.ctx.web.get_file_by_server_relative_url(server_relative_url)
             
             with open(local_path, 'wb') as local_file:
@@ -78,18 +90,25 @@ class SharePointClient:
             st.error(f"Erreur lors du téléchargement de {file_name}: {str(e)}")
             return None
     
-    def download_selected_clauses(self, selected_clauses: List[Dict[str, str]]) -> List[str]:
-        """Download multiple clause files and return list of local paths"""
+    def download_selected_clauses(self, selected_clauses: List[Dict[str, str]],
+                                  progress_callback: Optional[ProgressCallback] = None,
+                                  scratch_owner: Optional[str] = None) -> List[str]:
+        """Download multiple clause files and return list of local paths.
+
+        progress_callback receives ('download', downloaded, total, clause name) after each clause.
+        """
         downloaded_files = []
         
         for i, clause in enumerate(selected_clauses):
             local_path = self.download_clause_file(
                 clause['server_relative_url'], 
-                clause['file_name']
+                clause['file_name'],
+                scratch_owner=scratch_owner
             )
             
             if local_path:
                 downloaded_files.append(local_path)
+            report_progress(progress_callback, 'download', i + 1, len(selected_clauses), clause['name'])
         return downloaded_files
     
     def _extract_section_tag(self, clause_name: str) -> Optional[str]:
@@ -97,43 +116,15 @@ class SharePointClient:
         Extract section tag from clause name
         Expected format: [TAG] Clause Name or TAG - Clause Name
         """
-        # Pattern 1: [TAG] Clause Name
-        match = re.match(r'\[([^\]]+)\]\s*(.+)', clause_name)
-        if match:
-            tag = match.group(1).strip().lower()
-            return self._normalize_tag(tag)
-        
-        # Pattern 2: TAG - Clause Name
-        match = re.match(r'^([^-]+?)\s*-\s*(.+)', clause_name)
-        if match:
-            tag = match.group(1).strip().lower()
-            return self._normalize_tag(tag)
-        
-        # Pattern 3: Try to match section names directly
-        for section in self.parties_parser.get_sections():
-            section_name = section['name'].lower()
-            if section_name in clause_name.lower():
-                return section['key']
-        
-        return None
+        return self._section_classifier().classify(clause_name)
     
     def _normalize_tag(self, tag: str) -> Optional[str]:
         """Normalize tag to match section keys"""
-        # Remove accents and special characters
-        normalized = re.sub(r'[^\w\s-]', '', tag.lower())
-        normalized = re.sub(r'[-\s]+', '_', normalized)
-        
-        # Try exact match first
-        section = self.parties_parser.find_section_by_key(normalized)
-        if section:
-            return section['key']
-        
-        # Try fuzzy matching with section names
-        for section in self.parties_parser.get_sections():
-            if normalized in section['key'] or section['key'] in normalized:
-                return section['key']
-        
-        return normalized
+        return self._section_classifier().normalize(tag)
+    
+    def _section_classifier(self) -> SectionClassifier:
+        """Matcher compiled once per parties.ini content"""
+        return get_section_classifier(self.parties_parser.get_sections())
     
     def get_clauses_by_section(self) -> Dict[str, List[Dict[str, str]]]:
         """Get clauses grouped by section"""
@@ -159,7 +150,6 @@ class SharePointClient:
     def cleanup(self):
         """Clean up temporary files"""
         try:
-            import shutil
-            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            get_scratch_space().release(self.scratch_owner, 'sharepoint')
         except Exception:
             pass
\ No newline at end of file
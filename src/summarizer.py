@@ -0,0 +1,340 @@
+import os
+import re
+import json
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from .docx_text import iter_docx_paragraphs
+from .config import get_cache_dir, prune_cache_dir
+from .hashing import file_content_hash
+
+DEFAULT_SUMMARY_ENDPOINT = "https://api.openai.com/v1/chat/completions"
+DEFAULT_SUMMARY_MODEL = "gpt-4o-mini"
+# Maximum number of chunk summaries requested at once in the map step
+DEFAULT_SUMMARY_PARALLELISM = 4
+# Default size bound of the on-disk summary cache
+DEFAULT_SUMMARY_CACHE_MB = 50
+
+# Section headers written by DocumentMerger._add_section_header ("3. OBJET DU CONTRAT")
+SECTION_HEADER_PATTERN = re.compile(r'^\d+\.\s+[^a-zà-ÿ]+$')
+
+SYSTEM_PROMPT = "Tu es un assistant juridique. Produis des synthèses structurées, claires et factuelles en français. Utilise uniquement du texte brut, sans formatting markdown."
+CONTRACT_PROMPT = "Analyse le contrat suivant et produis une synthèse structurée en texte brut avec :\n\nPOINTS CLÉS\n• [Liste des éléments essentiels du contrat]\n• [Un point par ligne avec des puces simples]\n\nCONFLITS\n• [0 à 3 points sur d'éventuelles contradictions entre clauses]\n• [Ou indiquer \"Aucun conflit de clause détecté\" si tu n'en trouves pas]\n\nUtilise uniquement des caractères simples (•) pour les listes, pas de markdown.\n\nTexte:\n{text}"
+CHUNK_PROMPT = "Voici la partie {index}/{count} d'un contrat. Résume en texte brut, en quelques puces (•), les éléments essentiels de cette partie (objet, obligations, durées, montants, conditions) et signale toute contradiction interne. Pas de markdown.\n\nTexte:\n{text}"
+CLAUSE_PROMPT = "Résume la clause contractuelle suivante en 1 à 3 puces (•) courtes et factuelles, en texte brut, sans markdown ni titre.\n\nClause:\n{text}"
+REDUCE_PROMPT = "Voici les synthèses successives des différentes parties d'un même contrat. Produis une synthèse structurée de l'ensemble du contrat en texte brut avec :\n\nPOINTS CLÉS\n• [Liste des éléments essentiels du contrat]\n• [Un point par ligne avec des puces simples]\n\nCONFLITS\n• [0 à 3 points sur d'éventuelles contradictions entre clauses]\n• [Ou indiquer \"Aucun conflit de clause détecté\" si tu n'en trouves pas]\n\nUtilise uniquement des caractères simples (•) pour les listes, pas de markdown.\n\nSynthèses partielles:\n{text}"
+
+
+class ContractSummarizer:
+    """Summarize contract text through a chat completions endpoint, with an on-disk cache"""
+
+    def __init__(self, endpoint: Optional[str] = None, model: Optional[str] = None, cache_dir: Optional[str] = None,
+                 max_parallel: Optional[int] = None, max_cache_bytes: Optional[int] = None):
+        # The endpoint can point to a local stand-in (tests, on-premise model)
+        self.endpoint = endpoint or os.getenv('CLAUSIER_SUMMARY_ENDPOINT', DEFAULT_SUMMARY_ENDPOINT)
+        self.model = model or os.getenv('CLAUSIER_SUMMARY_MODEL', DEFAULT_SUMMARY_MODEL)
+        self.cache_dir = cache_dir or get_cache_dir('summaries')
+        self.max_cache_bytes = max_cache_bytes or int(
+            os.getenv('CLAUSIER_SUMMARY_CACHE_MB', DEFAULT_SUMMARY_CACHE_MB)) * 1024 * 1024
+        self.max_parallel = max_parallel or int(os.getenv('CLAUSIER_SUMMARY_PARALLELISM', DEFAULT_SUMMARY_PARALLELISM))
+
+    def summarize_document(self, docx_path: str, max_chars: int = 16000) -> str:
+        """Create a short summary in French of a generated contract.
+
+        Contracts longer than max_chars are summarised with map-reduce: chunks split
+        on section headers are summarised concurrently, then the partial summaries
+        are merged into the final one.
+        """
+        paragraphs = self._read_docx_paragraphs(docx_path)
+        text = "\n".join(paragraphs)
+        if len(text) <= max_chars:
+            return self.summarize_text(text)
+        return self._cached(text, lambda: self._map_reduce(paragraphs, max_chars))
+
+    def summarize_text(self, text: str) -> str:
+        """Summarize contract text, reusing the cached summary of identical text"""
+        if not text.strip():
+            return ""
+        return self._cached(text, lambda: self._complete(CONTRACT_PROMPT.format(text=text), max_tokens=500))
+
+    def summarize_clause(self, text: str, max_chars: int = 16000) -> str:
+        """Summarize a single clause in a few bullet points"""
+        if not text.strip():
+            return ""
+        prompt = CLAUSE_PROMPT.format(text=text[:max_chars])
+        return self._cached(prompt, lambda: self._complete(prompt, max_tokens=200))
+
+    def _map_reduce(self, paragraphs: List[str], max_chars: int) -> str:
+        """Summarise chunks in parallel (bounded), then reduce the partial summaries"""
+        chunks = self._split_into_chunks(paragraphs, max_chars)
+        partials = self._summarize_chunks(chunks)
+
+        # Reduce in several rounds if the partial summaries still exceed the budget
+        combined = "\n\n".join(partials)
+        while len(combined) > max_chars and len(partials) > 1:
+            groups = self._split_into_chunks(partials, max_chars)
+            if len(groups) == len(partials):
+                break
+            partials = self._summarize_chunks(groups)
+            combined = "\n\n".join(partials)
+
+        if not combined.strip():
+            return ""
+        prompt = REDUCE_PROMPT.format(text=combined[:max_chars])
+        return self._cached(prompt, lambda: self._complete(prompt, max_tokens=500))
+
+    def _summarize_chunks(self, chunks: List[str]) -> List[str]:
+        """Map step: summarise each chunk, at most max_parallel requests at once"""
+        def summarize_chunk(indexed_chunk):
+            index, chunk = indexed_chunk
+            prompt = CHUNK_PROMPT.format(index=index, count=len(chunks), text=chunk)
+            return self._cached(prompt, lambda: self._complete(prompt, max_tokens=400))
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_parallel, len(chunks)))) as executor:
+            partials = list(executor.map(summarize_chunk, enumerate(chunks, 1)))
+        return [p for p in partials if p]
+
+    def _split_into_chunks(self, paragraphs: List[str], max_chars: int) -> List[str]:
+        """Group paragraphs into chunks of at most max_chars, cutting preferably on section headers"""
+        # Group paragraphs by section
+        sections: List[List[str]] = [[]]
+        for para in paragraphs:
+            if SECTION_HEADER_PATTERN.match(para) and sections[-1]:
+                sections.append([])
+            sections[-1].append(para)
+
+        chunks: List[str] = []
+        current: List[str] = []
+        current_len = 0
+
+        def flush():
+            nonlocal current, current_len
+            if current:
+                chunks.append("\n".join(current))
+            current, current_len = [], 0
+
+        for section in sections:
+            section_len = sum(len(p) + 1 for p in section)
+            # Start a new chunk on a section boundary when the section does not fit
+            if current and current_len + section_len > max_chars:
+                flush()
+            for para in section:
+                # Oversized sections are cut on paragraph boundaries, oversized paragraphs hard-cut
+                for start in range(0, len(para), max_chars):
+                    piece = para[start:start + max_chars]
+                    if current and current_len + len(piece) + 1 > max_chars:
+                        flush()
+                    current.append(piece)
+                    current_len += len(piece) + 1
+        flush()
+        return chunks
+
+    def _cached(self, key_text: str, compute: Callable[[], str]) -> str:
+        """Return the cached result for key_text, computing and storing it on a miss"""
+        cache_path = self._cache_path(key_text)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = f.read()
+            # Mark as recently used for eviction
+            os.utime(cache_path)
+            return cached
+        except OSError:
+            pass
+
+        result = compute()
+        if result:
+            self._write_cache(cache_path, result)
+        return result
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        """Send one chat completion request and return the answer text"""
+        api_key = self._read_api_key()
+        if not api_key and self.endpoint == DEFAULT_SUMMARY_ENDPOINT:
+            return ""
+
+        payload = {
+            "model": self.model,
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+        }
+
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        import requests  # only needed when the LLM is actually called
+
+        resp = requests.post(self.endpoint, json=payload, headers=headers, timeout=60)
+        resp.raise_for_status()
+        data = resp.json()
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+
+    def _cache_path(self, text: str) -> str:
+        """Cache entry for a text, keyed by model and a hash of the text"""
+        digest = hashlib.sha256(f"{self.model}\n{text}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.txt")
+
+    def _write_cache(self, cache_path: str, summary: str):
+        """Write a cache entry atomically so concurrent readers never see partial files,
+        then evict the least recently used entries beyond the cache size bound"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(summary)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            return
+        prune_cache_dir(self.cache_dir, '.txt', self.max_cache_bytes, keep=cache_path)
+
+    def _read_docx_paragraphs(self, path: str) -> List[str]:
+        """Return the non-empty paragraphs of a document, without truncation"""
+        return list(iter_docx_paragraphs(path))
+
+    def _read_api_key(self) -> str:
+        """Read API key from Streamlit secrets, environment or cleAPI.txt in project root."""
+        # First try Streamlit secrets (works in cloud deployments)
+        try:
+            import streamlit as st
+            if hasattr(st, 'secrets') and 'OPENAI_API_KEY' in st.secrets:
+                key = st.secrets['OPENAI_API_KEY']
+                if key and key.strip():
+                    return key.strip()
+        except Exception:
+            pass
+
+        # Then try environment variable
+        key = os.getenv('OPENAI_API_KEY')
+        if key and key.strip():
+            return key.strip()
+
+        # Finally try local file
+        candidates = [
+            os.path.join(os.getcwd(), 'cleAPI.txt'),
+            os.path.abspath(os.path.join(os.path.dirname(__file__), 'cleAPI.txt')),
+            os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleAPI.txt')),
+        ]
+        for p in candidates:
+            try:
+                if os.path.exists(p):
+                    with open(p, 'r', encoding='utf-8') as f:
+                        key = f.read().strip()
+                        if key:
+                            return key
+            except Exception:
+                continue
+        return ""
+
+
+class ClauseSummaryStore:
+    """Per-clause summaries keyed by clause content hash.
+
+    The store lives in the persistent cache directory, one file per clause library
+    (keyed by its absolute path), so the library itself can be read-only or synced.
+    """
+
+    # Former location inside the library, still read when the store has not been written yet
+    LEGACY_FILE_NAME = '.clause_summaries.json'
+
+    def __init__(self, clauses_dir: str = "clauses"):
+        self.path = self.store_path(clauses_dir)
+        self._legacy_path = os.path.join(clauses_dir, self.LEGACY_FILE_NAME)
+        self._entries: Dict[str, Dict[str, str]] = self._load()
+
+    @staticmethod
+    def store_path(clauses_dir: str) -> str:
+        """Path of the store file of a clause library"""
+        library_key = hashlib.sha256(os.path.abspath(clauses_dir).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(get_cache_dir('clause_summaries'), f"{library_key}.json")
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        for path in (self.path, self._legacy_path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                continue
+        return {}
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Return the stored summary for a clause content hash"""
+        entry = self._entries.get(content_hash)
+        return entry['summary'] if entry else None
+
+    def set(self, content_hash: str, summary: str, clause_name: str = ""):
+        self._entries[content_hash] = {'summary': summary, 'name': clause_name}
+
+    def save(self):
+        """Persist the store atomically"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def precompute_clause_summaries(clauses_dir: str = "clauses", summarizer: Optional[ContractSummarizer] = None) -> Dict[str, int]:
+    """Offline step: summarise every clause of the library not yet in the summary store.
+
+    A clause whose summary request fails is reported and left for the next run; the
+    summaries obtained are saved whatever happens to the others.
+    """
+    from .local_client import LocalClauseClient
+
+    summarizer = summarizer or ContractSummarizer()
+    store = ClauseSummaryStore(clauses_dir)
+    client = LocalClauseClient(clauses_dir)
+    stats = {'summarized': 0, 'cached': 0, 'skipped': 0, 'failed': 0}
+
+    pending = []
+    # Plain listing: no conversion warmup, indexing or similarity work for an offline run
+    for clause in client.scan_clause_files():
+        content_hash = clause.get('content_hash') or file_content_hash(clause['file_path'])
+        if store.get(content_hash):
+            stats['cached'] += 1
+        else:
+            pending.append((clause, content_hash))
+
+    def summarize(item):
+        clause, _ = item
+        try:
+            if clause['is_legacy_doc']:
+                # Legacy .doc clauses are summarised from their extracted text, without conversion
+                text = client.doc_converter.extract_text(clause['file_path']) or ""
+            else:
+                text = "\n".join(summarizer._read_docx_paragraphs(clause['file_path']))
+            return summarizer.summarize_clause(text), None
+        except Exception as e:
+            return None, e
+
+    try:
+        with ThreadPoolExecutor(max_workers=summarizer.max_parallel) as executor:
+            for (clause, content_hash), (summary, error) in zip(pending, executor.map(summarize, pending)):
+                if error is not None:
+                    stats['failed'] += 1
+                    print(f"Échec du résumé: {clause['file_name']} - {str(error)}")
+                elif summary:
+                    store.set(content_hash, summary, clause['name'])
+                    stats['summarized'] += 1
+                    print(f"Résumée: {clause['file_name']}")
+                else:
+                    stats['skipped'] += 1
+                    print(f"Aucun résumé produit: {clause['file_name']}")
+    finally:
+        store.save()
+        client.cleanup()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Précalcule les résumés de chaque clause de la bibliothèque")
+    parser.add_argument('--clauses-dir', default="clauses", help="Dossier racine des clauses")
+    parser.add_argument('--endpoint', default=None, help="Endpoint chat completions (par défaut: CLAUSIER_SUMMARY_ENDPOINT)")
+    args = parser.parse_args()
+
+    result = precompute_clause_summaries(args.clauses_dir, ContractSummarizer(endpoint=args.endpoint))
+    print(f"{result['summarized']} clause(s) résumée(s), {result['cached']} déjà en cache, "
+          f"{result['skipped']} ignorée(s), {result['failed']} en échec")
@@ -0,0 +1,186 @@
+import re
+import struct
+from typing import List, Optional
+
+import olefile
+
+# FIB (File Information Block) layout of the WordDocument stream
+FIB_MAGIC = 0xA5EC
+FIB_FLAGS_OFFSET = 0x0A
+FIB_ENCRYPTED = 0x0100
+FIB_WHICH_TABLE_STREAM = 0x0200
+FIB_CSW_OFFSET = 0x20
+# Indexes in FibRgLw97 / FibRgFcLcb97
+CCP_TEXT_INDEX = 3
+FC_CLX_INDEX = 33
+
+# Piece descriptors: bit 30 of fc marks 8-bit (compressed) text
+FC_COMPRESSED = 0x40000000
+FC_MASK = 0x3FFFFFFF
+
+CLX_PRC = 0x01
+CLX_PCDT = 0x02
+
+FIELD_BEGIN = '\x13'
+FIELD_SEPARATOR = '\x14'
+FIELD_END = '\x15'
+FIELD_MARK_PATTERN = re.compile('[\x13\x14\x15]')
+
+# Control characters of the Word text stream mapped to plain text (None drops them)
+SPECIAL_CHARS = {
+    '\r': '\n',      # end of paragraph
+    '\x07': '\n',    # end of table cell / row
+    '\x0b': '\n',    # manual line break
+    '\x0c': '\n',    # page / section break
+    '\x1e': '-',     # non-breaking hyphen
+    '\xa0': ' ',     # non-breaking space
+    '\x1f': None,    # optional hyphen
+    '\x01': None,    # picture anchor
+    '\x08': None,    # drawing object anchor
+    '\x05': None,    # annotation reference
+    '\x02': None,    # auto-numbered footnote reference
+}
+SPECIAL_CHARS_TABLE = str.maketrans(SPECIAL_CHARS)
+
+
+class WordBinaryError(ValueError):
+    """Raised when a file is not a readable Word 97-2003 document"""
+
+
+def extract_word_text(file_path: str) -> str:
+    """Return the main document text of a Word 97-2003 (.doc) file.
+
+    Reads the WordDocument and table streams with olefile and decodes the piece
+    table, so 8-bit (cp1252) and Unicode pieces are both decoded correctly. Field
+    instructions are dropped and only their displayed results are kept.
+    """
+    if not olefile.isOleFile(file_path):
+        raise WordBinaryError("Fichier OLE2 invalide")
+
+    with olefile.OleFileIO(file_path) as ole:
+        if not ole.exists('WordDocument'):
+            raise WordBinaryError("Flux WordDocument introuvable")
+        word_document = ole.openstream('WordDocument').read()
+        table_name = '1Table' if _fib_flags(word_document) & FIB_WHICH_TABLE_STREAM else '0Table'
+        if not ole.exists(table_name):
+            raise WordBinaryError(f"Flux {table_name} introuvable")
+        table = ole.openstream(table_name).read()
+
+    ccp_text, fc_clx, lcb_clx = _read_fib(word_document)
+    pieces = _read_piece_table(table[fc_clx:fc_clx + lcb_clx])
+
+    chunks: List[str] = []
+    for cp_start, cp_end, fc in pieces:
+        if cp_start >= ccp_text:
+            break
+        # Only the main document: footnotes, headers and comments follow it
+        cp_end = min(cp_end, ccp_text)
+        chunks.append(_decode_piece(word_document, cp_start, cp_end, fc))
+
+    return _clean_text(_strip_field_codes(''.join(chunks)))
+
+
+def _fib_flags(word_document: bytes) -> int:
+    if len(word_document) < FIB_CSW_OFFSET + 2:
+        raise WordBinaryError("FIB tronqué")
+    magic, = struct.unpack_from('<H', word_document, 0)
+    if magic != FIB_MAGIC:
+        raise WordBinaryError("Signature Word absente")
+    flags, = struct.unpack_from('<H', word_document, FIB_FLAGS_OFFSET)
+    if flags & FIB_ENCRYPTED:
+        raise WordBinaryError("Document protégé par mot de passe")
+    return flags
+
+
+def _read_fib(word_document: bytes):
+    """Return (ccpText, fcClx, lcbClx) from the variable-length FIB"""
+    try:
+        offset = FIB_CSW_OFFSET
+        csw, = struct.unpack_from('<H', word_document, offset)
+        offset += 2 + csw * 2
+        cslw, = struct.unpack_from('<H', word_document, offset)
+        rg_lw_offset = offset + 2
+        ccp_text, = struct.unpack_from('<i', word_document, rg_lw_offset + CCP_TEXT_INDEX * 4)
+        offset = rg_lw_offset + cslw * 4
+        cb_rg_fc_lcb, = struct.unpack_from('<H', word_document, offset)
+        if cb_rg_fc_lcb <= FC_CLX_INDEX:
+            raise WordBinaryError("Version de Word non supportée")
+        fc_clx, lcb_clx = struct.unpack_from('<II', word_document, offset + 2 + FC_CLX_INDEX * 8)
+    except struct.error:
+        raise WordBinaryError("FIB tronqué")
+    return ccp_text, fc_clx, lcb_clx
+
+
+def _read_piece_table(clx: bytes):
+    """Return (cp_start, cp_end, fc) for each piece of the Clx piece table"""
+    offset = 0
+    try:
+        # Skip the Prc (property modifiers) blocks preceding the Pcdt
+        while offset < len(clx) and clx[offset] == CLX_PRC:
+            cb_grpprl, = struct.unpack_from('<h', clx, offset + 1)
+            offset += 3 + cb_grpprl
+        if offset >= len(clx) or clx[offset] != CLX_PCDT:
+            raise WordBinaryError("Table des pièces introuvable")
+        lcb, = struct.unpack_from('<I', clx, offset + 1)
+        plc_offset = offset + 5
+        count = (lcb - 4) // 12
+        cps = struct.unpack_from(f'<{count + 1}I', clx, plc_offset)
+        pcd_offset = plc_offset + (count + 1) * 4
+        return [
+            (cps[i], cps[i + 1], struct.unpack_from('<I', clx, pcd_offset + i * 8 + 2)[0])
+            for i in range(count)
+        ]
+    except struct.error:
+        raise WordBinaryError("Table des pièces tronquée")
+
+
+def _decode_piece(word_document: bytes, cp_start: int, cp_end: int, fc: int) -> str:
+    length = cp_end - cp_start
+    if fc & FC_COMPRESSED:
+        start = (fc & FC_MASK) // 2
+        return word_document[start:start + length].decode('cp1252', errors='replace')
+    start = fc & FC_MASK
+    return word_document[start:start + length * 2].decode('utf-16-le', errors='replace')
+
+
+def _strip_field_codes(text: str) -> str:
+    """Drop field instructions (between begin and separator marks), keep field results"""
+    if FIELD_BEGIN not in text:
+        return text
+    parts: List[str] = []
+    # One entry per open field: True while its instruction is being read
+    in_instruction: List[bool] = []
+    # Open fields whose instruction is being read: text is kept only when there are none
+    instructions = 0
+    position = 0
+    for mark in FIELD_MARK_PATTERN.finditer(text):
+        index, char = mark.start(), mark.group()
+        if not instructions:
+            parts.append(text[position:index])
+        if char == FIELD_BEGIN:
+            in_instruction.append(True)
+            instructions += 1
+        elif in_instruction:
+            if char == FIELD_SEPARATOR:
+                if in_instruction[-1]:
+                    in_instruction[-1] = False
+                    instructions -= 1
+            elif in_instruction.pop():
+                instructions -= 1
+        position = index + 1
+    if not instructions:
+        parts.append(text[position:])
+    return ''.join(parts)
+
+
+def _clean_text(text: str) -> str:
+    lines = (' '.join(line.split()) for line in text.translate(SPECIAL_CHARS_TABLE).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def try_extract_word_text(file_path: str) -> Optional[str]:
+    """Like extract_word_text, but returns None when the file cannot be parsed"""
+    try:
+        return extract_word_text(file_path)
+    except (WordBinaryError, OSError):
+        return None
@@ -0,0 +1,14 @@
+import os
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLAUSES_DIR = os.path.join(ROOT_DIR, 'clauses')
+TEMPLATE_PATH = os.path.join(CLAUSES_DIR, 'Exemple contrat V2 clausier km.docx')
+PARTIES_FILE = os.path.join(ROOT_DIR, 'config', 'parties.ini')
+
+# Caches and temporary files of the tests stay out of the machine-wide directories
+_test_dir = tempfile.mkdtemp(prefix='clausier_tests_')
+os.environ['CLAUSIER_CACHE_DIR'] = os.path.join(_test_dir, 'cache')
+os.environ['CLAUSIER_SCRATCH_DIR'] = os.path.join(_test_dir, 'scratch')
+os.environ['CLAUSIER_PARTIES_FILE'] = PARTIES_FILE
+os.environ['CLAUSIER_PREVIEW_WARMUP'] = '0'
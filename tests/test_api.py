@@ -0,0 +1,91 @@
+import asyncio
+import os
+
+import pytest
+from aiohttp import ClientTimeout
+from aiohttp.test_utils import TestClient, TestServer
+
+from api import JOB_QUEUE_KEY, create_app
+from conftest import CLAUSES_DIR, TEMPLATE_PATH
+
+
+def _run(check):
+    """Run check(client) against a test server of the API"""
+    async def main():
+        async with TestClient(TestServer(create_app(CLAUSES_DIR, TEMPLATE_PATH))) as client:
+            return await check(client)
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize('body', [
+    'pas du json',
+    '[]',
+    '{}',
+    '{"clauses": []}',
+    '{"clauses": "abc"}',
+    '{"clauses": [{"a": 1}]}',
+    '{"clauses": [1, 2]}',
+    '{"clauses": ["inconnue.docx"]}',
+])
+def test_invalid_contract_requests_are_rejected(body):
+    async def check(client):
+        response = await client.post('/api/contracts', data=body, headers={'Content-Type': 'application/json'})
+        return response.status, await response.json()
+
+    status, payload = _run(check)
+    assert status == 400
+    assert payload['error']
+
+
+def test_unknown_clause_ids_are_listed():
+    async def check(client):
+        response = await client.post('/api/contracts', json={'clauses': ['inconnue.docx', 'autre.docx']})
+        return await response.json()
+
+    assert 'inconnue.docx, autre.docx' in _run(check)['error']
+
+
+@pytest.mark.parametrize('query', ['', '?q=', '?q=%20', '?q=prix&limit=beaucoup'])
+def test_invalid_search_requests_are_rejected(query):
+    async def check(client):
+        return (await client.get(f'/api/search{query}')).status
+
+    assert _run(check) == 400
+
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/api/contracts/inconnu'),
+    ('GET', '/api/contracts/inconnu/document'),
+    ('DELETE', '/api/contracts/inconnu'),
+    ('GET', '/api/clauses/inconnue.docx/preview'),
+])
+def test_unknown_resources_are_not_found(method, path):
+    async def check(client):
+        return (await client.request(method, path)).status
+
+    assert _run(check) == 404
+
+
+@pytest.mark.parametrize('handler_cancellation', [False, True])
+def test_abandoned_wait_requests_leave_no_job_behind(handler_cancellation):
+    async def main():
+        app = create_app(CLAUSES_DIR, TEMPLATE_PATH)
+        async with TestClient(TestServer(app, handler_cancellation=handler_cancellation)) as client:
+            clauses = await (await client.get('/api/clauses')).json()
+            clause_id = next(clause['id'] for section in clauses.values() for clause in section)
+            queue = app[JOB_QUEUE_KEY]
+            with pytest.raises(asyncio.TimeoutError):
+                # The client gives up long before the assembly is done
+                await client.post('/api/contracts?wait=1', json={'clauses': [clause_id]},
+                                  timeout=ClientTimeout(total=0.2))
+            (job_id, job), = queue._jobs.items()
+            await asyncio.wrap_future(job['future'])
+            result_path = job['future'].result()['result_path']
+            # Cleanup runs when the handler notices the lost connection, or once the job is done
+            for _ in range(50):
+                if job_id not in queue._jobs and not os.path.exists(result_path):
+                    break
+                await asyncio.sleep(0.1)
+            return job_id in queue._jobs, os.path.exists(result_path)
+
+    assert asyncio.run(main()) == (False, False)
@@ -0,0 +1,23 @@
+from src import clause_catalog
+from src.clause_catalog import ClauseCatalog
+from conftest import CLAUSES_DIR
+
+
+def test_library_is_walked_at_most_once_per_interval(monkeypatch):
+    catalog = ClauseCatalog(CLAUSES_DIR)
+    walks = []
+    library_version = catalog.library_version
+    monkeypatch.setattr(catalog, 'library_version', lambda: walks.append(1) or library_version())
+    clock = [1000.0]
+    monkeypatch.setattr(clause_catalog.time, 'monotonic', lambda: clock[0])
+
+    assert catalog.refresh()
+    assert not catalog.refresh() and not catalog.refresh()
+    assert len(walks) == 1
+
+    clock[0] += clause_catalog.LIBRARY_CHECK_INTERVAL
+    assert not catalog.refresh()
+    assert len(walks) == 2
+    # An explicit reload always walks and rescans
+    assert catalog.refresh(force=True)
+    assert len(walks) == 3
@@ -0,0 +1,27 @@
+import threading
+
+from src.clause_search import ClauseSearchIndex
+
+
+def test_lists_received_while_indexing_are_indexed_next(tmp_path, monkeypatch):
+    index = ClauseSearchIndex(db_path=str(tmp_path / 'clauses.sqlite'))
+    started, release = threading.Event(), threading.Event()
+    updates = []
+
+    def update(clauses, library_dir=None):
+        updates.append((library_dir, [clause['name'] for clause in clauses]))
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(index, 'update', update)
+    index.update_in_background([{'name': 'a'}], 'bibliotheque')
+    indexer = index._indexing
+    started.wait(5)
+    # Only the latest list of each library is kept while the first update runs
+    index.update_in_background([{'name': 'b'}], 'bibliotheque')
+    index.update_in_background([{'name': 'c'}], 'bibliotheque')
+    release.set()
+    indexer.join(5)
+
+    assert updates == [('bibliotheque', ['a']), ('bibliotheque', ['c'])]
+    assert index._indexing is None
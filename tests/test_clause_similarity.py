@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from src import clause_similarity
+from src.clause_search import ClauseSearchIndex
+from src.clause_similarity import annotate_variant_families
+
+
+def test_families_are_computed_from_the_indexed_text(tmp_path, monkeypatch):
+    library = tmp_path / 'clauses'
+    library.mkdir()
+    text = "Le prestataire s'engage à garder confidentielles les informations transmises par le client"
+    clauses = [
+        {'name': name, 'file_path': str(library / f"{name}.docx"), 'section_tag': 'confidentialite',
+         'content_hash': name}
+        for name in ('Confidentialité V1', 'Confidentialité V2', 'Objet')
+    ]
+    texts = {'Confidentialité V1': text, 'Confidentialité V2': text + " pendant cinq ans",
+             'Objet': "Le présent contrat a pour objet la réalisation d'une étude de faisabilité technique"}
+
+    index = ClauseSearchIndex(db_path=str(tmp_path / 'clauses.sqlite'))
+    monkeypatch.setattr('src.clause_search.load_clause_text', lambda path: texts[os.path.basename(path)[:-5]])
+    index.update(clauses, library_dir=str(library))
+
+    # Signatures come from the index: the clause files are never read again
+    monkeypatch.setattr(clause_similarity, 'get_clause_search_index', lambda: index)
+    monkeypatch.setattr(clause_similarity, 'load_clause_text', lambda path: pytest.fail(f"{path} read again"))
+    monkeypatch.setattr(clause_similarity, '_signature_cache', {})
+    annotate_variant_families(clauses, threshold=0.5)
+
+    assert [clause['variant_family'] for clause in clauses] == ['Confidentialité V1', 'Confidentialité V1', None]
+    assert clauses[1]['variant_similarity'] >= 0.5 and clauses[2]['variant_similarity'] is None
+
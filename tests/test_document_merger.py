@@ -0,0 +1,92 @@
+import zipfile
+
+import pytest
+from lxml import etree
+
+from src.document_merger import DocumentMerger
+from src.local_client import LocalClauseClient
+from src.parties_parser import PartiesParser
+from conftest import CLAUSES_DIR, PARTIES_FILE, TEMPLATE_PATH
+
+
+@pytest.fixture(scope='module')
+def library():
+    """(clauses by section, sections) of the sample clause library"""
+    clauses_by_section = {}
+    for clause in LocalClauseClient(CLAUSES_DIR).get_clause_files():
+        clauses_by_section.setdefault(clause['section_tag'], []).append(clause)
+    return clauses_by_section, PartiesParser(PARTIES_FILE).get_sections()
+
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _canonical_document(path):
+    """Body XML with list numIds renumbered by first use, and the list definition behind each of them.
+
+    A re-splice imports numbering definitions under new ids, so two assemblies of the
+    same selection are equivalent when only the ids differ.
+    """
+    with zipfile.ZipFile(path) as archive:
+        document = etree.fromstring(archive.read('word/document.xml'))
+        numbering = etree.fromstring(archive.read('word/numbering.xml'))
+
+    abstract_definitions = {}
+    for abstract in numbering.iter(W + 'abstractNum'):
+        definition = etree.fromstring(etree.tostring(abstract))
+        del definition.attrib[W + 'abstractNumId']
+        abstract_definitions[abstract.get(W + 'abstractNumId')] = etree.tostring(definition)
+    num_abstracts = {num.get(W + 'numId'): num.find(W + 'abstractNumId').get(W + 'val')
+                     for num in numbering.iter(W + 'num')}
+
+    labels = {}
+    definitions = []
+    for num_id in document.iter(W + 'numId'):
+        value = num_id.get(W + 'val')
+        if value not in labels:
+            labels[value] = str(len(labels) + 1)
+            definitions.append(abstract_definitions.get(num_abstracts.get(value)))
+        num_id.set(W + 'val', labels[value])
+    return etree.tostring(document), definitions
+
+
+def _selections(clauses_by_section):
+    """Successive selections: shrink a section, drop one, change another, then back to everything"""
+    keys = list(clauses_by_section)
+    first, second, third = keys[1], keys[2], keys[3]
+    shrunk = dict(clauses_by_section)
+    shrunk[second] = clauses_by_section[second][:1]
+    dropped = {key: value for key, value in shrunk.items() if key != first}
+    changed = dict(dropped)
+    changed[third] = clauses_by_section[third][::-1]
+    return [shrunk, dropped, changed, clauses_by_section]
+
+
+def test_incremental_resplice_matches_full_rebuild(library):
+    clauses_by_section, sections = library
+    incremental = DocumentMerger(template_path=TEMPLATE_PATH)
+    incremental.merge_documents_by_sections(clauses_by_section, sections)
+
+    for selection in _selections(clauses_by_section):
+        spliced = _canonical_document(incremental.merge_documents_by_sections(selection, sections))
+        rebuilt = _canonical_document(
+            DocumentMerger(template_path=TEMPLATE_PATH).merge_documents_by_sections(selection, sections)
+        )
+        assert spliced == rebuilt
+
+
+def test_resplice_reports_warnings_of_reused_sections(library):
+    clauses_by_section, sections = library
+    key = next(iter(clauses_by_section))
+    broken = dict(clauses_by_section)
+    broken[key] = clauses_by_section[key] + [{'name': 'Absente', 'file_path': '/nonexistent/absente.docx'}]
+
+    merger = DocumentMerger(template_path=TEMPLATE_PATH)
+    merger.merge_documents_by_sections(broken, sections)
+    assert any('Absente' in warning for warning in merger.warnings)
+
+    # Only another section changes: the broken one is reused, its warning kept
+    other = list(clauses_by_section)[-1]
+    broken[other] = clauses_by_section[other][:1]
+    merger.merge_documents_by_sections(broken, sections)
+    assert any('Absente' in warning for warning in merger.warnings)
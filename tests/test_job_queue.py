@@ -0,0 +1,31 @@
+import os
+
+from src import job_queue
+from src.local_client import LocalClauseClient
+from src.parties_parser import PartiesParser
+from conftest import CLAUSES_DIR, PARTIES_FILE, TEMPLATE_PATH
+
+
+def test_evicted_sessions_keep_their_documents(monkeypatch):
+    monkeypatch.setattr(job_queue, '_worker_mergers', job_queue.OrderedDict())
+    clauses_by_section = {}
+    for clause in LocalClauseClient(CLAUSES_DIR).get_clause_files():
+        clauses_by_section.setdefault(clause['section_tag'], []).append(clause)
+    spec = {
+        'clauses_by_section': clauses_by_section,
+        'sections_order': PartiesParser(PARTIES_FILE).get_sections(),
+        'template_path': TEMPLATE_PATH,
+        'enable_summary': False,
+    }
+
+    progress = {}
+    results = [
+        job_queue._run_assembly_job(f"job-{index}", {**spec, 'session_key': f"eviction-{index}"}, progress)
+        for index in range(job_queue.WORKER_MERGER_CACHE_SIZE + 1)
+    ]
+
+    # The first session's merger was evicted, its document is still there to download
+    assert ('eviction-0', TEMPLATE_PATH) not in job_queue._worker_mergers
+    with open(results[0]['result_path'], 'rb') as document:
+        assert document.read(2) == b'PK'
+    assert all(os.path.exists(result['result_path']) for result in results)
@@ -0,0 +1,48 @@
+import app
+from app import _split_preview_pages
+
+TITLE = "=== APERÇU DU CONTRAT COMPLET ===\n"
+
+
+def _preview(section_count, clauses_text):
+    """Preview laid out like _generate_contract_preview: {section order: clause text} for selected sections"""
+    parts = [TITLE]
+    for order in range(1, section_count + 1):
+        header = f"\n**--- {order}. Section {order} ---**"
+        if order in clauses_text:
+            parts += [f"{header}\n", "\n[Clause]\n", clauses_text[order], "\n", "=" * 50 + "\n"]
+        else:
+            parts.append(f"{header} : aucune clause sélectionnée\n")
+    return "\n".join(parts)
+
+
+def test_pages_rebuild_the_preview():
+    content = _preview(37, {3: "Texte court.\n", 20: "Une ligne de clause.\n" * 800})
+    pages, _ = _split_preview_pages(content)
+    assert "\n".join(pages) == content
+
+
+def test_empty_sections_share_pages_and_stay_out_of_the_jump_list():
+    content = _preview(37, {3: "Texte court.\n", 20: "Texte court.\n"})
+    pages, jumps = _split_preview_pages(content)
+    assert len(pages) == 1
+    assert jumps == [("3. Section 3", 0), ("20. Section 20", 0)]
+
+
+def test_long_sections_span_pages_cut_at_line_breaks(monkeypatch):
+    monkeypatch.setattr(app, 'PREVIEW_PAGE_CHARS', 500)
+    content = _preview(5, {2: "Ligne de clause numéro X.\n" * 100, 4: "Texte court.\n"})
+    pages, jumps = _split_preview_pages(content)
+    assert len(pages) > 5
+    assert all(len(page) <= 500 for page in pages)
+    assert all(line.endswith(".") or not line.startswith("Ligne") for page in pages for line in page.split("\n"))
+    # Each selected section is listed once, on the page holding its header
+    assert [label for label, _ in jumps] == ["2. Section 2", "4. Section 4"]
+    for label, page in jumps:
+        assert f"**--- {label} ---**" in pages[page]
+
+
+def test_preview_without_sections_is_one_page():
+    pages, jumps = _split_preview_pages(TITLE + "(Aucun aperçu disponible)")
+    assert pages == [TITLE + "(Aucun aperçu disponible)"]
+    assert jumps == []
@@ -0,0 +1,86 @@
+import os
+import random
+import re
+
+import pytest
+
+from src.parties_parser import PartiesParser
+from src.section_classifier import SectionClassifier
+from conftest import CLAUSES_DIR, PARTIES_FILE
+
+
+def _reference_normalize(sections, tag):
+    """Linear tag matching the classifier replaces"""
+    normalized = re.sub(r'[^\w\s-]', '', tag.lower())
+    normalized = re.sub(r'[-\s]+', '_', normalized)
+    for section in sections:
+        if section['key'] == normalized:
+            return section['key']
+    for section in sections:
+        if normalized in section['key'] or section['key'] in normalized:
+            return section['key']
+    return normalized
+
+
+def _reference_classify(sections, clause_name):
+    """Linear clause name matching the classifier replaces"""
+    match = re.match(r'\[([^\]]+)\]\s*(.+)', clause_name)
+    if match:
+        return _reference_normalize(sections, match.group(1).strip().lower())
+    match = re.match(r'^([^-]+?)\s*-\s*(.+)', clause_name)
+    if match:
+        return _reference_normalize(sections, match.group(1).strip().lower())
+    for section in sections:
+        if section['name'].lower() in clause_name.lower():
+            return section['key']
+    return None
+
+
+@pytest.fixture(scope='module')
+def sections():
+    return PartiesParser(PARTIES_FILE).get_sections()
+
+
+def _clause_names(sections):
+    rng = random.Random(42)
+    words = [word for section in sections for word in section['name'].split()]
+    names = [os.path.splitext(entry)[0] for entry in os.listdir(CLAUSES_DIR)]
+    names += ['', 'Clause', 'Sans section', '- Objet', '[] Vide', 'a-b-c', '[Confidentialité]sans espace']
+    for section in sections:
+        name, key = section['name'], section['key']
+        start = rng.randrange(len(key))
+        fragment = key[start:rng.randrange(start, len(key)) + 1]
+        names += [
+            f"[{name}] Clause type", f"[{key.upper()}] Clause", f"{name} - Clause type",
+            f"[{fragment}] Fragment", f"{fragment.replace('_', ' ')} - Fragment",
+            f"Clause {name.lower()} standard", f"{name}{name}", name.upper(),
+            f"[{name} étendue au groupe] Clause", f"{key}_annexe - Clause",
+        ]
+    for _ in range(300):
+        names.append(' '.join(rng.sample(words, rng.randint(1, 4))))
+    return names
+
+
+def test_classify_matches_linear_matching(sections):
+    classifier = SectionClassifier(sections)
+    for name in _clause_names(sections):
+        assert classifier.classify(name) == _reference_classify(sections, name), name
+
+
+def test_normalize_matches_linear_matching(sections):
+    classifier = SectionClassifier(sections)
+    tags = ['', 'x', 'inconnu', 'Objet-du contrat', 'objet!!', 'prix_et_paiement_annexe']
+    tags += [section['name'] for section in sections] + [section['key'][1:-1] for section in sections]
+    for tag in tags:
+        assert classifier.normalize(tag) == _reference_normalize(sections, tag), tag
+
+
+def test_first_section_wins_when_several_match():
+    sections = [
+        {'order': 1, 'name': 'Prix', 'key': 'prix'},
+        {'order': 2, 'name': 'Prix et Paiement', 'key': 'prix_et_paiement'},
+    ]
+    classifier = SectionClassifier(sections)
+    assert classifier.classify('Clause Prix et Paiement') == 'prix'
+    assert classifier.normalize('et_paie') == 'prix_et_paiement'
+    assert classifier.normalize('prix_et_paiement_annexe') == 'prix'
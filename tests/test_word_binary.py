@@ -0,0 +1,142 @@
+import io
+import os
+import struct
+
+import pytest
+
+from src import word_binary
+from src.word_binary import (FC_COMPRESSED, WordBinaryError, extract_word_text, try_extract_word_text,
+                             _strip_field_codes)
+from conftest import CLAUSES_DIR
+
+FIB_SIZE = 0x400
+
+
+def _word_document(pieces, ccp_text, fc_clx, lcb_clx, flags=word_binary.FIB_WHICH_TABLE_STREAM):
+    """WordDocument stream: a minimal FIB followed by the raw bytes of each piece at its offset"""
+    fib = bytearray(FIB_SIZE)
+    struct.pack_into('<H', fib, 0, word_binary.FIB_MAGIC)
+    struct.pack_into('<H', fib, word_binary.FIB_FLAGS_OFFSET, flags)
+    csw, cslw, cb_rg_fc_lcb = 14, 22, 93
+    offset = word_binary.FIB_CSW_OFFSET
+    struct.pack_into('<H', fib, offset, csw)
+    offset += 2 + csw * 2
+    struct.pack_into('<H', fib, offset, cslw)
+    struct.pack_into('<i', fib, offset + 2 + word_binary.CCP_TEXT_INDEX * 4, ccp_text)
+    offset += 2 + cslw * 4
+    struct.pack_into('<H', fib, offset, cb_rg_fc_lcb)
+    struct.pack_into('<II', fib, offset + 2 + word_binary.FC_CLX_INDEX * 8, fc_clx, lcb_clx)
+
+    stream = bytearray(fib)
+    for start, data in pieces:
+        stream.extend(b'\0' * (start + len(data) - len(stream)))
+        stream[start:start + len(data)] = data
+    return bytes(stream)
+
+
+def _clx(cps, fcs):
+    """Clx: one property-modifier block (skipped by the reader), then the piece table"""
+    plc = struct.pack(f'<{len(cps)}I', *cps) + b''.join(struct.pack('<HIH', 0, fc, 0) for fc in fcs)
+    return b'\x01' + struct.pack('<h', 2) + b'\0\0' + b'\x02' + struct.pack('<I', len(plc)) + plc
+
+
+class _FakeOle:
+    def __init__(self, streams):
+        self.streams = streams
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def exists(self, name):
+        return name in self.streams
+
+    def openstream(self, name):
+        return io.BytesIO(self.streams[name])
+
+
+@pytest.fixture
+def word_file(monkeypatch, tmp_path):
+    """Build a .doc from (text, compressed) pieces plus trailing non-main text, read through a fake OLE container"""
+    def build(pieces, trailing='', ccp_text=None):
+        texts = [text for text, _ in pieces] + ([trailing] if trailing else [])
+        compressed = [flag for _, flag in pieces] + ([True] if trailing else [])
+        raw, fcs, cps = [], [], [0]
+        offset = FIB_SIZE
+        for text, is_compressed in zip(texts, compressed):
+            data = text.encode('cp1252') if is_compressed else text.encode('utf-16-le')
+            raw.append((offset, data))
+            fcs.append((offset * 2) | FC_COMPRESSED if is_compressed else offset)
+            cps.append(cps[-1] + len(text))
+            offset += len(data) + 16
+        clx = _clx(cps, fcs)
+        table = b'\0' * 8 + clx
+        streams = {
+            'WordDocument': _word_document(raw, ccp_text if ccp_text is not None else sum(len(text) for text, _ in pieces),
+                                           8, len(clx)),
+            '1Table': table,
+        }
+        monkeypatch.setattr(word_binary.olefile, 'isOleFile', lambda path: True)
+        monkeypatch.setattr(word_binary.olefile, 'OleFileIO', lambda path: _FakeOle(streams))
+        path = tmp_path / 'clause.doc'
+        path.write_bytes(b'')
+        return str(path)
+    return build
+
+
+def test_decodes_compressed_and_unicode_pieces(word_file):
+    path = word_file([("Préambule de l'accord\r", True), ("Montant : 100 € — œuvre\r", False)])
+    assert extract_word_text(path) == "Préambule de l'accord\nMontant : 100 € — œuvre"
+
+
+def test_stops_at_the_end_of_the_main_document(word_file):
+    path = word_file([("Article 1\r", True)], trailing="Note de bas de page\r")
+    assert extract_word_text(path) == "Article 1"
+
+
+def test_cuts_a_piece_running_past_the_main_document(word_file):
+    path = word_file([("Article 1\rNote de bas de page\r", False)], ccp_text=len("Article 1\r"))
+    assert extract_word_text(path) == "Article 1"
+
+
+def test_keeps_field_results_and_maps_special_characters(word_file):
+    path = word_file([
+        ("Page \x13 PAGE \x14" + "3\x15 sur\x0bdeux\x07", False),
+        ("non\x1esécable,\xa0auto\x1fmatique\r", True),
+    ])
+    assert extract_word_text(path) == "Page 3 sur\ndeux\nnon-sécable, automatique"
+
+
+def test_nested_field_instructions_are_dropped():
+    text = "A\x13 IF \x13 PAGE \x14" "1\x15 = 1 \x14" "oui\x15B"
+    assert _strip_field_codes(text) == "AouiB"
+
+
+def test_unbalanced_field_marks_keep_the_surrounding_text():
+    # A field without result, a second separator and an end mark without field
+    text = "A\x13 PAGE \x15B\x13 REF \x14x\x14y\x15C\x15D\x13 TOC"
+    assert _strip_field_codes(text) == "ABxyCD"
+
+
+def test_rejects_encrypted_documents(monkeypatch, word_file):
+    path = word_file([("Secret\r", True)])
+    encrypted = _word_document([], 0, 0, 0, flags=word_binary.FIB_ENCRYPTED)
+    monkeypatch.setattr(word_binary.olefile, 'OleFileIO',
+                        lambda path: _FakeOle({'WordDocument': encrypted, '0Table': b''}))
+    with pytest.raises(WordBinaryError):
+        extract_word_text(path)
+    assert try_extract_word_text(path) is None
+
+
+def test_non_ole_files_are_not_parsed(tmp_path):
+    path = tmp_path / 'fake.doc'
+    path.write_bytes(b'PK\x03\x04 not a Word 97 file')
+    assert try_extract_word_text(str(path)) is None
+
+
+def test_reads_sample_legacy_clause():
+    text = extract_word_text(os.path.join(CLAUSES_DIR, '02_Preambule', 'Préambule.doc'))
+    assert text.startswith("PREAMBULE\nLa Poste, qui exploite de très nombreux points de vente")
+    assert "s’oriente" in text